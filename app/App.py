@@ -6,11 +6,16 @@ from typing import Any, Callable, Generator, Optional
 from PIL import Image
 
 from core.decorator import override
+from core.tracing import span
 
 
 class App(ABC):
     """Basic app implementation."""
 
+    __changes_lock = threading.Lock()
+    __changed = False
+    __dirty_region: tuple[int, int, int, int] | None = None
+
     @property
     @abstractmethod
     def title(self) -> str:
@@ -65,23 +70,59 @@ class App(ABC):
         """Called when leaving the app. Apps can perform cleanup actions here."""
         pass
 
+    def invalidate(self, region: tuple[int, int, int, int] | None = None):
+        """Marks the region (left, top, right, bottom) of the app as changed, or the whole app if no region is given.
+        Apps call this when their visible output changes outside of key events, e.g. after new data arrived."""
+        with App.__changes_lock:
+            if region is None or (self.__changed and self.__dirty_region is None):
+                self.__dirty_region = None
+            elif self.__changed:
+                left, top, right, bottom = self.__dirty_region
+                self.__dirty_region = (min(left, region[0]), min(top, region[1]),
+                                       max(right, region[2]), max(bottom, region[3]))
+            else:
+                self.__dirty_region = region
+            self.__changed = True
+
+    def has_changes(self) -> bool:
+        """Returns if the visible output changed since the last frame was requested for the changes. Apps may override
+        this to compare their state instead of calling invalidate."""
+        return self.__changed
+
+    @property
+    def dirty_region(self) -> tuple[int, int, int, int] | None:
+        """Bounding box of all invalidated regions, None if the whole app was invalidated."""
+        return self.__dirty_region
+
+    def take_changes(self) -> bool:
+        """Returns if the app has changes and resets them, called right before a frame is requested for them."""
+        with App.__changes_lock:
+            changed = self.has_changes()
+            self.__changed = False
+            self.__dirty_region = None
+            return changed
+
 
 class SelfUpdatingApp(App, ABC):
-    """App template, that can update itself at a fixed refresh time."""
+    """App template, that refreshes its state at a fixed refresh time. A frame is only requested, if the app has
+    changes after the update callback, so that timer ticks without visible changes cost neither rendering nor SPI
+    transfers."""
 
     class UpdateThread:
         """Wrapper for an update thread, that keeps an eye on the time difference."""
 
-        def __init__(self, callback: Callable[[], None], sleep_time: float):
+        def __init__(self, callback: Callable[[], None], sleep_time: float, name: str | None = None):
             self.__callback = callback
             self.__sleep_time = sleep_time
+            self.__span_name = name or getattr(callback, '__qualname__', 'update')
             self.__thread: Optional[threading.Thread] = None
             self.__alive = False
 
         def __thread_function(self):
             next_call = time.time()
             while self.__alive:
-                self.__callback()
+                with span(self.__span_name, 'app'):
+                    self.__callback()
                 next_call = next_call + self.__sleep_time
                 diff = max(next_call - time.time(), 0)  # make sure it is not negative
                 time.sleep(diff)
@@ -96,8 +137,9 @@ class SelfUpdatingApp(App, ABC):
             """Stops the inner thread function by setting a flag."""
             self.__alive = False
 
-    def __init__(self, update_callback: Callable[[], None]):
+    def __init__(self, update_callback: Callable[[], None], draw_callback: Callable[[bool], None]):
         self.__update_callback = update_callback
+        self.__draw_callback = draw_callback
         self.__update_thread: Optional[SelfUpdatingApp.UpdateThread] = None
 
     @property
@@ -116,9 +158,15 @@ class SelfUpdatingApp(App, ABC):
 
     def start_updating(self):
         """Creates a new update thread wrapper and starts it."""
-        self.__update_thread = self.UpdateThread(callback=self.__update_callback, sleep_time=self.refresh_time)
+        self.__update_thread = self.UpdateThread(callback=self.__update, sleep_time=self.refresh_time,
+                                                 name=getattr(self.__update_callback, '__qualname__', None))
         self.__update_thread.start()
 
+    def __update(self):
+        self.__update_callback()
+        if self.take_changes():
+            self.__draw_callback(True)
+
     def stop_updating(self):
         """Stops the update thread wrapper"""
         if self.__update_thread is not None:
@@ -14,13 +14,13 @@ class ClockApp(SelfUpdatingApp):
 
     @inject
     def __init__(self, update_callback: Callable[[bool], None], app_config: AppConfig):
-        super().__init__(self.__draw_partial)
-        self.__update_callback: Callable[[Any], None] = update_callback
+        super().__init__(self.__tick, update_callback)
         self.__app_size = app_config.app_size
         self.__color = app_config.accent
 
-    def __draw_partial(self):
-        self.__update_callback(**dict(partial=True))
+    def __tick(self):
+        # the second hand moves with every tick
+        self.invalidate()
 
     @property
     @override
@@ -6,6 +6,8 @@ from PIL import Image, ImageDraw
 from app.App import SelfUpdatingApp
 from core.data import DeviceStatus
 from core.decorator import override
+from core.metrics import FrameMetrics
+from core.text import draw_text, text_bbox
 from data.BatteryStatusProvider import BatteryStatusProvider
 from data.EnvironmentDataProvider import EnvironmentDataProvider
 from data.LocationProvider import LocationProvider
@@ -21,13 +23,14 @@ class DebugApp(SelfUpdatingApp):
     INDEX_A = 4
     INDEX_B = 5
 
+    PAGE_INPUTS = 0
+    PAGE_METRICS = 1
+
     @inject
     def __init__(self, app_config: AppConfig, location_provider: LocationProvider,
                  environment_data_provider: EnvironmentDataProvider, battery_status_provider: BatteryStatusProvider,
-                 update_callback: Callable[[bool], None]):
-        super().__init__(self.__draw_callback_internal)
-        self.__draw_callback = update_callback
-        self.__draw_callback_kwargs = {'partial': True}
+                 frame_metrics: FrameMetrics, update_callback: Callable[[bool], None]):
+        super().__init__(self.__self_update, update_callback)
 
         # left, right, up, down, a, b
         self.__key_state = [False, False, False, False, False, False]
@@ -36,6 +39,11 @@ class DebugApp(SelfUpdatingApp):
         self.__device_state = [DeviceStatus.UNAVAILABLE, DeviceStatus.UNAVAILABLE, DeviceStatus.UNAVAILABLE]
         self.__last_device_state = [DeviceStatus.UNAVAILABLE, DeviceStatus.UNAVAILABLE, DeviceStatus.UNAVAILABLE]
 
+        self.__page = self.PAGE_INPUTS
+        self.__page_changed = False
+        self.__frame_metrics = frame_metrics
+        self.__frame_budget = 1 / app_config.max_frame_rate if app_config.max_frame_rate > 0 else 0
+
         self.__font = app_config.font_standard
         self.__app_size = app_config.app_size
         self.__color = app_config.accent
@@ -50,7 +58,8 @@ class DebugApp(SelfUpdatingApp):
     @property
     @override
     def refresh_time(self) -> float:
-        return 10
+        # metrics change with every frame, device states rarely
+        return 1 if self.__page == self.PAGE_METRICS else 10
 
     @property
     @override
@@ -66,9 +75,11 @@ class DebugApp(SelfUpdatingApp):
         # expanding by +1 to include all drawn pixels by cropping
         return min_x, min_y, max_x + 1, max_y + 1
 
-    def __draw_callback_internal(self):
+    def __self_update(self):
         self.__update_data()
-        self.__draw_callback(**self.__draw_callback_kwargs)
+        # metrics change with every frame, the device states only draw again if one of them changed
+        if self.__page == self.PAGE_METRICS or self.__device_state != self.__last_device_state:
+            self.invalidate()
 
     def __update_data(self):
         self.__last_device_state = self.__device_state
@@ -76,6 +87,55 @@ class DebugApp(SelfUpdatingApp):
 
     @override
     def draw(self, image: Image.Image, partial=False) -> Generator[tuple[Image.Image, int, int], Any, None]:
+        # a new page has to be drawn completely
+        partial = partial and not self.__page_changed
+        self.__page_changed = False
+        if self.__page == self.PAGE_METRICS:
+            yield from self.__draw_metrics(image)
+        else:
+            yield from self.__draw_inputs(image, partial)
+
+    def __draw_metrics(self, image: Image.Image) -> Generator[tuple[Image.Image, int, int], Any, None]:
+        width, height = self.__app_size
+        metrics = self.__frame_metrics
+        draw = ImageDraw.Draw(image)
+        line_height = 20
+        columns = (10, 80, 140, 200, 260, 340)
+
+        def draw_row(y: int, values: Iterable[str]):
+            for x, value in zip(columns, values):
+                draw_text(draw, (x, y), value, self.__color, self.__font)
+
+        cursor_y = 5
+        draw_row(cursor_y, ('APP', 'P50', 'P95', 'MAX', 'PATCHES', 'PIXELS'))
+        cursor_y += line_height
+        for app in metrics.apps:
+            durations = metrics.durations(app)
+            draw_row(cursor_y, (app, f'{durations.p50 * 1000:.1f}', f'{durations.p95 * 1000:.1f}',
+                                f'{durations.max * 1000:.1f}', f'{metrics.patches(app).p50:.0f}',
+                                f'{metrics.pixels(app).p50:.0f}'))
+            cursor_y += line_height
+        latencies = metrics.latencies()
+        draw_row(cursor_y, ('QUEUE', f'{latencies.p50 * 1000:.1f}', f'{latencies.p95 * 1000:.1f}',
+                            f'{latencies.max * 1000:.1f}', f'DROPPED {metrics.dropped}'))
+
+        # sparkline of the most recent frame times, scaled to the frame budget or the slowest frame
+        frame_times = metrics.frame_times()
+        spark_height = 40
+        left, top, right, bottom = 10, height - spark_height - 10, width - 10, height - 10
+        draw.rectangle((left, top, right, bottom), outline=self.__color_dark)
+        scale = max(frame_times + [self.__frame_budget]) or 1
+        if self.__frame_budget:
+            budget_y = bottom - int(self.__frame_budget / scale * (spark_height - 2)) - 1
+            draw.line((left + 1, budget_y, right - 1, budget_y), fill=self.__color_dark)
+        bar_width = max((right - left - 2) // max(len(frame_times), 1), 1)
+        for index, frame_time in enumerate(frame_times[-((right - left - 2) // bar_width):]):
+            x = left + 1 + index * bar_width
+            y = bottom - 1 - int(frame_time / scale * (spark_height - 2))
+            draw.rectangle((x, y, x + bar_width - 1, bottom - 1), fill=self.__color)
+        yield image.crop((0, 0, width, height)), 0, 0
+
+    def __draw_inputs(self, image: Image.Image, partial: bool) -> Generator[tuple[Image.Image, int, int], Any, None]:
         width, height = self.__app_size
         center_x, center_y = int(width / 4), int(height / 2)
         # center of right side
@@ -95,11 +155,11 @@ class DebugApp(SelfUpdatingApp):
         for index, device_name in enumerate(self.__devices):
             if not partial or self.__device_state[index] != self.__last_device_state[index]:
                 last_text = f'{device_name}: {self.__last_device_state[index]}'.replace('DeviceStatus.', '')
-                last_text_width, last_text_height = self.__font.getbbox(last_text)[2:]
+                last_text_width, last_text_height = text_bbox(self.__font, last_text)[2:]
 
                 text = f'{device_name}: {self.__device_state[index]}'.replace('DeviceStatus.', '')
-                text_width, text_height = self.__font.getbbox(text)[2:]
-                draw.text(cursor, text, self.__color, font=self.__font)
+                text_width, text_height = text_bbox(self.__font, text)[2:]
+                draw_text(draw, cursor, text, self.__color, self.__font)
 
                 bbox = (cursor[0], cursor[1], cursor[0]
                         + max(last_text_width, text_width), cursor[1] + max(last_text_height, text_height))
@@ -195,8 +255,24 @@ class DebugApp(SelfUpdatingApp):
 
     @override
     def on_key_b(self):
+        if self.__page == self.PAGE_METRICS:
+            # the metrics page does not test any key, so B returns to the input test directly
+            self.__key_state = self.__last_key_state = [False] * 6
+            self.__switch_page(self.PAGE_INPUTS)
+            return
+        # B is tested like every other key, only a second press in a row opens the metrics page
+        pressed_again = self.__key_state[self.INDEX_B]
         self.__last_key_state = self.__key_state
         self.__key_state = self.__key_state = [e == self.INDEX_B for e in range(6)]
+        if pressed_again:
+            self.__switch_page(self.PAGE_METRICS)
+
+    def __switch_page(self, page: int):
+        # restart the updates with the refresh time of the new page
+        self.__page = page
+        self.__page_changed = True
+        self.stop_updating()
+        self.start_updating()
 
     @override
     def on_app_enter(self):
@@ -6,6 +6,7 @@ from PIL import Image, ImageDraw
 from app.App import SelfUpdatingApp
 from core import resources
 from core.decorator import override
+from core.text import draw_text, text_bbox
 from data.EnvironmentDataProvider import EnvironmentData, EnvironmentDataProvider
 from environment import AppConfig
 
@@ -15,15 +16,13 @@ class EnvironmentApp(SelfUpdatingApp):
     @inject
     def __init__(self, draw_callback: Callable[[bool], None],
                  data_provider: EnvironmentDataProvider, app_config: AppConfig):
-        super().__init__(self.__update_data)
+        super().__init__(self.__update_data, draw_callback)
         self.__app_size = app_config.app_size
         self.__background = app_config.background
         self.__color = app_config.accent
         self.__color_dark = app_config.accent_dark
         self.__font = app_config.font_standard
 
-        self.__draw_callback = draw_callback
-        self.__draw_callback_kwargs = {'partial': True}
         self.__data_provider = data_provider
         self.__data: EnvironmentData | None = None
 
@@ -44,8 +43,16 @@ class EnvironmentApp(SelfUpdatingApp):
         return 'ENV'
 
     def __update_data(self):
+        texts = self.__texts()
         self.__data = self.__data_provider.get_environment_data()
-        self.__draw_callback(**self.__draw_callback_kwargs)
+        # the values are shown rounded, so most updates do not change anything on the display
+        if self.__texts() != texts:
+            self.invalidate()
+
+    def __texts(self) -> tuple[str, str, str]:
+        if self.__data is None:
+            return '? °C', '? hPa', '?%'
+        return f'{self.__data.temperature:.2f} °C', f'{self.__data.pressure:.2f} hPa', f'{self.__data.humidity:.2%}'
 
     @override
     def draw(self, image: Image.Image, partial=False) -> Generator[tuple[Image.Image, int, int], Any, None]:
@@ -69,22 +76,19 @@ class EnvironmentApp(SelfUpdatingApp):
                               pressure_xy[1] + self.__p_icon.height,
                               humidity_xy[1] + self.__h_icon.height))
 
-        # format with two decimals, and seven characters in total (adds whitespaces on the left to fill)
-        t_text = f'{self.__data.temperature:.2f} °C' if self.__data is not None else '? °C'
-        p_text = f'{self.__data.pressure:.2f} hPa' if self.__data is not None else '? hPa'
-        h_text = f'{self.__data.humidity:.2%}' if self.__data is not None else '?%'
-        _, _, t_text_width, t_text_height = self.__font.getbbox(t_text)
-        _, _, p_text_width, p_text_height = self.__font.getbbox(p_text)
-        _, _, h_text_width, h_text_height = self.__font.getbbox(h_text)
-        draw.text((temperature_xy[0] + (self.__t_icon.width - t_text_width) // 2,
-                   temperature_xy[1] + self.__t_icon.height + icon_gap),
-                  t_text, self.__color, font=self.__font)
-        draw.text((pressure_xy[0] + (self.__p_icon.width - p_text_width) // 2,
-                   pressure_xy[1] + self.__p_icon.height + icon_gap),
-                  p_text, self.__color, font=self.__font)
-        draw.text((humidity_xy[0] + (self.__h_icon.width - h_text_width) // 2,
-                   humidity_xy[1] + self.__h_icon.height + icon_gap),
-                  h_text, self.__color, font=self.__font)
+        t_text, p_text, h_text = self.__texts()
+        _, _, t_text_width, t_text_height = text_bbox(self.__font, t_text)
+        _, _, p_text_width, p_text_height = text_bbox(self.__font, p_text)
+        _, _, h_text_width, h_text_height = text_bbox(self.__font, h_text)
+        draw_text(draw, (temperature_xy[0] + (self.__t_icon.width - t_text_width) // 2,
+                         temperature_xy[1] + self.__t_icon.height + icon_gap),
+                  t_text, self.__color, self.__font)
+        draw_text(draw, (pressure_xy[0] + (self.__p_icon.width - p_text_width) // 2,
+                         pressure_xy[1] + self.__p_icon.height + icon_gap),
+                  p_text, self.__color, self.__font)
+        draw_text(draw, (humidity_xy[0] + (self.__h_icon.width - h_text_width) // 2,
+                         humidity_xy[1] + self.__h_icon.height + icon_gap),
+                  h_text, self.__color, self.__font)
 
         if partial:
             right_bottom = (humidity_xy[0] + (self.__h_icon.width - h_text_width) // 2 + h_text_width,
@@ -3,11 +3,12 @@ import shutil
 from typing import Any, Callable, Generator, Optional
 
 from injector import inject
-from PIL import Image, ImageDraw, ImageOps
+from PIL import Image, ImageDraw
 
 from app.App import App
 from core import resources
 from core.decorator import override
+from core.text import draw_text, text_bbox, text_width, truncate
 from environment import AppConfig
 
 
@@ -171,7 +172,7 @@ class FileManagerApp(App):
         left, top = left_top
         right, bottom = right_bottom
 
-        options_widths = [int(font.getbbox(text)[2]) for text in popup.options]
+        options_widths = [text_width(font, text) for text in popup.options]
         popup_width = self.__next_even(
             max(max(options_widths), popup_min_width)
         )  # require at least popup_min_width
@@ -190,7 +191,7 @@ class FileManagerApp(App):
         for index, text in enumerate(popup.options):
             if index == popup.selected_index:
                 draw.rectangle((cursor, (cursor[0] + popup_width, cursor[1] + line_height)), fill=self.__color_dark)
-            draw.text(cursor, text, self.__color, font=font)
+            draw_text(draw, cursor, text, self.__color, font)
             cursor = cursor[0], cursor[1] + line_height
 
     def __draw_error(self, draw: ImageDraw.ImageDraw, left_top: tuple[int, int], right_bottom: tuple[int, int],
@@ -198,8 +199,8 @@ class FileManagerApp(App):
         left, top = left_top  # unpacking top left anchor point
         right, bottom = right_bottom  # unpacking bottom right anchor point
         font = self.__font
-        _, _, text_width, text_height = font.getbbox(text)
-        popup_width = text_width + 10
+        _, _, width, text_height = text_bbox(font, text)
+        popup_width = width + 10
         popup_height = text_height * 3
         popup_border = self.POPUP_BORDER
         center = left + int((right - left) / 2), top + int((bottom - top) / 2)
@@ -210,11 +211,11 @@ class FileManagerApp(App):
         start = start[0] + popup_border, start[1] + popup_border
         end = end[0] - popup_border, end[1] - popup_border
         draw.rectangle(start + end, fill=self.__background)
-        draw.text((center[0] - int(text_width / 2), center[1] - int(text_height / 2)), text, self.__color, font=font)
+        draw_text(draw, (center[0] - int(width / 2), center[1] - int(text_height / 2)), text, self.__color, font)
 
-    def __draw_directory(self, draw: ImageDraw.ImageDraw, left_top: tuple[int, int], right_bottom: tuple[int, int],
-                         state: DirectoryState, is_selected: bool) -> None:
-        """Draws the given directory to the given ImageDraw and returns the new top_index."""
+    def __draw_directory(self, image: Image.Image, draw: ImageDraw.ImageDraw, left_top: tuple[int, int],
+                         right_bottom: tuple[int, int], state: DirectoryState, is_selected: bool) -> None:
+        """Draws the given directory to the given image and returns the new top_index."""
         line_height = self.LINE_HEIGHT  # height of a line entry in the directory
         side_padding = 3  # padding to the side of the directory background
         symbol_dimensions = 10  # size of symbol entry
@@ -226,10 +227,8 @@ class FileManagerApp(App):
         # draw background if this directory is selected
         if is_selected:
             draw.rectangle(left_top + right_bottom, fill=self.__color_dark)
-        text = state.directory
-        while font.getbbox(text)[2] > right - left - side_padding:
-            text = text[:-1]  # cut off last char until it fits
-        draw.text((left + side_padding, top), text, self.__color, font=font)
+        text = truncate(font, state.directory, right - left - side_padding)
+        draw_text(draw, (left + side_padding, top), text, self.__color, font)
 
         cursor = (left, top + line_height)
         try:
@@ -248,23 +247,22 @@ class FileManagerApp(App):
             for index, file in enumerate(content[state.top_index:]):
                 cursor_x, cursor_y = cursor
                 index += state.top_index  # pad index if entries are skipped
+                row_background = self.__color_dark if is_selected else self.__background
                 if state.selected_index == index and is_selected:
                     draw.rectangle((left, cursor_y, right, cursor_y + line_height), fill=self.__background)
+                    row_background = self.__background
 
                 start = (left + symbol_padding, cursor_y + symbol_padding)
                 end = (left + symbol_padding + symbol_dimensions, cursor_y + symbol_padding + symbol_dimensions)
                 if end[1] > bottom - line_height:
-                    draw.text((cursor_x + side_padding, cursor_y), '...', self.__color, font=font)
+                    draw_text(draw, (cursor_x + side_padding, cursor_y), '...', self.__color, font)
                     break
 
-                if os.path.isfile(os.path.join(state.directory, file)):
-                    draw.bitmap(start, ImageOps.invert(resources.file_icon), fill=self.__color)
-                else:
-                    draw.bitmap(start, ImageOps.invert(resources.directory_icon), fill=self.__color)
+                icon = 'file' if os.path.isfile(os.path.join(state.directory, file)) else 'directory'
+                resources.paste_icon(image, start, icon, self.__color, row_background, inverted=True)
 
-                while font.getbbox(file)[2] > right - left - symbol_dimensions - 2 * symbol_padding:
-                    file = file[:-1]  # cut off last char until it fits
-                draw.text((cursor_x + symbol_dimensions + 2 * symbol_padding, cursor_y), file, self.__color, font=font)
+                file = truncate(font, file, right - left - symbol_dimensions - 2 * symbol_padding)
+                draw_text(draw, (cursor_x + symbol_dimensions + 2 * symbol_padding, cursor_y), file, self.__color, font)
                 cursor = (cursor_x, cursor_y + line_height)
 
             if state.error_message is not None:
@@ -294,14 +292,14 @@ class FileManagerApp(App):
         if draw_left:
             left_top = (0, 0)
             right_bottom = (int(width / 2), height)
-            self.__draw_directory(draw, left_top, right_bottom, self.__left_directory, is_selected=is_left_tab)
+            self.__draw_directory(image, draw, left_top, right_bottom, self.__left_directory, is_selected=is_left_tab)
             draw_split_line()
             yield image.crop(left_top + right_bottom), *left_top  # noqa (unpacking type check fail)
 
         if draw_right:
             left_top = (int(width / 2), 0)
             right_bottom = (width, height)
-            self.__draw_directory(draw, left_top, right_bottom, self.__right_directory, is_selected=is_right_tab)
+            self.__draw_directory(image, draw, left_top, right_bottom, self.__right_directory, is_selected=is_right_tab)
             draw_split_line()
             yield image.crop(left_top + right_bottom), *left_top   # noqa (unpacking type check fail)
 
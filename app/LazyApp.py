@@ -0,0 +1,165 @@
+import logging
+import threading
+from typing import Any, Callable, Generator
+
+from PIL import Image, ImageDraw
+
+from app.App import App
+from core.decorator import override
+from core.text import draw_text, text_bbox
+from core.tracing import span
+from environment import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+class LazyApp(App):
+    """Placeholder for an app, that is only constructed when it is needed for the first time.
+
+    The title is known up front, so the header can be drawn without the app. The app is constructed in the background
+    on first enter, or earlier by a warm-up. Constructors of apps may block on I/O, the lock makes sure, that an app is
+    constructed only once, even if it is entered while the warm-up is still constructing it. Until the app is
+    constructed, a placeholder is drawn and keys are ignored, so that neither the render thread nor the input thread
+    wait for the constructor. Once the app is constructed, it is entered and a full frame is requested, if it is still
+    the active app. All calls are passed on to the constructed app."""
+
+    PLACEHOLDER_TEXT = 'LOADING'
+
+    def __init__(self, title: str, factory: Callable[[], App], app_config: AppConfig,
+                 update_callback: Callable[[bool], None] | None = None):
+        self.__title = title
+        self.__factory = factory
+        self.__app: App | None = None
+        self.__lock = threading.Lock()
+        self.__app_config = app_config
+        self.__update_callback = update_callback
+        self.__state_lock = threading.Lock()  # guards entering and leaving against the completion of a construction
+        self.__entered = False
+        self.__loading = False
+
+    @property
+    @override
+    def title(self) -> str:
+        return self.__title
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__app is not None
+
+    @property
+    def app(self) -> App:
+        """The app itself, which is constructed on first access."""
+        app = self.__app
+        if app is None:
+            with self.__lock:
+                if self.__app is None:
+                    with span(f'app.construct.{self.__title}', 'app'):
+                        self.__app = self.__factory()
+                    if self.__app.title != self.__title:
+                        logger.warning(f'app registered as {self.__title} has the title {self.__app.title}')
+                app = self.__app
+        return app
+
+    def warm_up(self):
+        """Constructs the app, if it was not constructed yet."""
+        _ = self.app
+
+    def __load(self):
+        """Constructs the app in the background and enters it, if it was entered in the meantime."""
+        try:
+            app = self.app
+        except Exception as e:
+            # the construction is tried again when the app is entered the next time
+            logger.exception(e)
+            app = None
+        with self.__state_lock:
+            self.__loading = False
+            entered = self.__entered and app is not None
+            if entered:
+                app.on_app_enter()
+        if entered and self.__update_callback is not None:
+            self.__update_callback(False)
+
+    def __draw_placeholder(self, image: Image.Image) -> Generator[tuple[Image.Image, int, int], Any, None]:
+        width, height = self.__app_config.app_size
+        font = self.__app_config.font_standard
+        _, _, text_width, text_height = text_bbox(font, self.PLACEHOLDER_TEXT)
+        draw = ImageDraw.Draw(image)
+        draw_text(draw, ((width - text_width) // 2, (height - text_height) // 2), self.PLACEHOLDER_TEXT,
+                  self.__app_config.accent, font)
+        yield image, 0, 0
+
+    @override
+    def draw(self, image: Image.Image, partial=False) -> Generator[tuple[Image.Image, int, int], Any, None]:
+        app = self.__app
+        if app is None:
+            return self.__draw_placeholder(image)
+        return app.draw(image, partial)
+
+    @override
+    def on_key_left(self):
+        if self.__app is not None:
+            self.__app.on_key_left()
+
+    @override
+    def on_key_right(self):
+        if self.__app is not None:
+            self.__app.on_key_right()
+
+    @override
+    def on_key_up(self):
+        if self.__app is not None:
+            self.__app.on_key_up()
+
+    @override
+    def on_key_down(self):
+        if self.__app is not None:
+            self.__app.on_key_down()
+
+    @override
+    def on_key_a(self):
+        if self.__app is not None:
+            self.__app.on_key_a()
+
+    @override
+    def on_key_b(self):
+        if self.__app is not None:
+            self.__app.on_key_b()
+
+    @override
+    def on_app_enter(self):
+        with self.__state_lock:
+            self.__entered = True
+            if self.__loading:
+                # the loading thread enters the app, once it is constructed
+                return
+            if self.__app is not None:
+                self.__app.on_app_enter()
+                return
+            self.__loading = True
+        threading.Thread(target=self.__load, args=(), daemon=True).start()
+
+    @override
+    def on_app_leave(self):
+        with self.__state_lock:
+            self.__entered = False
+            if self.__app is not None:
+                self.__app.on_app_leave()
+
+    @override
+    def invalidate(self, region: tuple[int, int, int, int] | None = None):
+        if self.__app is not None:
+            self.__app.invalidate(region)
+
+    @override
+    def has_changes(self) -> bool:
+        return self.__app is not None and self.__app.has_changes()
+
+    @property
+    @override
+    def dirty_region(self) -> tuple[int, int, int, int] | None:
+        return self.__app.dirty_region if self.__app is not None else None
+
+    @override
+    def take_changes(self) -> bool:
+        return self.__app is not None and self.__app.take_changes()
@@ -2,11 +2,13 @@ import math
 from typing import Any, Callable, Generator, Optional, Union
 
 from injector import inject
-from PIL import Image, ImageDraw, ImageOps
+from PIL import Image, ImageDraw
 
 from app.App import SelfUpdatingApp
 from core import resources
+from core.color import match_canvas
 from core.decorator import override
+from core.text import draw_text
 from data.LocationProvider import Location, LocationException, LocationProvider
 from data.TileProvider import TileProvider
 from environment import AppConfig
@@ -116,7 +118,7 @@ class MapApp(SelfUpdatingApp):
     @inject
     def __init__(self, draw_callback: Callable[[bool], None],
                  location_provider: LocationProvider, tile_provider: TileProvider, app_config: AppConfig):
-        super().__init__(self.__update_location)
+        super().__init__(self.__update_location, draw_callback)
         self.__app_size = app_config.app_size
         self.__background = app_config.background
         self.__color = app_config.accent
@@ -128,8 +130,6 @@ class MapApp(SelfUpdatingApp):
         self.Control.FOCUSED = self.Control.SelectionState(self.__color, self.__background)
         self.Control.SELECTED = self.Control.SelectionState(self.__background, self.__color)
 
-        self.__draw_callback = draw_callback
-        self.__draw_callback_kwargs = {'partial': True}
         self.__location_provider = location_provider
         self.__tile_provider = tile_provider
         self.__zoom = 15
@@ -167,15 +167,15 @@ class MapApp(SelfUpdatingApp):
             self.__y_offset += 1
 
         self.__controls: list[MapApp.Control] = [
-            self.Control(ImageOps.invert(resources.minus_icon), initial_state=self.Control.NONE,
+            self.Control(resources.icon('minus', inverted=True), initial_state=self.Control.NONE,
                          on_select=zoom_out, instant_action=True),
-            self.Control(ImageOps.invert(resources.plus_icon), initial_state=self.Control.NONE,
+            self.Control(resources.icon('plus', inverted=True), initial_state=self.Control.NONE,
                          on_select=zoom_in, instant_action=True),
-            self.Control(ImageOps.invert(resources.move_icon), initial_state=self.Control.NONE,
+            self.Control(resources.icon('move', inverted=True), initial_state=self.Control.NONE,
                          on_key_left=move_left, on_key_right=move_right,
                          on_key_up=move_up, on_key_down=move_down,
                          on_select=self.stop_updating, on_deselect=self.start_updating),
-            self.Control(ImageOps.invert(resources.focus_icon), initial_state=self.Control.NONE,
+            self.Control(resources.icon('focus', inverted=True), initial_state=self.Control.NONE,
                          on_select=reset_offset, instant_action=True)
         ]
         self.__focused_control_index = 0
@@ -194,12 +194,15 @@ class MapApp(SelfUpdatingApp):
 
     def __update_location(self):
         if self.__x_offset == 0 and self.__y_offset == 0:
+            previous = self.__position, self.__connection_lost
             try:
                 self.__position = self.__location_provider.get_location()
                 self.__connection_lost = False
             except LocationException:
                 self.__connection_lost = True
-            self.__draw_callback(**self.__draw_callback_kwargs)
+            # a resting device keeps its position, the map does not have to be drawn again then
+            if (self.__position, self.__connection_lost) != previous:
+                self.invalidate()
 
     @override
     def draw(self, image: Image.Image, partial=False) -> Generator[tuple[Image.Image, int, int], Any, None]:
@@ -228,7 +231,7 @@ class MapApp(SelfUpdatingApp):
             tile = self.__tile_provider.get_tile(lat, lon, self.__zoom, size=size,
                                                  x_offset=self.__x_offset * self.__SCROLL_FACTOR,
                                                  y_offset=self.__y_offset * self.__SCROLL_FACTOR)
-            image.paste(tile.image, left_top)
+            image.paste(match_canvas(tile.image, image), left_top)
 
             # Calculate the relative position of the current location on the tile, because the tile is not centered
             # around the given location. It even works with resized and cropped tiles, as long as the center stays the
@@ -335,17 +338,17 @@ class MapApp(SelfUpdatingApp):
 
         # draw location info
         cursor = (left_top[0] + size[0] + side_tab_padding, left_top[1])
-        draw.text(cursor, 'lat: unknown' if lat is None else 'lat: {:.4f}°'.format(lat), self.__color, font=font)
+        draw_text(draw, cursor, 'lat: unknown' if lat is None else 'lat: {:.4f}°'.format(lat), self.__color, font)
         cursor = (cursor[0], cursor[1] + line_height)
-        draw.text(cursor, 'lon: unknown' if lon is None else 'lon: {:.4f}°'.format(lon), self.__color, font=font)
+        draw_text(draw, cursor, 'lon: unknown' if lon is None else 'lon: {:.4f}°'.format(lon), self.__color, font)
         cursor = (cursor[0], cursor[1] + line_height)
-        draw.text(cursor, f'zoom: {self.__zoom}x', self.__color, font=font)
+        draw_text(draw, cursor, f'zoom: {self.__zoom}x', self.__color, font)
         if self.__x_offset != 0 or self.__y_offset != 0:
             cursor = (cursor[0], cursor[1] + line_height)
-            draw.text(cursor, f'x: {self.__x_offset}, y: {self.__y_offset}', self.__color, font=font)
+            draw_text(draw, cursor, f'x: {self.__x_offset}, y: {self.__y_offset}', self.__color, font)
         if self.__connection_lost:
             cursor = (cursor[0], cursor[1] + line_height)
-            draw.text(cursor, f'connection lost', self.__color, font=font)
+            draw_text(draw, cursor, 'connection lost', self.__color, font)
 
         # draw controls
         cursor = (left_top[0] + size[0] - self.__CONTROL_SIZE - self.__CONTROL_PADDING,
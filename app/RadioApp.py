@@ -15,6 +15,8 @@ from PIL import Image, ImageDraw
 from app.App import SelfUpdatingApp
 from core import resources
 from core.decorator import override
+from core.text import draw_text, text_bbox, truncate
+from core.tracing import traced
 from environment import AppConfig
 
 
@@ -204,6 +206,7 @@ class RadioApp(SelfUpdatingApp):
             self.__callback_next = callback_next
             self.__is_continuing = False
 
+        @traced('audio.callback', 'audio')
         def __stream_callback(self, _1, frame_count, _2, _3) -> tuple[bytes, int]:
             data = self.__wave_read.readframes(frame_count)
             self.__played_frames += frame_count
@@ -279,9 +282,7 @@ class RadioApp(SelfUpdatingApp):
 
     @inject
     def __init__(self, draw_callback: Callable[[bool], None], app_config: AppConfig):
-        super().__init__(self.__self_update)
-        self.__draw_callback = draw_callback
-        self.__draw_callback_kwargs = {'partial': True}
+        super().__init__(self.__self_update, draw_callback)
 
         self.__app_size = app_config.app_size
         self.__background = app_config.background
@@ -306,6 +307,7 @@ class RadioApp(SelfUpdatingApp):
             pass
 
         self.__player = self.AudioPlayer(self.__call_next)
+        self.__last_status: tuple[str, Optional[int]] | None = None
 
         # init selection states
         self.Control.SelectionState.NONE = self.Control.SelectionState(self.__color_dark, self.__background, False, False)
@@ -435,7 +437,16 @@ class RadioApp(SelfUpdatingApp):
             self.__player.start_stream()
 
     def __self_update(self):
-        self.__draw_callback(**self.__draw_callback_kwargs)
+        # only the progress of a playing track changes by itself, a paused or stopped player keeps the display as is
+        status = self.__now_playing_text(), self.__volume
+        if status != self.__last_status:
+            self.__last_status = status
+            self.invalidate()
+
+    def __now_playing_text(self) -> str:
+        if not self.__player.has_stream:
+            return 'Empty'
+        return f'{self.__player.progress:.1%}: {self.__files[self.__playlist[self.__playing_index]]}'
 
     @property
     @override
@@ -466,19 +477,17 @@ class RadioApp(SelfUpdatingApp):
 
         # draw volume
         text = f'Volume: {self.__volume}%'
-        _, _, t_width, t_height = self.__font.getbbox(text)
-        draw.text((width // 2 - t_width // 2, vertical_limit - self.__META_INFO_HEIGHT // 2 - t_height // 2),
-                  text, self.__color, font=self.__font)
+        _, _, t_width, t_height = text_bbox(self.__font, text)
+        draw_text(draw, (width // 2 - t_width // 2, vertical_limit - self.__META_INFO_HEIGHT // 2 - t_height // 2),
+                  text, self.__color, self.__font)
         vertical_limit = vertical_limit - self.__META_INFO_HEIGHT
 
         # draw currently playing track
-        text = f'{self.__player.progress:.1%}: {self.__files[self.__playlist[self.__playing_index]]}' \
-            if self.__player.has_stream else 'Empty'
-        while self.__font.getbbox(text)[2] > width:
-            text = text[:-1]  # cut off last char until it fits
-        _, _, t_width, t_height = self.__font.getbbox(text)
-        draw.text((width // 2 - t_width // 2, vertical_limit - self.__META_INFO_HEIGHT // 2 - t_height // 2),
-                  text, self.__color, font=self.__font)
+        text = self.__now_playing_text()
+        text = truncate(self.__font, text, width)
+        _, _, t_width, t_height = text_bbox(self.__font, text)
+        draw_text(draw, (width // 2 - t_width // 2, vertical_limit - self.__META_INFO_HEIGHT // 2 - t_height // 2),
+                  text, self.__color, self.__font)
         vertical_limit = vertical_limit - self.__META_INFO_HEIGHT
 
         # draw track list
@@ -500,12 +509,9 @@ class RadioApp(SelfUpdatingApp):
             if self.__selected_index == index:
                 draw.rectangle(cursor + (right, cursor[1] + self.__LINE_HEIGHT), self.__color_dark)
             if index == max_entries + self.__top_index:
-                draw.text(cursor, '...', self.__color, font=self.__font)
+                draw_text(draw, cursor, '...', self.__color, self.__font)
                 break
-            text = file
-            while self.__font.getbbox(text)[2] > right - left:
-                text = text[:-1]  # cut off last char until it fits
-            draw.text(cursor, text, self.__color, font=self.__font)
+            draw_text(draw, cursor, truncate(self.__font, file, right - left), self.__color, self.__font)
             cursor = (cursor[0], cursor[1] + self.__LINE_HEIGHT)
 
         if partial:
@@ -10,6 +10,7 @@ from PIL import Image, ImageDraw
 
 from app.App import App
 from core.decorator import override
+from core.text import draw_text, text_bbox
 from environment import AppConfig
 
 # type aliases
@@ -269,10 +270,10 @@ class UpdateApp(App):
             draw.rectangle(history_cursor + rect_right_bottom, fill=self.__background)
             # and draw history in reverse order
             for text in reversed(self.__results):
-                _, _, _, text_height = font.getbbox(text)
+                _, _, _, text_height = text_bbox(font, text)
                 if history_cursor[1] + text_height > height:
                     break
-                draw.text(history_cursor, text, fill=self.__color, font=font)
+                draw_text(draw, history_cursor, text, self.__color, font)
                 history_cursor = (history_cursor[0], history_cursor[1] + self.LINE_HEIGHT)
             right_bottom = (width, history_cursor[1])
 
@@ -284,19 +285,19 @@ class UpdateApp(App):
             else:
                 draw.rectangle(cursor + (width // 2, cursor[1] + self.LINE_HEIGHT), fill=self.__background)
             text = option.name
-            draw.text(cursor, text, fill=self.__color, font=font)
+            draw_text(draw, cursor, text, self.__color, font)
             cursor = (cursor[0], cursor[1] + self.LINE_HEIGHT)
             right_bottom = (max(right_bottom[0], width // 2), max(right_bottom[1], cursor[1]))
         draw.line((width // 2, left_top[1]) + (width // 2, height), fill=self.__color, width=1)
 
         # part: repository and branch information
         unknown = 'unknown'
-        _, _, _, text_height_branch = font.getbbox(self.__branch_name or unknown)
-        _, _, _, text_height_remote = font.getbbox(self.__remote_name or unknown)
-        draw.text((0, height - text_height_branch -
-                   text_height_remote), f'branch: {self.__branch_name or unknown}', fill=self.__color, font=font)
-        draw.text((0, height - text_height_remote),
-                  f'remote: {self.__remote_name or unknown}', fill=self.__color, font=font)
+        _, _, _, text_height_branch = text_bbox(font, self.__branch_name or unknown)
+        _, _, _, text_height_remote = text_bbox(font, self.__remote_name or unknown)
+        draw_text(draw, (0, height - text_height_branch - text_height_remote),
+                  f'branch: {self.__branch_name or unknown}', self.__color, font)
+        draw_text(draw, (0, height - text_height_remote),
+                  f'remote: {self.__remote_name or unknown}', self.__color, font)
 
         if partial:
             yield image.crop(left_top + right_bottom), *left_top  # noqa (unpacking type check fail)
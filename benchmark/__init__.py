@@ -0,0 +1,7 @@
+import importlib.util
+import os
+import sys
+
+# use the stand-ins for the hardware modules, if the real ones are not installed
+if importlib.util.find_spec('spidev') is None or importlib.util.find_spec('RPi') is None:
+    sys.path.append(os.path.join(os.path.dirname(__file__), 'fakes'))
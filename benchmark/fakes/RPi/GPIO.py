@@ -0,0 +1,72 @@
+"""
+Stand-in for the RPi.GPIO module, which only exists on a Raspberry Pi. Pin levels are kept in memory and every output
+is recorded, so that benchmarks can count pin changes. Events are never detected.
+"""
+from typing import Callable
+
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+levels: dict[int, int] = {}
+outputs: list[tuple[int, int]] = []
+callbacks: dict[int, Callable[[int], None]] = {}
+__mode: int | None = None
+
+
+def setmode(mode: int):
+    global __mode
+    __mode = mode
+
+
+def getmode() -> int | None:
+    return __mode
+
+
+def setwarnings(_: bool):
+    pass
+
+
+def setup(channel: int, direction: int, pull_up_down: int = PUD_OFF, initial: int | None = None):
+    levels[channel] = HIGH if pull_up_down == PUD_UP else LOW if initial is None else int(initial)
+
+
+def output(channel: int, state: int | bool):
+    levels[channel] = int(state)
+    outputs.append((channel, int(state)))
+
+
+def input(channel: int) -> int:
+    return levels.get(channel, LOW)
+
+
+def add_event_detect(channel: int, edge: int, callback: Callable[[int], None] | None = None, bouncetime: int = 0):
+    if callback is not None:
+        callbacks[channel] = callback
+
+
+def remove_event_detect(channel: int):
+    callbacks.pop(channel, None)
+
+
+def cleanup(channel: int | None = None):
+    if channel is None:
+        levels.clear()
+        callbacks.clear()
+    else:
+        levels.pop(channel, None)
+        callbacks.pop(channel, None)
+
+
+def reset_statistics():
+    """Forgets the recorded outputs, the pin levels are kept."""
+    outputs.clear()
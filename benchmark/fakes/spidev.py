@@ -0,0 +1,71 @@
+"""
+Stand-in for the spidev module, which only exists on linux with the spidev kernel module. Transfers are recorded and
+the time they would take on the bus is modeled from the clock, which is the configured max_speed_hz unless CLOCK_HZ
+overrides it. If REALTIME is set, transfers block for the modeled bus time like real transfers do. If RECORD_DATA is
+set, the bytes of each transfer are kept together with the pin levels of the GPIO stand-in at that time, so that
+commands and their parameters can be told apart by the level of the DC pin.
+"""
+import time
+
+from RPi import GPIO
+
+CLOCK_HZ: int | None = None
+REALTIME = False
+RECORD_DATA = False
+
+instances: list['SpiDev'] = []
+
+
+class SpiDev:
+
+    def __init__(self, bus: int | None = None, device: int | None = None):
+        self.mode = 0
+        self.bits_per_word = 8
+        self.max_speed_hz = 125000000
+        self.transfers = 0
+        self.bytes_written = 0
+        self.bus_time = 0.0
+        self.data: list[bytes] = []
+        self.pin_levels: list[dict[int, int]] = []  # levels of all GPIO pins during each recorded transfer
+        self.closed = bus is None
+        self.bus, self.device = bus, device
+        instances.append(self)
+
+    def open(self, bus: int, device: int):
+        self.bus, self.device = bus, device
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def __transfer(self, data) -> int:
+        size = memoryview(data).nbytes if not isinstance(data, list) else len(data)
+        duration = size * self.bits_per_word / (CLOCK_HZ or self.max_speed_hz)
+        self.transfers += 1
+        self.bytes_written += size
+        self.bus_time += duration
+        if RECORD_DATA:
+            self.data.append(bytes(data))
+            self.pin_levels.append(dict(getattr(GPIO, 'levels', {})))
+        if REALTIME:
+            time.sleep(duration)
+        return size
+
+    def writebytes(self, data: list[int]):
+        if len(data) > 4096:
+            raise OverflowError('Argument list size exceeds 4096 bytes.')
+        self.__transfer(data)
+
+    def writebytes2(self, data):
+        self.__transfer(data)
+
+    def xfer2(self, data: list[int], *_) -> list[int]:
+        self.__transfer(data)
+        return [0] * len(data)
+
+    def reset_statistics(self):
+        self.transfers = 0
+        self.bytes_written = 0
+        self.bus_time = 0.0
+        self.data.clear()
+        self.pin_levels.clear()
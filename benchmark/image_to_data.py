@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for the frame encoder of the ILI9486 driver. Compares the previous list based conversion with the
+current buffer based conversion for a full frame and typical patch sizes.
+
+Run from the project root: python -m benchmark.image_to_data
+"""
+import argparse
+import random
+import timeit
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from driver.ILI9486 import image_to_data
+
+# typical patch sizes: full frame, app area, footer strip, clock face, single text line
+SIZES = {
+    'full frame': (480, 320),
+    'app area': (440, 265),
+    'footer': (440, 20),
+    'clock': (201, 201),
+    'text line': (220, 20)
+}
+
+
+def legacy_image_to_data(image: Image.Image) -> list[int]:
+    """Previous implementation, kept as reference for comparison."""
+    pb = np.array(image.convert('RGB')).astype('uint16')
+    return np.dstack((pb[:, :, 0] & 0xFC, pb[:, :, 1] & 0xFC, pb[:, :, 2] & 0xFC)).flatten().tolist()
+
+
+def legacy_send(data: list[int], chunk_size: int = 4096):
+    """Previous chunking of the send function without the actual transfer."""
+    for start in range(0, len(data), chunk_size):
+        end = min(start + chunk_size, len(data))
+        _ = data[start: end]
+
+
+def send(data: memoryview, chunk_size: int = 4096):
+    """Current chunking of the send function without the actual transfer."""
+    view = memoryview(data).cast('B')
+    for start in range(0, len(view), chunk_size):
+        _ = view[start: start + chunk_size]
+
+
+def create_image(size: tuple[int, int]) -> Image.Image:
+    image = Image.new('RGB', size, (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    rnd = random.Random(size[0] * size[1])
+    for _ in range(20):
+        x0, y0 = rnd.randrange(size[0]), rnd.randrange(size[1])
+        x1, y1 = rnd.randrange(x0, size[0] + 1), rnd.randrange(y0, size[1] + 1)
+        draw.rectangle((x0, y0, x1, y1), fill=(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the legacy and the current frame encoder.')
+    parser.add_argument('-n', '--number', type=int, default=20, help='number of runs per measurement')
+    args = parser.parse_args()
+
+    print(f'{"patch":<12}{"size":>10}{"legacy [ms]":>14}{"current [ms]":>14}{"speedup":>10}')
+    for name, size in SIZES.items():
+        image = create_image(size)
+        assert bytes(image_to_data(image)) == bytes(legacy_image_to_data(image)), 'encoders produce different data'
+        legacy = timeit.timeit(lambda: legacy_send(legacy_image_to_data(image)), number=args.number) / args.number
+        current = timeit.timeit(lambda: send(image_to_data(image)), number=args.number) / args.number
+        print(f'{name:<12}{"%dx%d" % size:>10}{legacy * 1000:>14.3f}{current * 1000:>14.3f}'
+              f'{legacy / current:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark of the complete render pipeline from AppState over ILI9486Display and the ILI9486 driver down to the SPI bus.
+Every app is drawn with full frames and with partial frames triggered by key presses. The hardware is replaced by the
+stand-ins in benchmark/fakes, which count the SPI transfers and model the time they take on the bus. Results are
+written to a JSON file, that can be compared between commits.
+
+Run from the project root: python -m benchmark.pipeline -o results.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+import spidev
+from injector import Injector, provider, singleton
+
+import driver.ILI9486 as ili9486
+from core.decorator import override
+from environment import AppConfig, Environment
+from interaction.Display import Display
+from interaction.ILI9486Display import ILI9486Display
+from piboy import AppModule, AppState, register_apps
+
+
+class BenchmarkAppModule(AppModule):
+
+    @singleton
+    @provider
+    @override
+    def provide_environment(self) -> Environment:
+        # default environment without frame pacing, so that the pipeline runs as fast as it can
+        return Environment(app_config=AppConfig(max_frame_rate=0))
+
+    @singleton
+    @provider
+    @override
+    def provide_display(self, e: Environment, state: AppState) -> Display:
+        # always the hardware display, which runs on the stand-ins when not on a raspberry pi
+        spi_device_config = e.display_config.display_device
+        return ILI9486Display((spi_device_config.bus, spi_device_config.device),
+                              e.display_config.dc_pin, e.display_config.rst_pin, e.display_config.flip_display,
+                              e.display_config.bits_per_pixel, state.metrics)
+
+
+class ConversionTimer:
+    """Wraps the frame encoder of the driver to measure the time spent converting images."""
+
+    def __init__(self, function: Callable):
+        self.__function = function
+        self.seconds = 0.0
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.__function(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+
+    def reset(self):
+        self.seconds = 0.0
+        self.calls = 0
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(state: AppState, display: ILI9486Display, timer: ConversionTimer, frames: int,
+            draw: Callable[[int], None]) -> dict[str, Any]:
+    """Draws the given number of frames one after another, waiting for each one to reach the bus."""
+    spi = spidev.instances[-1]
+    spi.reset_statistics()
+    timer.reset()
+    sent_pixels, skipped_pixels = display.sent_pixels, display.skipped_pixels
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(frame)
+        state.dispatcher.wait_idle()
+        state.scheduler.wait_idle()
+        display.wait_idle()
+    seconds = time.perf_counter() - start
+    return {
+        'frames': frames,
+        'seconds': seconds,
+        'frames_per_second': frames / seconds,
+        'conversion_seconds': timer.seconds,
+        'conversions': timer.calls,
+        'bytes': spi.bytes_written,
+        'spi_calls': spi.transfers,
+        'bus_seconds': spi.bus_time,
+        'sent_pixels': display.sent_pixels - sent_pixels,
+        'skipped_pixels': display.skipped_pixels - skipped_pixels,
+    }
+
+
+def full_frame(state: AppState, display: ILI9486Display):
+    """Draws a full frame, that is sent completely like after an app switch. Without forgetting the shadow framebuffer,
+    every full frame but the first would match what the panel already shows and no pixel would be sent."""
+    display.invalidate_shadow()
+    state.update_display(display, partial=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the render pipeline of every app on stand-in hardware.')
+    parser.add_argument('-n', '--frames', type=int, default=20, help='number of frames per app and mode')
+    parser.add_argument('-o', '--output', default='benchmark.json', help='JSON file to write the results to')
+    parser.add_argument('--clock', type=int, default=None, help='SPI clock in Hz, defaults to the configured clock')
+    parser.add_argument('--realtime', action='store_true', help='block transfers for their modeled bus time')
+    args = parser.parse_args()
+
+    spidev.CLOCK_HZ = args.clock
+    spidev.REALTIME = args.realtime
+    timer = ConversionTimer(ili9486.image_to_data)
+    ili9486.image_to_data = timer
+
+    injector = Injector([BenchmarkAppModule()])
+    state = injector.get(AppState)
+    display = injector.get(Display)
+    register_apps(state, injector)
+    # apps are constructed up front, so that no frame of a placeholder is measured
+    state.warm_up_apps(background=False)
+
+    state.clear_display(display)
+    state.active_app.on_app_enter()
+    results: dict[str, Any] = {}
+    try:
+        for index, app in enumerate(state.apps):
+            if index:
+                state.on_rotary_increase(display)
+            state.dispatcher.wait_idle()
+            state.scheduler.wait_idle()
+            display.wait_idle()
+            # alternate the keys, so that apps with a cursor end up in the state they started with
+            keys = [state.on_key_down, state.on_key_up]
+            results[app.title] = {
+                'full': measure(state, display, timer, args.frames, lambda _: full_frame(state, display)),
+                'partial': measure(state, display, timer, args.frames,
+                                   lambda frame: keys[frame % 2](display)),
+            }
+            full = results[app.title]['full']
+            print(f'{app.title:<6}{full["frames_per_second"]:>8.1f} fps{full["bytes"] / args.frames:>12.0f} B/frame'
+                  f'{full["spi_calls"] / args.frames:>8.0f} calls/frame')
+    finally:
+        state.active_app.on_app_leave()
+        state.dispatcher.stop()
+        state.scheduler.stop()
+        display.close()
+
+    report = {
+        'revision': git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'clock_hz': args.clock or spidev.instances[-1].max_speed_hz,
+        'realtime': args.realtime,
+        'apps': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of the cold start. The entry module is imported in fresh interpreters with -X importtime, the import times are
+averaged over all runs and reported per module and per top level package, together with the wall time of the whole
+interpreter. Results are written to a JSON file, that can be compared between commits.
+
+Run from the project root: python -m benchmark.startup -o startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+from benchmark.pipeline import git_revision
+
+# e.g. 'import time:       205 |        205 |   core'
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def import_times(module: str) -> tuple[float, dict[str, tuple[int, int, int]]]:
+    """Imports the module in a new interpreter and returns its wall time in seconds and the self and cumulative
+    import time in microseconds and the nesting level of every imported module."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'importing {module} failed:\n{result.stderr[-2000:]}')
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return seconds, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the import time of a cold start per module.')
+    parser.add_argument('-n', '--runs', type=int, default=5, help='number of fresh interpreters to average')
+    parser.add_argument('-m', '--module', default='piboy', help='entry module to import')
+    parser.add_argument('-t', '--top', type=int, default=20, help='number of modules and packages to print')
+    parser.add_argument('-o', '--output', default='startup.json', help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    wall_times = []
+    totals: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    levels: dict[str, int] = {}
+    for _ in range(args.runs):
+        seconds, modules = import_times(args.module)
+        wall_times.append(seconds)
+        for name, (self_us, cumulative_us, level) in modules.items():
+            totals[name][0] += self_us
+            totals[name][1] += cumulative_us
+            levels[name] = level
+
+    modules: dict[str, dict[str, Any]] = {
+        name: {'self_ms': self_us / args.runs / 1000, 'cumulative_ms': cumulative_us / args.runs / 1000,
+               'level': levels[name]}
+        for name, (self_us, cumulative_us) in totals.items()
+    }
+    # the self times of all modules of a package add up to the time the package costs, wherever it is imported
+    packages: dict[str, float] = defaultdict(float)
+    for name, times in modules.items():
+        packages[name.split('.')[0]] += times['self_ms']
+
+    entry = modules.get(args.module, {'cumulative_ms': 0.0})
+    print(f'{args.module}: {entry["cumulative_ms"]:.1f} ms import, {min(wall_times) * 1000:.1f} ms interpreter '
+          f'(best of {args.runs})')
+    print('\npackages by total self time')
+    for name, milliseconds in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'{name:<40}{milliseconds:>10.1f} ms')
+    print('\nmodules by cumulative time')
+    for name, times in sorted(modules.items(), key=lambda item: -item[1]['cumulative_ms'])[:args.top]:
+        print(f'{"  " * times["level"]}{name:<{40 - 2 * times["level"]}}{times["cumulative_ms"]:>10.1f} ms')
+
+    report = {
+        'revision': git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'module': args.module,
+        'runs': args.runs,
+        'import_ms': entry['cumulative_ms'],
+        'interpreter_ms': [seconds * 1000 for seconds in wall_times],
+        'packages': dict(sorted(packages.items(), key=lambda item: -item[1])),
+        'modules': modules,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'\nresults written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Timing of the boot phases from the start of the process up to the first frame.
+
+The phases are consecutive, each mark closes the phase, that started with the previous mark. The clock starts with the
+import of this module, which is imported first by the entry scripts, so the first phase covers the remaining imports.
+"""
+import threading
+import time
+
+_start = time.perf_counter()
+_last = _start
+_phases: list[tuple[str, float]] = []
+_lock = threading.Lock()
+
+
+def mark(name: str) -> float:
+    """Closes the current phase under the given name and returns its duration in seconds."""
+    global _last
+    with _lock:
+        now = time.perf_counter()
+        duration = now - _last
+        _phases.append((name, duration))
+        _last = now
+    return duration
+
+
+def elapsed() -> float:
+    """Seconds since the start of the boot."""
+    return time.perf_counter() - _start
+
+
+def phases() -> list[tuple[str, float]]:
+    """All closed phases with their duration in seconds."""
+    with _lock:
+        return list(_phases)
+
+
+def report() -> str:
+    """Summary of all phases, e.g. to be written to the log once the first frame is shown."""
+    with _lock:
+        total = _last - _start
+        details = ', '.join(f'{name} {duration * 1000:.0f} ms' for name, duration in _phases)
+    return f'boot took {total * 1000:.0f} ms ({details})'
@@ -0,0 +1,54 @@
+import numpy as np
+from PIL import Image
+
+from environment import ColorConfig
+
+# 4x4 Bayer threshold matrix for ordered dithering
+BAYER_4X4 = np.array([
+    [0, 8, 2, 10],
+    [12, 4, 14, 6],
+    [3, 11, 1, 9],
+    [15, 7, 13, 5]
+], dtype=np.uint16)
+
+# palette indices of the theme colors on palette canvases
+BACKGROUND_INDEX = 0
+ACCENT_INDEX = 1
+ACCENT_DARK_INDEX = 2
+# first palette index of the 6x6x6 color cube, that images like map tiles are reduced to
+COLOR_CUBE_OFFSET = 16
+
+
+def dither_rgb565(image: Image.Image) -> Image.Image:
+    """Applies ordered dithering to reduce an RGB image to the colors of the RGB565 format. The result can be truncated
+    to 565RGB without further loss, but smooth gradients like on map tiles do not show color banding."""
+    pixels = np.asarray(image.convert('RGB'), dtype=np.uint16)
+    height, width, _ = pixels.shape
+    threshold = np.tile(BAYER_4X4, (height // 4 + 1, width // 4 + 1))[:height, :width, np.newaxis]
+    # quantization steps of the red, green and blue channel for 5, 6 and 5 bits
+    step = np.array([8, 4, 8], dtype=np.uint16)
+    # offset each pixel by its threshold within one quantization step, truncation does the rest
+    dithered = np.minimum(pixels + (threshold * step + step // 2) // 16, 255) & ~(step - 1) & 0xFF
+    return Image.fromarray(dithered.astype(np.uint8), 'RGB')
+
+
+def create_palette(colors: ColorConfig) -> list[int]:
+    """Creates the palette of a palette canvas, with the theme colors at fixed indices and a color cube for images.
+    The remaining indices stay free, so that drawing with other colors can still allocate them."""
+    palette = [0] * COLOR_CUBE_OFFSET * 3
+    for index, color in ((BACKGROUND_INDEX, colors.background), (ACCENT_INDEX, colors.accent),
+                         (ACCENT_DARK_INDEX, colors.accent_dark)):
+        palette[index * 3:index * 3 + 3] = color
+    levels = range(0, 256, 51)
+    palette += [channel for red in levels for green in levels for blue in levels for channel in (red, green, blue)]
+    return palette
+
+
+def match_canvas(image: Image.Image, canvas: Image.Image) -> Image.Image:
+    """Converts an image to the mode of the canvas it is pasted on. Images pasted on a palette canvas are reduced to
+    the palette of the canvas, otherwise PIL would paste indices of a different palette."""
+    if image.mode == canvas.mode and (image.mode != 'P' or image.getpalette() == canvas.getpalette()):
+        return image
+    if canvas.mode == 'P':
+        return image.convert('RGB').quantize(palette=canvas)
+    return image.convert(canvas.mode)
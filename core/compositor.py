@@ -0,0 +1,111 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from PIL import Image
+
+from core.color import BACKGROUND_INDEX, create_palette
+from environment import AppConfig, ColorConfig
+from interaction.Display import Display
+
+
+class Compositor:
+    """Owns the long-lived frame buffers. The front buffer holds the complete frame including header and footer, the
+    back buffer is the canvas of the app area, that is handed to the active app. Buffers are cleared in place instead
+    of being reallocated for every frame. Allocations and copies are counted to make the buffer usage measurable.
+    With a palette canvas the back buffer is an 8-bit palette image, so that the theme colors are single indices.
+
+    The canvas is only handed to one caller at a time. Apps draw the elements they return as patches, so before the
+    canvas is handed out again, only the area covered by the patches of the previous frame has to be cleared."""
+
+    def __init__(self, app_config: AppConfig):
+        self.__background = app_config.background
+        self.__app_offset = (app_config.app_side_offset, app_config.app_top_offset)
+        self.__allocations = 0
+        self.__copies = 0
+        self.__lock = threading.RLock()  # guards both buffers, reentrant for composing while holding the canvas
+        self.__front = self.__allocate(app_config.resolution)
+        if app_config.palette_canvas:
+            self.__back = self.__allocate(app_config.app_size, 'P')
+            self.__back.putpalette(create_palette(app_config.colors))
+        else:
+            self.__back = self.__allocate(app_config.app_size)
+        self.__drawn: tuple[int, int, int, int] | None = None  # area of the canvas drawn since it was cleared
+
+    def __allocate(self, size: tuple[int, int], mode: str = 'RGB') -> Image.Image:
+        self.__allocations += 1
+        return Image.new(mode, size, BACKGROUND_INDEX if mode == 'P' else self.__background)
+
+    @property
+    def front(self) -> Image.Image:
+        """The complete frame as it was composed last."""
+        return self.__front
+
+    @property
+    def app_offset(self) -> tuple[int, int]:
+        """Position of the app area in the complete frame."""
+        return self.__app_offset
+
+    @property
+    def allocations(self) -> int:
+        """Total number of allocated frame buffers."""
+        return self.__allocations
+
+    @property
+    def copies(self) -> int:
+        """Total number of buffer copies handed out by the compositor."""
+        return self.__copies
+
+    def clear(self, box: tuple[int, int, int, int] | None = None) -> Image.Image:
+        """Clears the given area of the front buffer or the complete front buffer in place and returns it."""
+        with self.__lock:
+            self.__front.paste(self.__background, box or (0, 0) + self.__front.size)
+        return self.__front
+
+    @contextmanager
+    def app_canvas(self) -> Iterator[Image.Image]:
+        """Hands out the canvas of the app area without copying it, exclusively for the duration of the block. The area,
+        that was drawn for the previous frame, is cleared before, so the canvas is blank when it is handed out."""
+        with self.__lock:
+            if self.__drawn is not None:
+                self.__back.paste(BACKGROUND_INDEX if self.__back.mode == 'P' else self.__background, self.__drawn)
+                self.__drawn = None
+            try:
+                yield self.__back
+            except BaseException:
+                # the patches drawn before the failure are unknown, the whole canvas has to be cleared next time
+                self.__drawn = (0, 0) + self.__back.size
+                raise
+
+    def set_colors(self, colors: ColorConfig, display: Display):
+        """Switches the theme colors. On a palette canvas only the palette is swapped, the drawn content keeps its
+        indices and appears in the new colors, once the canvas is shown again, without being drawn again."""
+        with self.__lock:
+            self.__background = colors.background
+            if self.__back.mode == 'P':
+                # keep colors, that were allocated while drawing, behind the predefined part of the palette
+                palette = create_palette(colors)
+                self.__back.putpalette(palette + self.__back.getpalette()[len(palette):])
+                display.palette_changed()
+            else:
+                # the canvas is filled with the old background, which is only replaced where it is drawn next time
+                self.__drawn = (0, 0) + self.__back.size
+
+    def compose(self, patch: Image.Image, x0: int, y0: int):
+        """Pastes a patch of the app canvas into the front buffer, coordinates are relative to the app area. The area
+        of the patch is cleared on the canvas, before it is handed out again."""
+        x_offset, y_offset = self.__app_offset
+        box = (x0, y0, x0 + patch.width, y0 + patch.height)
+        with self.__lock:
+            self.__front.paste(patch, (x0 + x_offset, y0 + y_offset))
+            if self.__drawn is not None:
+                box = (min(box[0], self.__drawn[0]), min(box[1], self.__drawn[1]),
+                       max(box[2], self.__drawn[2]), max(box[3], self.__drawn[3]))
+            self.__drawn = box
+
+    def snapshot(self, image: Image.Image | None = None) -> Image.Image:
+        """Returns a copy of the given buffer or the front buffer, that can be handed to a display, which consumes it
+        asynchronously, while the buffer itself will be reused."""
+        with self.__lock:
+            self.__copies += 1
+            return (self.__front if image is None else image).copy()
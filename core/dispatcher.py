@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum, auto
+from typing import Callable, Hashable, NamedTuple
+
+from core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class InputEvent(Enum):
+
+    KEY_LEFT = auto()
+    KEY_RIGHT = auto()
+    KEY_UP = auto()
+    KEY_DOWN = auto()
+    KEY_A = auto()
+    KEY_B = auto()
+    ROTARY_INCREASE = auto()
+    ROTARY_DECREASE = auto()
+
+    @property
+    def rotary_step(self) -> int:
+        """Number of apps, the event moves forward, or 0 for keys."""
+        if self is InputEvent.ROTARY_INCREASE:
+            return 1
+        if self is InputEvent.ROTARY_DECREASE:
+            return -1
+        return 0
+
+
+class QueuedEvent(NamedTuple):
+    target: Hashable
+    event: InputEvent
+    timestamp: float  # time.monotonic() when the event was posted
+
+
+class InputDispatcher:
+    """Queues input events from any thread, e.g. GPIO callbacks and the rotary encoder loop, and dispatches them on a
+    single thread in the order they arrived. All events, that queue up while the previous events are handled, are
+    dispatched as one batch: consecutive rotary steps are summed up into a single app switch and consecutive key events
+    are handed over together, so that they result in a single redraw."""
+
+    def __init__(self, on_keys: Callable[[Hashable, list[InputEvent]], None],
+                 on_rotary: Callable[[Hashable, int], None], slow_threshold: float = 0.1):
+        self.__on_keys = on_keys
+        self.__on_rotary = on_rotary
+        self.__slow_threshold = slow_threshold
+        self.__queue: deque[QueuedEvent] = deque()
+        self.__condition = threading.Condition()
+        self.__thread: threading.Thread | None = None
+        self.__alive = False
+        self.__dispatching = False
+        self.__events = 0
+        self.__batches = 0
+
+    @property
+    def events(self) -> int:
+        """Total number of posted events."""
+        return self.__events
+
+    @property
+    def batches(self) -> int:
+        """Total number of dispatched batches."""
+        return self.__batches
+
+    def post(self, target: Hashable, event: InputEvent):
+        """Queues the event for the given target. Returns immediately, the dispatch thread is started with the first
+        event."""
+        with self.__condition:
+            self.__events += 1
+            self.__queue.append(QueuedEvent(target, event, time.monotonic()))
+            if self.__thread is None:
+                self.__alive = True
+                self.__thread = threading.Thread(target=self.__dispatch_loop, args=(), daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def __take_queued(self) -> list[QueuedEvent] | None:
+        """Blocks until events are queued and takes all of them. Returns None if the dispatcher was stopped."""
+        with self.__condition:
+            while self.__alive and not self.__queue:
+                self.__condition.wait()
+            if not self.__alive:
+                return None
+            queued = list(self.__queue)
+            self.__queue.clear()
+            self.__dispatching = True
+            return queued
+
+    def __dispatch_loop(self):
+        while (queued := self.__take_queued()) is not None:
+            waited = time.monotonic() - queued[0].timestamp
+            if waited > self.__slow_threshold:
+                logger.debug(f'dispatching {len(queued)} input events {waited * 1000:.0f} ms after the first one')
+            for target, events in _runs(queued):
+                try:
+                    with span(f'input {events[0].name}' if len(events) == 1 else f'input {len(events)} events',
+                              'input'):
+                        self.__dispatch(target, events)
+                except Exception as e:
+                    # a failing handler must not stop the handling of all following inputs
+                    logger.exception(e)
+            with self.__condition:
+                self.__batches += 1
+                self.__dispatching = False
+                self.__condition.notify_all()
+
+    def __dispatch(self, target: Hashable, events: list[InputEvent]):
+        if events[0].rotary_step:
+            # a quick spin of the encoder jumps to the final app at once, instead of entering every app on the way
+            steps = sum(event.rotary_step for event in events)
+            if steps:
+                self.__on_rotary(target, steps)
+        else:
+            self.__on_keys(target, events)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until all events were dispatched. Returns false if the timeout expired before."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not (self.__queue or self.__dispatching) or not self.__alive,
+                                             timeout)
+
+    def stop(self):
+        """Stops the dispatch thread after the current batch, queued events are discarded."""
+        with self.__condition:
+            self.__alive = False
+            self.__queue.clear()
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join(timeout=1)
+        self.__thread = None
+
+
+def _runs(queued: list[QueuedEvent]) -> list[tuple[Hashable, list[InputEvent]]]:
+    """Splits the events into runs of the same target, that are either all rotary steps or all keys."""
+    runs: list[tuple[Hashable, list[InputEvent]]] = []
+    for target, event, _ in queued:
+        if runs and runs[-1][0] == target and bool(runs[-1][1][0].rotary_step) == bool(event.rotary_step):
+            runs[-1][1].append(event)
+        else:
+            runs.append((target, [event]))
+    return runs
@@ -0,0 +1,181 @@
+"""
+Glyph atlas of a font, that is rasterized once and then composes texts from the masks of its glyphs.
+
+The device only uses two sizes of a single font, so rasterizing every glyph once and keeping the masks is cheaper than
+going through FreeType for every text, that is drawn. The masks and metrics are stored in a disk cache, so that later
+starts do not rasterize the glyphs again. Glyphs outside of the prepared character set are rasterized on first use.
+
+Only anti-aliased masks are composed. Without anti-aliasing FreeType places glyphs with a negative left bearing
+differently inside a text than on their own, so texts on palette images are still rendered by FreeType.
+"""
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+CHARSET = ''.join(chr(code) for code in range(32, 127)) + ''.join(chr(code) for code in range(160, 256))
+CACHE_DIRECTORY = '.glyphs'
+
+
+class Glyph(NamedTuple):
+    """Metrics of a glyph relative to the pen position, its mask covers (left, top, right, bottom)."""
+    left: int
+    top: int
+    right: int
+    bottom: int
+    advance: float
+
+
+class GlyphAtlas:
+    """Anti-aliased masks and metrics of the glyphs of a font."""
+
+    def __init__(self, font: ImageFont.FreeTypeFont, charset: str = CHARSET,
+                 cache_directory: str | None = CACHE_DIRECTORY):
+        self.__font = font
+        self.__lock = threading.Lock()
+        self.__glyphs: dict[str, Glyph] = {}
+        self.__masks: dict[str, np.ndarray] = {}
+        self.__kerning: dict[str, float] = {}
+        path = self.__cache_path(cache_directory) if cache_directory else None
+        if path is None or not self.__load(path):
+            for char in charset:
+                self.__rasterize(char)
+            if path is not None:
+                self.__save(path)
+
+    @property
+    def font(self) -> ImageFont.FreeTypeFont:
+        return self.__font
+
+    def __cache_path(self, cache_directory: str) -> str | None:
+        font_path = getattr(self.__font, 'path', None)
+        if not isinstance(font_path, str):
+            return None
+        # the rasterization may change between versions of Pillow and FreeType
+        name = f'{os.path.splitext(os.path.basename(font_path))[0]}-{self.__font.size}-{PIL.__version__}'
+        return os.path.join(cache_directory, f'{name}.npz')
+
+    def __load(self, path: str) -> bool:
+        try:
+            with np.load(path) as cache:
+                codes, metrics, advances, atlas = cache['codes'], cache['metrics'], cache['advances'], cache['atlas']
+        except (OSError, KeyError, ValueError):
+            return False
+        x = 0
+        for code, (left, top, right, bottom), advance in zip(codes.tolist(), metrics.tolist(), advances.tolist()):
+            char = chr(code)
+            self.__glyphs[char] = Glyph(left, top, right, bottom, advance)
+            self.__masks[char] = atlas[:bottom - top, x:x + right - left]
+            x += right - left
+        return True
+
+    def __save(self, path: str):
+        chars = list(self.__glyphs)
+        height = max((glyph.bottom - glyph.top for glyph in self.__glyphs.values()), default=0)
+        # all masks are packed side by side into one strip
+        atlas = np.zeros((height, sum(mask.shape[1] for mask in self.__masks.values())), dtype=np.uint8)
+        x = 0
+        for char in chars:
+            mask = self.__masks[char]
+            atlas[:mask.shape[0], x:x + mask.shape[1]] = mask
+            x += mask.shape[1]
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.savez_compressed(path, codes=np.array([ord(char) for char in chars], dtype=np.uint32),
+                                metrics=np.array([self.__glyphs[char][:4] for char in chars], dtype=np.int32),
+                                advances=np.array([self.__glyphs[char].advance for char in chars]), atlas=atlas)
+        except OSError as e:
+            logger.warning(f'glyph cache {path} not written: {e}')
+
+    def __rasterize(self, char: str) -> Glyph:
+        left, top, right, bottom = map(int, self.__font.getbbox(char))
+        right, bottom = max(right, left), max(bottom, top)
+        image = Image.new('L', (right - left, bottom - top), 0)
+        if image.width and image.height:
+            ImageDraw.Draw(image).text((-left, -top), char, 255, font=self.__font)
+        mask = np.asarray(image, dtype=np.uint8)
+        glyph = Glyph(left, top, right, bottom, self.__font.getlength(char))
+        with self.__lock:
+            self.__glyphs[char] = glyph
+            self.__masks[char] = mask
+        return glyph
+
+    def glyph(self, char: str) -> Glyph:
+        glyph = self.__glyphs.get(char)
+        return glyph if glyph is not None else self.__rasterize(char)
+
+    def __kerning_of(self, pair: str) -> float:
+        kerning = self.__kerning.get(pair)
+        if kerning is None:
+            kerning = self.__font.getlength(pair) - self.glyph(pair[0]).advance - self.glyph(pair[1]).advance
+            self.__kerning[pair] = kerning
+        return kerning
+
+    def layout(self, text: str) -> list[tuple[Glyph, int]]:
+        """Returns the glyphs of the text with the pixel position of their pen."""
+        positions = []
+        pen = 0.0
+        previous = None
+        for char in text:
+            if previous is not None:
+                pen += self.__kerning_of(previous + char)
+            glyph = self.glyph(char)
+            positions.append((glyph, int(pen + 0.5)))
+            pen += glyph.advance
+            previous = char
+        return positions
+
+    def length(self, text: str) -> float:
+        """Advance of the text like font.getlength."""
+        return sum(glyph.advance for glyph in map(self.glyph, text)) \
+            + sum(self.__kerning_of(text[i:i + 2]) for i in range(len(text) - 1))
+
+    def bbox(self, text: str) -> tuple[int, int, int, int]:
+        """Bounding box of the text like font.getbbox, computed from the glyph metrics only."""
+        if not text:
+            return 0, 0, 0, 0
+        layout = self.layout(text)
+        left = min(0, min(x + glyph.left for glyph, x in layout))
+        top = min(glyph.top for glyph, _ in layout)
+        right = max(int(self.length(text) + 0.5), max(x + glyph.right for glyph, x in layout))
+        bottom = max(glyph.bottom for glyph, _ in layout)
+        return left, top, right, bottom
+
+    def render(self, text: str) -> tuple[Image.Image, int, int]:
+        """Composes the mask of the text from the glyph masks. Returns the mask and its offset to the origin of the
+        text."""
+        layout = self.layout(text)
+        left = min(x + glyph.left for glyph, x in layout)
+        top = min(glyph.top for glyph, _ in layout)
+        right = max(x + glyph.right for glyph, x in layout)
+        bottom = max(glyph.bottom for glyph, _ in layout)
+        mask = np.zeros((max(bottom - top, 1), max(right - left, 1)), dtype=np.int32)
+        for (glyph, x), char in zip(layout, text):
+            glyph_mask = self.__masks[char]
+            if glyph_mask.size:
+                x0, y0 = x + glyph.left - left, glyph.top - top
+                target = mask[y0:y0 + glyph_mask.shape[0], x0:x0 + glyph_mask.shape[1]]
+                # overlapping edges of neighbouring glyphs are blended over each other, like Pillow draws them
+                target += glyph_mask - (target * glyph_mask + 127) // 255
+        return Image.fromarray(mask.astype(np.uint8), 'L'), left, top
+
+
+_atlases: dict[ImageFont.FreeTypeFont, GlyphAtlas] = {}
+_atlases_lock = threading.Lock()
+
+
+def atlas(font: ImageFont.FreeTypeFont) -> GlyphAtlas:
+    """Returns the atlas of the font, which is built or loaded on first use."""
+    glyph_atlas = _atlases.get(font)
+    if glyph_atlas is None:
+        with _atlases_lock:
+            glyph_atlas = _atlases.get(font)
+            if glyph_atlas is None:
+                glyph_atlas = _atlases[font] = GlyphAtlas(font)
+    return glyph_atlas
@@ -0,0 +1,93 @@
+import threading
+
+from PIL import Image, ImageDraw
+
+from core.text import draw_text, text_bbox
+from environment import AppConfig
+
+
+class Header:
+    """Header with the titles of all apps, of which the active one is marked as a tab.
+
+    The header only depends on the titles, the active app and the theme colors. The titles are measured once and the
+    header of every active app is rendered on first use into a strip, that is pasted on later frames. All strips are
+    dropped when the apps or the colors change."""
+
+    VERTICAL_LINE = 5  # vertical limiter line
+    APP_SPACING = 20  # space between app headers
+    APP_PADDING = 5  # space around app header
+
+    def __init__(self, app_config: AppConfig):
+        self.__app_config = app_config
+        self.__font = app_config.font_header
+        width, _ = app_config.resolution
+        self.__top_offset = app_config.app_top_offset - self.VERTICAL_LINE  # base for header
+        self.__side_offset = app_config.app_side_offset  # spacing to the sides
+        self.__box = (self.__side_offset, 0, width - self.__side_offset, self.__top_offset + self.VERTICAL_LINE)
+        self.__lock = threading.Lock()
+        self.__key: tuple | None = None
+        self.__layout: list[tuple[int, int, int]] = []
+        self.__strips: dict[int, Image.Image] = {}
+
+    @property
+    def box(self) -> tuple[int, int, int, int]:
+        """Area of the header as (left, top, right, bottom)."""
+        return self.__box
+
+    def invalidate(self):
+        """Drops all rendered strips, e.g. after apps were added."""
+        with self.__lock:
+            self.__key = None
+            self.__strips.clear()
+
+    def __measure(self, titles: tuple[str, ...]) -> list[tuple[int, int, int]]:
+        """Returns the position of every title relative to the header as (x, width, height)."""
+        sizes = [text_bbox(self.__font, title)[2:] for title in titles]
+        max_text_width = self.__box[2] - self.__box[0]
+        app_text_width = sum(width for width, _ in sizes) + (len(titles) - 1) * self.APP_SPACING
+        cursor = (max_text_width - app_text_width) // 2
+        layout = []
+        for width, height in sizes:
+            layout.append((cursor, width, height))
+            cursor += width + self.APP_SPACING
+        return layout
+
+    def __render(self, titles: tuple[str, ...], active_index: int) -> Image.Image:
+        left, top, right, bottom = self.__box
+        background = self.__app_config.background
+        accent = self.__app_config.accent
+        line = self.__top_offset - top
+        strip = Image.new('RGB', (right - left, bottom - top), background)
+        draw = ImageDraw.Draw(strip)
+
+        # draw base header lines
+        last = right - left - 1
+        draw.line((0, bottom - top, 0, line), fill=accent)
+        draw.line((0, line, last, line), fill=accent)
+        draw.line((last, line, last, bottom - top), fill=accent)
+
+        # draw app short name header
+        for index, (title, (x, width, height)) in enumerate(zip(titles, self.__layout)):
+            draw_text(draw, (x, line - height - self.APP_PADDING), title, accent, self.__font)
+            if index == active_index:
+                draw.line((x - self.APP_PADDING, line - self.VERTICAL_LINE, x - self.APP_PADDING, line), fill=accent)
+                draw.line((x - self.APP_PADDING, line, x + width + self.APP_PADDING, line), fill=background)
+                draw.line((x + width + self.APP_PADDING, line, x + width + self.APP_PADDING, line - self.VERTICAL_LINE),
+                          fill=accent)
+        return strip
+
+    def draw(self, image: Image.Image, titles: list[str], active_index: int) -> tuple[Image.Image, int, int]:
+        """Pastes the header for the active app into the complete frame and returns it as patch to show."""
+        titles = tuple(titles)
+        key = (titles, self.__app_config.background, self.__app_config.accent)
+        with self.__lock:
+            if key != self.__key:
+                self.__key = key
+                self.__layout = self.__measure(titles)
+                self.__strips.clear()
+            strip = self.__strips.get(active_index)
+            if strip is None:
+                strip = self.__strips[active_index] = self.__render(titles, active_index)
+        x0, y0 = self.__box[:2]
+        image.paste(strip, (x0, y0))
+        return strip, x0, y0
@@ -0,0 +1,94 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass
+class FrameSample:
+    """Measurement of a single draw call of an app."""
+    duration: float  # seconds spent drawing and composing the frame
+    patches: int  # number of patches handed to the display
+    pixels: int  # number of pixels of all patches
+
+
+@dataclass
+class Statistics:
+    """Distribution of a series of values."""
+    count: int
+    p50: float
+    p95: float
+    max: float
+
+    @classmethod
+    def of(cls, values: list[float]) -> 'Statistics':
+        if not values:
+            return cls(0, 0.0, 0.0, 0.0)
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        # nearest rank percentiles, good enough for a rolling window of a few hundred values
+        return cls(len(ordered), ordered[round(last * 0.5)], ordered[round(last * 0.95)], ordered[last])
+
+
+class FrameMetrics:
+    """Rolling window of render measurements. Draw calls are recorded per app, the display backend records how long
+    patches wait in its queue and how many patches it dropped. All methods can be called from any thread."""
+
+    def __init__(self, window: int = 120):
+        self.__window = window
+        self.__lock = threading.Lock()
+        self.__frames: dict[str, deque[FrameSample]] = {}
+        self.__frame_times: deque[float] = deque(maxlen=window)
+        self.__latencies: deque[float] = deque(maxlen=window)
+        self.__dropped = 0
+
+    def record_frame(self, app: str, duration: float, patches: int, pixels: int):
+        """Records a draw call of the app with the given title."""
+        with self.__lock:
+            if app not in self.__frames:
+                self.__frames[app] = deque(maxlen=self.__window)
+            self.__frames[app].append(FrameSample(duration, patches, pixels))
+            self.__frame_times.append(duration)
+
+    def record_latency(self, latency: float):
+        """Records the time in seconds between showing a patch and sending it to the display."""
+        with self.__lock:
+            self.__latencies.append(latency)
+
+    def record_dropped(self, count: int = 1):
+        """Records patches, that were never sent to the display, because later patches replaced them."""
+        with self.__lock:
+            self.__dropped += count
+
+    @property
+    def apps(self) -> list[str]:
+        """Titles of all apps with recorded draw calls."""
+        with self.__lock:
+            return list(self.__frames)
+
+    @property
+    def dropped(self) -> int:
+        """Total number of dropped patches."""
+        return self.__dropped
+
+    def frame_times(self) -> list[float]:
+        """Durations of the most recent draw calls of all apps, oldest first."""
+        with self.__lock:
+            return list(self.__frame_times)
+
+    def samples(self, app: str) -> list[FrameSample]:
+        """Most recent draw calls of the app with the given title, oldest first."""
+        with self.__lock:
+            return list(self.__frames.get(app, ()))
+
+    def durations(self, app: str) -> Statistics:
+        return Statistics.of([sample.duration for sample in self.samples(app)])
+
+    def patches(self, app: str) -> Statistics:
+        return Statistics.of([sample.patches for sample in self.samples(app)])
+
+    def pixels(self, app: str) -> Statistics:
+        return Statistics.of([sample.pixels for sample in self.samples(app)])
+
+    def latencies(self) -> Statistics:
+        with self.__lock:
+            return Statistics.of(list(self.__latencies))
@@ -0,0 +1,289 @@
+"""
+Profiling helpers for a running device.
+
+Timings are collected by the timed decorator and the timing context manager. Both only check a flag while timings are
+disabled, so they can stay in hot paths. A profiling session enables the timings, samples the stacks of all threads and
+optionally traces memory allocations. When the session is stopped, a report is handed to the sinks, which write it to a
+rotating set of files or keep it as snapshot.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, ContextManager, TypeVar
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+_enabled = False
+_lock = threading.Lock()
+_NULL_CONTEXT = nullcontext()
+
+
+@dataclass
+class TimingStats:
+    """Accumulated durations of a timed function or block."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+
+_timings: dict[str, TimingStats] = {}
+
+
+def enable(state: bool = True):
+    """Enables or disables the collection of timings."""
+    global _enabled
+    _enabled = state
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record(name: str, duration: float):
+    """Adds a duration in seconds to the timings of the given name."""
+    with _lock:
+        stats = _timings.get(name)
+        if stats is None:
+            stats = _timings[name] = TimingStats()
+        stats.add(duration)
+
+
+def timings() -> dict[str, TimingStats]:
+    """Returns a copy of all collected timings."""
+    with _lock:
+        return {name: TimingStats(stats.count, stats.total, stats.max) for name, stats in _timings.items()}
+
+
+def reset_timings():
+    with _lock:
+        _timings.clear()
+
+
+def timed(name: str | None = None) -> Callable[[_F], _F]:
+    """Decorator, that records the duration of each call under the given name or the qualified name of the function.
+    While timings are disabled, the only overhead is checking a flag."""
+    def decorator(func: _F) -> _F:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+        return wrapper  # noqa (wrapper has the signature of func)
+    return decorator
+
+
+class _Timing:
+
+    def __init__(self, name: str):
+        self.__name = name
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        record(self.__name, time.perf_counter() - self.__start)
+        return False
+
+
+def timing(name: str) -> ContextManager:
+    """Context manager, that records the duration of the block under the given name. While timings are disabled, a
+    shared no-op context is returned."""
+    return _Timing(name) if _enabled else _NULL_CONTEXT
+
+
+@dataclass
+class ProfileReport:
+    """Result of a profiling session."""
+    started: datetime
+    stopped: datetime
+    timings: dict[str, TimingStats]
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)  # collapsed stacks, root first, separated by semicolons
+    memory: list[str] = field(default_factory=list)  # top allocations by line
+
+    def top_functions(self, limit: int = 25) -> list[tuple[str, int]]:
+        """Returns the functions, that were seen most often on top of the sampled stacks."""
+        functions: Counter = Counter()
+        for stack, count in self.stacks.items():
+            functions[stack.rsplit(';', 1)[-1]] += count
+        return functions.most_common(limit)
+
+    def to_text(self) -> str:
+        duration = (self.stopped - self.started).total_seconds()
+        lines = [f'profile from {self.started.isoformat(timespec="seconds")} ({duration:.1f} s)', '', 'timings:']
+        for name, stats in sorted(self.timings.items(), key=lambda item: item[1].total, reverse=True):
+            lines.append(f'  {name:<48}{stats.count:>8}{stats.total * 1000:>12.1f} ms{stats.mean * 1000:>10.2f} ms'
+                         f'{stats.max * 1000:>10.2f} ms')
+        if self.samples:
+            lines += ['', f'top functions of {self.samples} samples:']
+            lines += [f'  {count / self.samples:>6.1%}  {function}' for function, count in self.top_functions()]
+        if self.memory:
+            lines += ['', 'top allocations:'] + [f'  {line}' for line in self.memory]
+        return '\n'.join(lines) + '\n'
+
+    def to_collapsed(self) -> str:
+        """Returns the sampled stacks in the collapsed format, that flame graph tools read."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class Sink(ABC):
+    """Destination of profile reports."""
+
+    @abstractmethod
+    def write(self, report: ProfileReport):
+        raise NotImplementedError
+
+
+class SnapshotSink(Sink):
+    """Keeps the most recent report in memory, e.g. to show it on the device."""
+
+    def __init__(self):
+        self.__snapshot: ProfileReport | None = None
+
+    @property
+    def snapshot(self) -> ProfileReport | None:
+        return self.__snapshot
+
+    def write(self, report: ProfileReport):
+        self.__snapshot = report
+
+
+class RotatingFileSink(Sink):
+    """Writes each report as text file and its sampled stacks as collapsed stacks file into a directory. Only the files
+    of the most recent reports are kept."""
+
+    def __init__(self, directory: str, max_reports: int = 5, prefix: str = 'profile'):
+        self.__directory = directory
+        self.__max_reports = max_reports
+        self.__prefix = prefix
+
+    def write(self, report: ProfileReport):
+        os.makedirs(self.__directory, exist_ok=True)
+        name = os.path.join(self.__directory, f'{self.__prefix}-{report.started.strftime("%Y%m%d-%H%M%S")}')
+        with open(f'{name}.txt', 'w') as file:
+            file.write(report.to_text())
+        if report.stacks:
+            with open(f'{name}.folded', 'w') as file:
+                file.write(report.to_collapsed())
+        self.__rotate()
+
+    def __rotate(self):
+        reports = sorted(entry for entry in os.listdir(self.__directory)
+                         if entry.startswith(f'{self.__prefix}-') and entry.endswith('.txt'))
+        for entry in reports[:max(len(reports) - self.__max_reports, 0)]:
+            base = os.path.join(self.__directory, entry[:-len('.txt')])
+            for extension in ('.txt', '.folded'):
+                if os.path.exists(base + extension):
+                    os.remove(base + extension)
+
+
+class ProfilingSession:
+    """Profiling session, that can be started and stopped at any time. While running, timings are enabled and the
+    stacks of all threads are sampled at a fixed interval. The deterministic profiler of cProfile is not used, because
+    it only sees the thread that enabled it. Memory allocations are traced with tracemalloc if requested, which slows
+    down every allocation noticeably. Sampled frames are keyed by function and file, so that all samples of a function
+    aggregate into one node of the flame graph. With line numbers, each sampled line of a function is a node of its
+    own."""
+
+    def __init__(self, sinks: list[Sink], sample_interval: float = 0.005, trace_memory: bool = False,
+                 max_depth: int = 32, line_numbers: bool = False):
+        self.__sinks = sinks
+        self.__sample_interval = sample_interval
+        self.__trace_memory = trace_memory
+        self.__max_depth = max_depth
+        self.__line_numbers = line_numbers
+        self.__lock = threading.Lock()
+        self.__sampler: threading.Thread | None = None
+        self.__running = False
+        self.__started = datetime.now()
+        self.__stacks: Counter = Counter()
+        self.__samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    def start(self):
+        with self.__lock:
+            if self.__running:
+                return
+            self.__running = True
+            self.__started = datetime.now()
+            self.__stacks = Counter()
+            self.__samples = 0
+            reset_timings()
+            enable()
+            if self.__trace_memory:
+                tracemalloc.start()
+            self.__sampler = threading.Thread(target=self.__sample_loop, args=(), daemon=True)
+            self.__sampler.start()
+
+    def stop(self) -> ProfileReport | None:
+        """Stops the session and hands the report to all sinks. Returns None if the session was not running."""
+        with self.__lock:
+            if not self.__running:
+                return None
+            self.__running = False
+        self.__sampler.join()
+        enable(False)
+        memory = []
+        if tracemalloc.is_tracing():
+            memory = [str(statistic) for statistic in tracemalloc.take_snapshot().statistics('lineno')[:25]]
+            tracemalloc.stop()
+        report = ProfileReport(self.__started, datetime.now(), timings(), self.__samples, self.__stacks, memory)
+        for sink in self.__sinks:
+            sink.write(report)
+        return report
+
+    def toggle(self):
+        """Starts the session if it is stopped, and stops it otherwise."""
+        if self.__running:
+            self.stop()
+        else:
+            self.start()
+
+    def __sample_loop(self):
+        own_id = threading.get_ident()
+        names = {}
+        while self.__running:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():  # noqa (no public alternative for all threads)
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.__max_depth:
+                    code = frame.f_code
+                    file = os.path.basename(code.co_filename)
+                    stack.append(f'{code.co_qualname} ({file}:{frame.f_lineno})' if self.__line_numbers
+                                 else f'{code.co_qualname} ({file})')
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.__stacks[';'.join(reversed(stack))] += 1
+            self.__samples += 1
+            time.sleep(self.__sample_interval)
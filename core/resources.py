@@ -1,36 +1,114 @@
+"""
+Icons of the apps, packed into a single sprite sheet.
+
+The sheet is read with a single file access on first use of any icon, its layout is stored in a text chunk of the PNG
+itself. Icons are cropped from the sheet on first use. Inverted icons and colored tiles are kept as well, so that draw
+loops paste ready-made tiles instead of inverting and colorizing bitmaps for every frame. Icons are also available as
+module attributes, e.g. resources.file_icon.
+
+The sheet is packed from the single icons in the resources directory with: python -m core.resources
+"""
+import json
 import os
+import threading
+from functools import lru_cache
 
-from PIL import Image
+from PIL import Image, ImageOps, PngImagePlugin
 
 resources_path = 'resources'
+sheet_file = 'icons.png'
+
+# names of the icons, which are packed from <name>.png
+ICONS = (
+    # file manager app icons
+    'file', 'directory',
+    # radio app icons
+    'stop', 'previous', 'play', 'pause', 'skip', 'order', 'random', 'volume_decrease', 'volume_increase',
+    # environment app icons
+    'temperature', 'pressure', 'humidity',
+    # map app icons
+    'minus', 'plus', 'move', 'focus',
+    # status icons
+    'network', 'gps',
+)
+
+_SHEET_WIDTH = 256
+_LAYOUT_KEY = 'layout'
+
+_lock = threading.Lock()
+_sheet: Image.Image | None = None
+_layout: dict[str, tuple[int, int, int, int]] = {}
+
+
+def _load_sheet() -> tuple[Image.Image, dict[str, tuple[int, int, int, int]]]:
+    global _sheet, _layout
+    with _lock:
+        if _sheet is None:
+            with Image.open(os.path.join(resources_path, sheet_file)) as image:
+                image.load()
+                _layout = {name: tuple(box) for name, box in json.loads(image.text[_LAYOUT_KEY]).items()}
+                _sheet = image.convert('1')
+        return _sheet, _layout
+
+
+@lru_cache(maxsize=None)
+def icon(name: str, inverted: bool = False) -> Image.Image:
+    """Returns the bilevel icon with the given name, which can be drawn with draw.bitmap."""
+    if inverted:
+        return ImageOps.invert(icon(name))
+    sheet, layout = _load_sheet()
+    if name not in layout:
+        raise KeyError(f'no icon {name} in {sheet_file}')
+    return sheet.crop(layout[name])
+
+
+@lru_cache(maxsize=256)
+def tile(name: str, fill: tuple[int, int, int] | int, background: tuple[int, int, int] | int, mode: str = 'RGB',
+         inverted: bool = False) -> Image.Image:
+    """Returns the icon as an image in the given mode, drawn in the fill color on the background color. Colors of
+    palette tiles are palette indices."""
+    mask = icon(name, inverted)
+    image = Image.new(mode, mask.size, background)
+    image.paste(fill, (0, 0) + mask.size, mask)
+    return image
+
+
+def paste_icon(image: Image.Image, xy: tuple[int, int], name: str, fill: tuple[int, int, int],
+               background: tuple[int, int, int], inverted: bool = False):
+    """Pastes the icon in the fill color on the background color, like a rectangle in the background color and the
+    bitmap of the icon in the fill color would do."""
+    if image.mode == 'P':
+        fill, background = image.palette.getcolor(fill, image), image.palette.getcolor(background, image)
+    image.paste(tile(name, fill, background, image.mode, inverted), xy)
+
+
+def __getattr__(attribute: str) -> Image.Image:
+    # module attributes like file_icon for the icons of the sheet
+    if attribute.endswith('_icon') and attribute[:-len('_icon')] in ICONS:
+        return icon(attribute[:-len('_icon')])
+    raise AttributeError(f'module {__name__} has no attribute {attribute}')
+
+
+def pack(names: tuple[str, ...] = ICONS):
+    """Packs the single icons into the sprite sheet. The icons are placed on shelves by decreasing height."""
+    icons = {name: Image.open(os.path.join(resources_path, f'{name}.png')).convert('1') for name in names}
+    layout: dict[str, tuple[int, int, int, int]] = {}
+    x = y = shelf_height = 0
+    for name in sorted(names, key=lambda n: (-icons[n].height, n)):
+        width, height = icons[name].size
+        if x + width > _SHEET_WIDTH:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        layout[name] = (x, y, x + width, y + height)
+        x += width
+        shelf_height = max(shelf_height, height)
+    sheet = Image.new('1', (_SHEET_WIDTH, y + shelf_height), 0)
+    for name, box in layout.items():
+        sheet.paste(icons[name], box[:2])
+    info = PngImagePlugin.PngInfo()
+    info.add_text(_LAYOUT_KEY, json.dumps({name: layout[name] for name in names}))
+    sheet.save(os.path.join(resources_path, sheet_file), pnginfo=info, optimize=True)
+
 
-# file manager app icons
-file_icon = Image.open(os.path.join(resources_path, 'file.png')).convert('1')
-directory_icon = Image.open(os.path.join(resources_path, 'directory.png')).convert('1')
-
-
-# radio app icons
-stop_icon = Image.open(os.path.join(resources_path, 'stop.png')).convert('1')
-previous_icon = Image.open(os.path.join(resources_path, 'previous.png')).convert('1')
-play_icon = Image.open(os.path.join(resources_path, 'play.png')).convert('1')
-pause_icon = Image.open(os.path.join(resources_path, 'pause.png')).convert('1')
-skip_icon = Image.open(os.path.join(resources_path, 'skip.png')).convert('1')
-order_icon = Image.open(os.path.join(resources_path, 'order.png')).convert('1')
-random_icon = Image.open(os.path.join(resources_path, 'random.png')).convert('1')
-volume_decrease_icon = Image.open(os.path.join(resources_path, 'volume_decrease.png')).convert('1')
-volume_increase_icon = Image.open(os.path.join(resources_path, 'volume_increase.png')).convert('1')
-
-# environment app icons
-temperature_icon = Image.open(os.path.join(resources_path, 'temperature.png')).convert('1')
-pressure_icon = Image.open(os.path.join(resources_path, 'pressure.png')).convert('1')
-humidity_icon = Image.open(os.path.join(resources_path, 'humidity.png')).convert('1')
-
-# map app icons
-minus_icon = Image.open(os.path.join(resources_path, 'minus.png')).convert('1')
-plus_icon = Image.open(os.path.join(resources_path, 'plus.png')).convert('1')
-move_icon = Image.open(os.path.join(resources_path, 'move.png')).convert('1')
-focus_icon = Image.open(os.path.join(resources_path, 'focus.png')).convert('1')
-
-# status icons
-network_icon = Image.open(os.path.join(resources_path, 'network.png')).convert('1')
-gps_icon = Image.open(os.path.join(resources_path, 'gps.png')).convert('1')
+if __name__ == '__main__':
+    pack()
+    print(f'packed {len(ICONS)} icons into {os.path.join(resources_path, sheet_file)}')
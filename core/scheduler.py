@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from enum import Flag, auto
+from typing import Callable, Hashable
+
+from core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class Invalidation(Flag):
+    """Parts of the frame, that have to be drawn again. Requests for the same target are merged into one flag."""
+
+    NONE = 0
+    PARTIAL = auto()  # changed elements of the app
+    FOOTER = auto()  # footer with status icons and clock
+    FULL = auto()  # complete frame, including header, footer and app
+    CLEAR = auto()  # complete frame on a cleared buffer, e.g. after a reset of the display
+
+    def merged(self) -> 'Invalidation':
+        """Removes the parts, that are already covered by a complete frame."""
+        if self & Invalidation.CLEAR:
+            return Invalidation.CLEAR | Invalidation.FULL
+        if self & Invalidation.FULL:
+            return Invalidation.FULL
+        return self
+
+
+class FrameScheduler:
+    """Collects invalidation requests from any thread and renders them on a single render thread. All requests, that
+    arrive until the next frame is due, are merged into one render call per target. Frames are paced to the maximum
+    frame rate, so that bursts of requests do not result in a burst of renders."""
+
+    def __init__(self, render: Callable[[Hashable, Invalidation], None], max_frame_rate: float):
+        self.__render = render
+        self.__frame_interval = 1.0 / max_frame_rate if max_frame_rate > 0 else 0.0
+        self.__pending: dict[Hashable, Invalidation] = {}
+        self.__condition = threading.Condition()
+        self.__thread: threading.Thread | None = None
+        self.__alive = False
+        self.__rendering = False
+        self.__frames = 0
+        self.__requests = 0
+
+    @property
+    def frames(self) -> int:
+        """Total number of rendered frames."""
+        return self.__frames
+
+    @property
+    def requests(self) -> int:
+        """Total number of received invalidation requests."""
+        return self.__requests
+
+    @property
+    def frame_interval(self) -> float:
+        """Minimum time in seconds between the start of two frames."""
+        return self.__frame_interval
+
+    def request(self, target: Hashable, invalidation: Invalidation):
+        """Requests to draw the given parts of the frame on the given target. Returns immediately, the render thread is
+        started with the first request."""
+        with self.__condition:
+            self.__requests += 1
+            self.__pending[target] = (self.__pending.get(target, Invalidation.NONE) | invalidation).merged()
+            if self.__thread is None:
+                self.__alive = True
+                self.__thread = threading.Thread(target=self.__render_loop, args=(), daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def __take_pending(self) -> dict[Hashable, Invalidation] | None:
+        """Blocks until requests are pending and takes all of them. Returns None if the scheduler was stopped."""
+        with self.__condition:
+            while self.__alive and not self.__pending:
+                self.__condition.wait()
+            if not self.__alive:
+                return None
+            pending = self.__pending
+            self.__pending = {}
+            self.__rendering = True
+            return pending
+
+    def __render_loop(self):
+        while (pending := self.__take_pending()) is not None:
+            frame_start = time.monotonic()
+            for target, invalidation in pending.items():
+                try:
+                    with span(f'frame {invalidation.name}', 'render'):
+                        self.__render(target, invalidation)
+                except Exception as e:
+                    # a failing frame must not stop the rendering of all following frames
+                    logger.exception(e)
+            with self.__condition:
+                self.__frames += 1
+                self.__rendering = False
+                self.__condition.notify_all()
+            # requests, that arrive in the meantime, are merged into the next frame
+            time.sleep(max(self.__frame_interval - (time.monotonic() - frame_start), 0))
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until all requests were rendered. Returns false if the timeout expired before."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not (self.__pending or self.__rendering) or not self.__alive,
+                                             timeout)
+
+    def stop(self):
+        """Stops the render thread after the current frame, pending requests are discarded."""
+        with self.__condition:
+            self.__alive = False
+            self.__pending.clear()
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join(timeout=1)
+        self.__thread = None
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from core import resources
+from core.data import ConnectionStatus, DeviceStatus
+from core.text import draw_text
+from data.BatteryStatusProvider import BatteryStatusProvider
+from data.LocationProvider import LocationProvider
+from data.NetworkStatusProvider import NetworkStatusProvider
+from environment import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Provider values shown in the status bar, read at the same time."""
+    connection_status: ConnectionStatus
+    location_status: DeviceStatus
+    state_of_charge: float | None
+
+
+class StatusBar:
+    """Footer with the status of the network, the GPS module and the battery and the current date and time.
+
+    The layout is computed once. Every field gets a slot, that is wide enough for all of its values, so that a field
+    can be drawn again without touching its neighbours. A partial draw only draws the fields, whose content changed
+    since they were drawn last, which is usually just the seconds. Provider values are read by a background thread into
+    a snapshot, because some providers block on I2C reads or subprocess calls."""
+
+    HEIGHT = 20  # height of the footer
+    BOTTOM_OFFSET = 3  # spacing to the bottom
+    ICON_PADDING = 3  # padding between status icons
+
+    # fields of the clock from right to left, with the separator to their left
+    __CLOCK_FIELDS = (('seconds', '%S', ':'), ('minutes', '%M', ':'), ('hours', '%H', ' '), ('date', '%d-%m-%Y', ''))
+
+    def __init__(self, app_config: AppConfig, network_status_provider: NetworkStatusProvider,
+                 location_provider: LocationProvider, battery_status_provider: BatteryStatusProvider,
+                 refresh_interval: float = 5.0):
+        self.__network_status_provider = network_status_provider
+        self.__location_provider = location_provider
+        self.__battery_status_provider = battery_status_provider
+        self.__refresh_interval = refresh_interval
+        self.__accent = app_config.accent
+        self.__background = app_config.background
+        self.__fill = app_config.accent_dark
+        self.__font = app_config.font_header
+        self.__snapshot: StatusSnapshot | None = None
+        self.__refresh_thread: threading.Thread | None = None
+        self.__drawn: dict[str, Any] = {}
+
+        width, height = app_config.resolution
+        side_offset = app_config.app_side_offset
+        top = height - self.HEIGHT - self.BOTTOM_OFFSET
+        bottom = height - self.BOTTOM_OFFSET
+        self.__box = (side_offset, top, width - side_offset, bottom)
+
+        # slots as (left, top, right, bottom) and the position of their content
+        self.__slots: dict[str, tuple[int, int, int, int]] = {}
+        self.__anchors: dict[str, tuple[int, int]] = {}
+        cursor_x = side_offset
+        for name in ('network', 'gps'):
+            icon = resources.icon(name)
+            x = cursor_x + self.ICON_PADDING
+            self.__slots[name] = (x, top, x + icon.width, bottom)
+            self.__anchors[name] = (x, top + (self.HEIGHT - icon.height) // 2)
+            cursor_x += icon.width + self.ICON_PADDING
+
+        widest_digit = max('0123456789', key=self.__font.getlength)
+        _, _, _, text_height = self.__font.getbbox(widest_digit)
+        text_padding = (self.HEIGHT - text_height) // 2
+        text_y = top + text_padding
+
+        x = cursor_x + self.ICON_PADDING
+        self.__slots['battery'] = (x, top, x + int(self.__font.getlength('100%')) + 1, bottom)
+        self.__anchors['battery'] = (x, text_y)
+
+        # the clock is right aligned and every digit is given the width of the widest digit
+        self.__separators: list[tuple[str, tuple[int, int]]] = []
+        right = width - side_offset - text_padding
+        for name, time_format, separator in self.__CLOCK_FIELDS:
+            sample = ''.join(widest_digit if c.isdigit() else c for c in datetime(2000, 1, 1).strftime(time_format))
+            left = right - int(self.__font.getlength(sample)) - 1
+            self.__slots[name] = (left, top, right, bottom)
+            self.__anchors[name] = (left, text_y)
+            right = left - int(self.__font.getlength(separator))
+            if separator:
+                self.__separators.append((separator, (right, text_y)))
+
+    @property
+    def box(self) -> tuple[int, int, int, int]:
+        """Area of the status bar as (left, top, right, bottom)."""
+        return self.__box
+
+    @property
+    def snapshot(self) -> StatusSnapshot | None:
+        return self.__snapshot
+
+    def refresh(self):
+        """Reads all provider values into a new snapshot. Values of failing providers are taken from the previous
+        snapshot."""
+        previous = self.__snapshot
+        try:
+            connection_status = self.__network_status_provider.get_connection_status()
+        except Exception as e:
+            logger.exception(e)
+            connection_status = previous.connection_status if previous else ConnectionStatus.DISCONNECTED
+        try:
+            location_status = self.__location_provider.get_device_status()
+        except Exception as e:
+            logger.exception(e)
+            location_status = previous.location_status if previous else DeviceStatus.UNAVAILABLE
+        try:
+            state_of_charge = self.__battery_status_provider.get_state_of_charge()
+        except Exception as e:
+            logger.exception(e)
+            state_of_charge = previous.state_of_charge if previous else None
+        self.__snapshot = StatusSnapshot(connection_status, location_status, state_of_charge)
+
+    def __refresh_loop(self):
+        while True:
+            time.sleep(self.__refresh_interval)
+            self.refresh()
+
+    def __current_snapshot(self) -> StatusSnapshot:
+        if self.__snapshot is None:
+            # only the very first draw waits for the providers, all later draws use the snapshot of the last refresh
+            self.refresh()
+        if self.__refresh_thread is None:
+            self.__refresh_thread = threading.Thread(target=self.__refresh_loop, args=(), daemon=True)
+            self.__refresh_thread.start()
+        return self.__snapshot
+
+    def __values(self, tick: int) -> dict[str, Any]:
+        snapshot = self.__current_snapshot()
+        blink = self.__accent if tick else self.__background
+        connection_status_color = {
+            ConnectionStatus.CONNECTED: self.__accent,
+            ConnectionStatus.DISCONNECTED: blink
+        }
+        device_status_color = {
+            DeviceStatus.OPERATIONAL: self.__accent,
+            DeviceStatus.NO_DATA: blink,
+            DeviceStatus.UNAVAILABLE: self.__background
+        }
+        values: dict[str, Any] = {
+            'network': connection_status_color[snapshot.connection_status],
+            'gps': device_status_color[snapshot.location_status],
+            'battery': f'{snapshot.state_of_charge:.0%}' if snapshot.state_of_charge is not None else '?%',
+        }
+        now = datetime.now()
+        for name, time_format, _ in self.__CLOCK_FIELDS:
+            values[name] = now.strftime(time_format)
+        return values
+
+    def draw(self, image: Image.Image, tick: int, partial: bool = False) -> list[tuple[Image.Image, int, int]]:
+        """Draws the status bar into the complete frame and returns the patches to show. A partial draw returns one
+        patch per changed field, a full draw the complete status bar."""
+        values = self.__values(tick)
+        draw = ImageDraw.Draw(image)
+        full = not (partial and self.__drawn)
+        if not full:
+            changed = [name for name, value in values.items() if self.__drawn.get(name) != value]
+        else:
+            changed = list(values)
+            left, top, right, bottom = self.__box
+            draw.rectangle((left, top, right - 1, bottom - 1), fill=self.__fill)
+            for separator, xy in self.__separators:
+                draw_text(draw, xy, separator, self.__accent, self.__font)
+        for name in changed:
+            left, top, right, bottom = self.__slots[name]
+            draw.rectangle((left, top, right - 1, bottom - 1), fill=self.__fill)
+            if name in ('network', 'gps'):
+                resources.paste_icon(image, self.__anchors[name], name, values[name], self.__fill)
+            else:
+                draw_text(draw, self.__anchors[name], values[name], self.__accent, self.__font)
+        self.__drawn = values
+        if full:
+            return [(image.crop(self.__box), self.__box[0], self.__box[1])]
+        return [(image.crop(self.__slots[name]), *self.__slots[name][:2]) for name in changed]
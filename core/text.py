@@ -0,0 +1,139 @@
+"""
+Text rendering helpers, that avoid measuring and rasterizing the same text again for every frame.
+
+Widths are estimated from per-font tables of glyph advances, so that truncating a text to a width takes a binary search
+over the prefix sums of its advances and a few exact measurements around the result, instead of measuring every prefix.
+Rendered texts are kept as masks in an LRU cache and blitted in the fill color, so labels, that did not change, are
+not rasterized again. Texts of TrueType fonts are measured and composed from the glyph atlas of their font, see
+core.glyphs, instead of going through FreeType.
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+
+from PIL import Image, ImageDraw, ImageFont
+
+from core.glyphs import atlas
+
+_Font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+MAX_RENDERED = 512  # number of rendered texts, that are kept
+
+_lock = threading.Lock()
+_advances: dict[_Font, dict[str, float]] = {}
+_rendered: OrderedDict[tuple[_Font, str, str], tuple[Image.Image, int, int]] = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+@dataclass
+class CacheInfo:
+    """Counters of the caches of rendered and truncated texts."""
+    hits: int
+    misses: int
+    size: int
+    truncate_hits: int
+    truncate_misses: int
+
+
+def cache_info() -> CacheInfo:
+    truncated = _truncated.cache_info()
+    return CacheInfo(_hits, _misses, len(_rendered), truncated.hits, truncated.misses)
+
+
+def clear_cache():
+    """Clears all cached advances and rendered texts and resets the counters."""
+    global _hits, _misses
+    with _lock:
+        _advances.clear()
+        _rendered.clear()
+        _hits = 0
+        _misses = 0
+    _truncated.cache_clear()
+
+
+def text_bbox(font: _Font, text: str) -> tuple[int, int, int, int]:
+    """Bounding box of the text relative to its origin, like font.getbbox(text)."""
+    if isinstance(font, ImageFont.FreeTypeFont):
+        return atlas(font).bbox(text)
+    return tuple(map(int, font.getbbox(text)))
+
+
+def text_width(font: _Font, text: str) -> int:
+    """Exact width of the text as drawn from its origin, like font.getbbox(text)[2]."""
+    return text_bbox(font, text)[2] if text else 0
+
+
+def _advance_table(font: _Font) -> dict[str, float]:
+    table = _advances.get(font)
+    if table is None:
+        with _lock:
+            table = _advances.setdefault(font, {})
+    return table
+
+
+def _prefix_widths(font: _Font, text: str) -> list[float]:
+    """Estimated widths of all prefixes of the text from the cached advances of its glyphs."""
+    table = _advance_table(font)
+    advances = []
+    for char in text:
+        advance = table.get(char)
+        if advance is None:
+            advance = table[char] = font.getlength(char)
+        advances.append(advance)
+    return list(accumulate(advances))
+
+
+def truncate(font: _Font, text: str, max_width: int) -> str:
+    """Returns the longest prefix of the text, that fits into the given width, e.g. to cut off long file names."""
+    return _truncated(font, text, max_width)
+
+
+@lru_cache(maxsize=1024)
+def _truncated(font: _Font, text: str, max_width: int) -> str:
+    if text_width(font, text) <= max_width:
+        return text
+    # the estimate ignores kerning and the overhang of the last glyph, which the exact measurements correct
+    length = bisect_right(_prefix_widths(font, text), max_width)
+    while length > 0 and text_width(font, text[:length]) > max_width:
+        length -= 1
+    while length < len(text) and text_width(font, text[:length + 1]) <= max_width:
+        length += 1
+    return text[:length]
+
+
+def _render(font: _Font, text: str, mode: str) -> tuple[Image.Image, int, int]:
+    global _hits, _misses
+    key = (font, text, mode)
+    with _lock:
+        rendered = _rendered.get(key)
+        if rendered is not None:
+            _rendered.move_to_end(key)
+            _hits += 1
+            return rendered
+        _misses += 1
+    if mode == 'L' and isinstance(font, ImageFont.FreeTypeFont):
+        rendered = atlas(font).render(text)
+    else:
+        left, top, right, bottom = map(int, font.getbbox(text))
+        mask = Image.new(mode, (max(right - left, 1), max(bottom - top, 1)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, 255, font=font)
+        rendered = mask, left, top
+    with _lock:
+        _rendered[key] = rendered
+        if len(_rendered) > MAX_RENDERED:
+            _rendered.popitem(last=False)
+    return rendered
+
+
+def draw_text(draw: ImageDraw.ImageDraw, xy: tuple[int, int], text: str, fill, font: _Font):
+    """Draws the text like draw.text, but blits a cached mask of it. The mask is rendered without anti-aliasing on
+    palette and bilevel images, like draw.text does, so that no new colors are introduced."""
+    if not text:
+        return
+    mask, left, top = _render(font, text, draw.fontmode)
+    x, y = xy
+    draw.bitmap((int(x) + left, int(y) + top), mask, fill=fill)
@@ -0,0 +1,184 @@
+"""
+Span tracer, that writes a timeline of all threads in the Chrome Trace Event format, which can be opened with
+chrome://tracing or https://ui.perfetto.dev.
+
+Each thread records its spans into its own ring buffer without taking a lock. A background thread flushes the buffers
+to the trace file periodically. If a thread records more spans between two flushes than its buffer holds, the oldest
+spans are overwritten and counted as dropped. While no tracer is running, span and traced only check a variable.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, TypeVar
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+_NULL_CONTEXT = nullcontext()
+
+
+class _RingBuffer:
+    """Spans of a single thread. Only the owning thread writes, only the flush thread reads."""
+
+    def __init__(self, size: int, thread: threading.Thread):
+        self.events: list[tuple[str, str, int, int] | None] = [None] * size
+        self.written = 0
+        self.flushed = 0
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+
+    def append(self, event: tuple[str, str, int, int]):
+        self.events[self.written % len(self.events)] = event
+        self.written += 1
+
+
+class _Span:
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str):
+        self.__tracer = tracer
+        self.__name = name
+        self.__category = category
+        self.__start = 0
+
+    def __enter__(self):
+        self.__start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        self.__tracer.record(self.__name, self.__category, self.__start, time.perf_counter_ns() - self.__start)
+        return False
+
+
+class Tracer:
+    """Collects spans of all threads and flushes them to a trace file in the background."""
+
+    def __init__(self, path: str, buffer_size: int = 4096, flush_interval: float = 1.0):
+        self.__path = path
+        self.__buffer_size = buffer_size
+        self.__flush_interval = flush_interval
+        self.__local = threading.local()
+        self.__buffers: list[_RingBuffer] = []
+        self.__buffers_lock = threading.Lock()  # only taken when a thread records its first span
+        self.__file_lock = threading.Lock()
+        self.__pid = os.getpid()
+        self.__dropped = 0
+        self.__file = open(path, 'w')
+        # the JSON array format of the trace event format tolerates a missing closing bracket, so it can be streamed
+        self.__file.write('[\n')
+        self.__alive = threading.Event()
+        self.__alive.set()
+        self.__flush_thread = threading.Thread(target=self.__flush_loop, args=(), name='trace-flush', daemon=True)
+        self.__flush_thread.start()
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def dropped(self) -> int:
+        """Number of spans, that were overwritten before they were flushed."""
+        return self.__dropped
+
+    def __buffer(self) -> _RingBuffer:
+        buffer = getattr(self.__local, 'buffer', None)
+        if buffer is None:
+            buffer = _RingBuffer(self.__buffer_size, threading.current_thread())
+            self.__local.buffer = buffer
+            with self.__buffers_lock:
+                self.__buffers.append(buffer)
+        return buffer
+
+    def record(self, name: str, category: str, start_ns: int, duration_ns: int):
+        """Records a span of the current thread, times are taken from time.perf_counter_ns."""
+        self.__buffer().append((name, category, start_ns, duration_ns))
+
+    def span(self, name: str, category: str = 'piboy') -> ContextManager:
+        return _Span(self, name, category)
+
+    def flush(self):
+        """Writes all spans recorded since the last flush to the trace file."""
+        with self.__buffers_lock:
+            buffers = list(self.__buffers)
+        lines = []
+        for buffer in buffers:
+            if buffer.flushed == 0 and buffer.written:
+                lines.append(json.dumps({'name': 'thread_name', 'ph': 'M', 'pid': self.__pid,
+                                         'tid': buffer.thread_id, 'args': {'name': buffer.thread_name}}))
+            written = buffer.written
+            start = max(buffer.flushed, written - len(buffer.events))
+            self.__dropped += start - buffer.flushed
+            for index in range(start, written):
+                name, category, start_ns, duration_ns = buffer.events[index % len(buffer.events)]
+                lines.append(json.dumps({'name': name, 'cat': category, 'ph': 'X', 'ts': start_ns / 1000,
+                                         'dur': duration_ns / 1000, 'pid': self.__pid, 'tid': buffer.thread_id}))
+            buffer.flushed = written
+        if lines:
+            with self.__file_lock:
+                if not self.__file.closed:
+                    self.__file.write(',\n'.join(lines) + ',\n')
+                    self.__file.flush()
+
+    def __flush_loop(self):
+        while self.__alive.is_set():
+            time.sleep(self.__flush_interval)
+            self.flush()
+
+    def close(self):
+        """Stops the flush thread, flushes the remaining spans and closes the trace file."""
+        self.__alive.clear()
+        self.__flush_thread.join(timeout=self.__flush_interval + 1)
+        self.flush()
+        with self.__file_lock:
+            # an empty metadata event makes the array valid JSON despite the trailing comma
+            self.__file.write(json.dumps({'name': 'trace_end', 'ph': 'M', 'pid': self.__pid, 'args': {}}) + '\n]\n')
+            self.__file.close()
+
+
+_tracer: Tracer | None = None
+
+
+def start(path: str, buffer_size: int = 4096, flush_interval: float = 1.0) -> Tracer:
+    """Starts tracing into the given file, replacing a running tracer."""
+    global _tracer
+    stop()
+    _tracer = Tracer(path, buffer_size, flush_interval)
+    return _tracer
+
+
+def stop():
+    """Stops tracing and completes the trace file."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+
+
+def is_tracing() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, category: str = 'piboy') -> ContextManager:
+    """Context manager, that records the block as span of the current thread."""
+    tracer = _tracer
+    return _NULL_CONTEXT if tracer is None else tracer.span(name, category)
+
+
+def traced(name: str | None = None, category: str = 'piboy') -> Callable[[_F], _F]:
+    """Decorator, that records each call as span under the given name or the qualified name of the function."""
+    def decorator(func: _F) -> _F:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(label, category, start_ns, time.perf_counter_ns() - start_ns)
+        return wrapper  # noqa (wrapper has the signature of func)
+    return decorator
@@ -7,6 +7,8 @@ from subprocess import PIPE, run
 
 import pyudev
 
+from core.tracing import span
+
 logger = logging.getLogger(__name__)
 
 class UDevService:
@@ -32,10 +34,11 @@ class UDevService:
     def _loop(self):
         while True:
             device = self._monitor.poll()
-            if device.action == 'add':
-                self.mount(device)
-            if device.action == 'remove':
-                self.unmount(device)
+            with span(f'udev.{device.action}', 'udev'):
+                if device.action == 'add':
+                    self.mount(device)
+                if device.action == 'remove':
+                    self.unmount(device)
 
     def _build_target_path(self, device_node: str, model: str) -> str:
         partition_number = next(iter(re.findall(r'/dev/\w+(\d)', device_node)), 0)
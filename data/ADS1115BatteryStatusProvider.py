@@ -6,6 +6,8 @@ import smbus2
 
 from core.data import DeviceStatus
 from core.decorator import override
+from core.profiling import timed
+from core.tracing import traced
 from data.BatteryStatusProvider import BatteryStatusProvider
 
 logger = logging.getLogger('battery_data')
@@ -27,6 +29,7 @@ class ADS1115BatteryStatusProvider(BatteryStatusProvider):
         self.__address = address
         self.__device_status = DeviceStatus.UNAVAILABLE
 
+    @traced('i2c.ads1115', 'i2c')
     def __read_channel(self, channel=0) -> float:
         config = [
             0b11000001 | (channel << 4), # GND as reference, select channel
@@ -43,6 +46,7 @@ class ADS1115BatteryStatusProvider(BatteryStatusProvider):
         return (raw_data if raw_data < 0x8000 else raw_data - 0x10000) * self.__FSR / 0x8000
 
     @override
+    @timed('provider.battery')
     def get_state_of_charge(self) -> float:
         try:
             voltage = self.__read_channel()
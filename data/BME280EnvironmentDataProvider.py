@@ -5,6 +5,8 @@ import smbus2
 
 from core.data import DeviceStatus
 from core.decorator import override
+from core.profiling import timed
+from core.tracing import span
 from data.EnvironmentDataProvider import EnvironmentData, EnvironmentDataProvider
 
 logger = logging.getLogger('environment_data')
@@ -17,9 +19,11 @@ class BME280EnvironmentDataProvider(EnvironmentDataProvider):
         self.__device_status = DeviceStatus.UNAVAILABLE
 
     @override
+    @timed('provider.environment')
     def get_environment_data(self) -> EnvironmentData | None:
         try:
-            data = bme280.sample(self.__bus, self.__address)
+            with span('i2c.bme280', 'i2c'):
+                data = bme280.sample(self.__bus, self.__address)
             self.__device_status = DeviceStatus.OPERATIONAL
             return EnvironmentData(
                 data.temperature,
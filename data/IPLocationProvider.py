@@ -5,6 +5,7 @@ import requests
 
 from core.data import DeviceStatus
 from core.decorator import RetryException, override, retry
+from core.profiling import timed
 from data.LocationProvider import Location, LocationException, LocationProvider
 
 
@@ -40,6 +41,7 @@ class IPLocationProvider(LocationProvider):
             return Location(float(values[0]), float(values[1]))
 
     @override
+    @timed('provider.location')
     def get_location(self) -> Location:
         try:
             location = self.__fetch_location()
@@ -5,6 +5,8 @@ import time
 
 from core.data import ConnectionStatus
 from core.decorator import override
+from core.profiling import timing
+from core.tracing import span
 from data.NetworkStatusProvider import NetworkStatusProvider
 
 logger = logging.getLogger('network_data')
@@ -20,7 +22,8 @@ class NetworkManagerStatusProvider(NetworkStatusProvider):
 
     def __update_status(self):
         while True:
-            result = subprocess.run(['nmcli', 'networking', 'connectivity'], capture_output=True, text=True)
+            with timing('provider.network'), span('nmcli', 'network'):
+                result = subprocess.run(['nmcli', 'networking', 'connectivity'], capture_output=True, text=True)
             if 'full' in result.stdout:
                 self.__status = ConnectionStatus.CONNECTED
             else:
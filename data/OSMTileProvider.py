@@ -8,7 +8,10 @@ import requests
 from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
 from requests.exceptions import ConnectionError
 
+from core.color import dither_rgb565
 from core.decorator import override
+from core.profiling import timed
+from core.tracing import traced
 from data.TileProvider import TileInfo, TileProvider
 
 logger = logging.getLogger('tile_data')
@@ -18,10 +21,14 @@ class OSMTileProvider(TileProvider):
     __CACHE_DURATION = 1000 * 60 * 60 * 24 * 365  # one year in ms
     __OSM_TILE_SIZE = (256, 256)  # size of a tile image from OSM
 
-    def __init__(self, background: tuple[int, int, int], color: tuple[int, int, int], font: ImageFont.FreeTypeFont):
+    def __init__(self, background: tuple[int, int, int], color: tuple[int, int, int], font: ImageFont.FreeTypeFont,
+                 dither: bool = False):
+        """Creates a tile provider using the OSM tile API. Set 'dither' to 'True' to apply ordered dithering for
+        displays using the RGB565 pixel format."""
         self.__background = background
         self.__color = color
         self.__font = font
+        self.__dither = dither
 
     @property
     @override
@@ -29,6 +36,8 @@ class OSMTileProvider(TileProvider):
         return range(0, 20)
 
     @override
+    @timed('provider.tile')
+    @traced('tile.get', 'tile')
     def get_tile(self, lat: float, lon: float, zoom: int, size: tuple[int, int] = (256, 256), x_offset: int = 0,
                  y_offset: int = 0) -> TileInfo:
         x_tile, y_tile = self._deg_to_num(lat, lon, zoom)
@@ -80,6 +89,8 @@ class OSMTileProvider(TileProvider):
         cropped_top = center_y - int(target_height / 2)
         cropped_tile = merged_tile.crop((cropped_left, cropped_top,
                                          cropped_left + target_width, cropped_top + target_height))
+        if self.__dither:
+            cropped_tile = dither_rgb565(cropped_tile)
         width_deg = (tile_right_deg - tile_left_deg) * (tile_width / target_width)
         height_deg = (tile_bottom_deg - tile_top_deg) * (tile_height / target_height)
         top_left = lat - (height_deg / 2), lon - (width_deg / 2)
@@ -97,6 +108,7 @@ class OSMTileProvider(TileProvider):
         return tile
 
     @classmethod
+    @traced('tile.fetch', 'tile')
     def _fetch_tile(cls, zoom: int, x_tile: int, y_tile: int) -> Image.Image:
         """Fetches the requested tile either from cache or from OSM tile API"""
         tile_cache = '.tiles'
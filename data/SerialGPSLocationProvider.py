@@ -10,6 +10,7 @@ from pynmea2 import GLL
 
 from core.data import DeviceStatus
 from core.decorator import override
+from core.tracing import span
 from data.LocationProvider import Location, LocationException, LocationProvider
 
 logger = logging.getLogger('location_data')
@@ -27,13 +28,15 @@ class SerialGPSLocationProvider(LocationProvider):
     def __update_location(self):
         while True:
             try:
-                data = self.__io_wrapper.readline()
+                with span('gps.readline', 'serial'):
+                    data = self.__io_wrapper.readline()
                 if len(data) == 0:
                     self.__device_status = DeviceStatus.UNAVAILABLE
                     continue
                 logger.debug(data.strip())
                 if data[0:6] == '$GPGLL':
-                    message: GLL = pynmea2.parse(data)
+                    with span('gps.parse', 'serial'):
+                        message: GLL = pynmea2.parse(data)
                     # lat and lon are strings that are empty if the connection is lost
                     if message.lat != '' and message.lon != '':
                         self.__device_status = DeviceStatus.OPERATIONAL
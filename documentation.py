@@ -6,16 +6,9 @@ from PIL import Image
 from PIL.ImageFilter import GaussianBlur
 
 from app.App import App
-from app.ClockApp import ClockApp
-from app.DebugApp import DebugApp
-from app.EnvironmentApp import EnvironmentApp
-from app.FileManagerApp import FileManagerApp
-from app.MapApp import MapApp
-from app.RadioApp import RadioApp
-from app.UpdateApp import UpdateApp
 from core.decorator import override
 from environment import Environment
-from piboy import AppModule, AppState, draw_base
+from piboy import AppModule, AppState, draw_base, register_apps
 
 target = './docs/apps'
 
@@ -51,13 +44,7 @@ def main():
 
     app_state = injector.get(AppState)
 
-    app_state.add_app(injector.get(FileManagerApp)) \
-        .add_app(injector.get(UpdateApp)) \
-        .add_app(injector.get(EnvironmentApp)) \
-        .add_app(injector.get(RadioApp)) \
-        .add_app(injector.get(DebugApp)) \
-        .add_app(injector.get(ClockApp)) \
-        .add_app(injector.get(MapApp))
+    register_apps(app_state, injector)
 
     app_state.active_app.on_app_enter()
     app_bbox = (app_state.environment.app_config.app_side_offset,
@@ -20,6 +20,7 @@
 # THE SOFTWARE.
 import time
 from enum import Enum
+from functools import lru_cache
 
 import numpy as np
 import RPi.GPIO as GPIO
@@ -30,6 +31,13 @@ from spidev import SpiDev
 LCD_WIDTH = 320
 LCD_HEIGHT = 480
 
+# the spidev kernel module rejects transfers larger than its bufsiz parameter, 4096 bytes unless configured otherwise
+SPIDEV_BUFSIZ_PATH = '/sys/module/spidev/parameters/bufsiz'
+SPIDEV_DEFAULT_BUFSIZ = 4096
+
+# palette of grayscale images, which map each value to the same value on all three channels
+GRAYSCALE_PALETTE = bytes(value for value in range(256) for _ in range(3))
+
 # commands
 CMD_RDPXLFMT = 0x0C
 
@@ -45,10 +53,12 @@ CMD_SETCA = 0x2A
 CMD_SETPA = 0x2B
 CMD_WRMEM = 0x2C
 CMD_RDMEM = 0x2E
+CMD_VSCRDEF = 0x33
 
 CMD_MADCTL = 0x36
 CMD_IDLOFF = 0x38
 CMD_IDLON = 0x39
+CMD_VSCRSADD = 0x37
 CMD_PXLFMT = 0x3A
 
 CMD_IFMODE = 0xB0
@@ -60,11 +70,80 @@ CMD_PGAMCTL = 0xE0
 CMD_NGAMCTL = 0xE1
 
 
-def image_to_data(image: Image.Image) -> object:
-    """Converts a PIL image to 666RGB format that can be drawn on the LCD."""
-    pb = np.array(image.convert('RGB')).astype('uint16')
+class PixelFormat(Enum):
+    """Representation of the pixel format used to transfer pixels to the display. The value is the parameter of the
+    pixel format command."""
+
+    RGB565 = 0x55  # 16 bits per pixel, sent as two bytes
+    RGB666 = 0x66  # 18 bits per pixel, sent as three bytes
+
+    @classmethod
+    def from_bits(cls, bits: int) -> 'PixelFormat':
+        """Returns the pixel format for the given number of bits per pixel."""
+        formats = {16: cls.RGB565, 18: cls.RGB666}
+        if bits not in formats:
+            raise ValueError(f'Unsupported pixel format: {bits} bits per pixel, use one of {list(formats)}')
+        return formats[bits]
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return 2 if self is PixelFormat.RGB565 else 3
+
+
+def image_to_data(image: Image.Image, pixel_format: PixelFormat = PixelFormat.RGB666) -> memoryview:
+    """Converts a PIL image to 666RGB or 565RGB format that can be drawn on the LCD. Returns a flat, contiguous byte
+    buffer, that can be passed to the SPI driver without further conversion. Palette and grayscale images are expanded
+    through a lookup table, which is cheaper than converting them to RGB first."""
+    if image.mode in ('P', 'L'):
+        palette = bytes(image.getpalette('RGB')) if image.mode == 'P' else GRAYSCALE_PALETTE
+        lut = palette_lut(palette, pixel_format)
+        # one table lookup per pixel yields the complete wire format of that pixel
+        return memoryview(np.take(lut, np.frombuffer(image.tobytes(), dtype=np.uint8)).view(np.uint8))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    # interleaved RGB bytes straight from the PIL buffer, no widening and no intermediate python objects
+    pb = np.frombuffer(image.tobytes(), dtype=np.uint8)
+    if pixel_format is PixelFormat.RGB565:
+        return rgb_to_rgb565(pb)
     # cut of the two least significant / rightmost bits to convert 8-bit color to 6-bit color
-    return np.dstack((pb[:, :, 0] & 0xFC, pb[:, :, 1] & 0xFC, pb[:, :, 2] & 0xFC)).flatten().tolist()
+    return memoryview(np.bitwise_and(pb, 0xFC))
+
+
+def rgb_to_rgb565(pb: np.ndarray) -> memoryview:
+    """Packs interleaved 8-bit RGB values into big endian 565RGB words. Shifts stay in uint8, because the bits shifted
+    out of a byte are not needed anyway."""
+    pb = pb.reshape(-1, 3)
+    red, green, blue = pb[:, 0], pb[:, 1], pb[:, 2]
+    data = np.empty((pb.shape[0], 2), dtype=np.uint8)
+    # high byte: RRRRRGGG, low byte: GGGBBBBB
+    np.bitwise_or(red & 0xF8, green >> 5, out=data[:, 0])
+    np.bitwise_or((green << 3) & 0xE0, blue >> 3, out=data[:, 1])
+    return memoryview(data.reshape(-1))
+
+
+@lru_cache(maxsize=8)
+def palette_lut(palette: bytes, pixel_format: PixelFormat = PixelFormat.RGB666) -> np.ndarray:
+    """Returns a table with the encoded pixel for each of the 256 palette indices. Each entry is a single opaque item
+    of the pixel's size, which makes the lookup a plain copy of items. Tables are cached by palette, so that they are
+    only computed again if the palette was swapped."""
+    rgb = np.zeros(256 * 3, dtype=np.uint8)
+    entries = np.frombuffer(palette, dtype=np.uint8)[:rgb.size]
+    rgb[:entries.size] = entries
+    if pixel_format is PixelFormat.RGB565:
+        table = np.frombuffer(rgb_to_rgb565(rgb), dtype=np.uint8)
+    else:
+        table = np.bitwise_and(rgb, 0xFC)
+    return table.view(f'V{pixel_format.bytes_per_pixel}')
+
+
+def spidev_bufsiz(path: str = SPIDEV_BUFSIZ_PATH) -> int:
+    """Returns the maximum size of a single SPI transfer allowed by the spidev kernel module. Falls back to the kernel
+    default if the parameter cannot be read. The value can be raised with the 'spidev.bufsiz' kernel parameter."""
+    try:
+        with open(path, 'r') as file:
+            return max(int(file.read().strip()), 1)
+    except (OSError, ValueError):
+        return SPIDEV_DEFAULT_BUFSIZ
 
 
 class Origin(Enum):
@@ -100,23 +179,31 @@ class ILI9486:
         """Returns the display dimensions in portrait mode, no matter what mode is used"""
         return LCD_WIDTH, LCD_HEIGHT
 
-    def __init__(self, spi: SpiDev, dc: int, rst: int | None = None, *, origin: Origin = Origin.UPPER_LEFT):
+    def __init__(self, spi: SpiDev, dc: int, rst: int | None = None, *, origin: Origin = Origin.UPPER_LEFT,
+                 pixel_format: PixelFormat = PixelFormat.RGB666, max_transfer_size: int | None = None):
         """Creates an instance of the display using the given SPI connection. Must provide the SPI driver and the GPIO
         pin number for the DC pin. Can optionally provide the GPIO pin number for the reset pin. Optionally the origin
         can be set. The default is UPPER_LEFT, which is landscape mode this the bottom of the image located at the
-        power, video and audio out are of the Pi."""
+        power, video and audio out are of the Pi. The pixel format defaults to RGB666. RGB565 sends a third less bytes
+        per pixel at the cost of color precision. The maximum size of a single SPI transfer is read from the spidev
+        kernel module if not provided."""
         self.__spi = spi
         self.__dc = dc
         self.__rst = rst
         self.__origin = origin
+        self.__pixel_format = pixel_format
         self.__width = LCD_WIDTH
         self.__height = LCD_HEIGHT
         self.__inverted = False
         self.__idle = False
+        self.__scroll_area = (0, LCD_HEIGHT)  # top and bottom row of the vertical scroll area, bottom is exclusive
+        self.__scroll_offset = 0
+        self.__max_transfer_size = max_transfer_size or spidev_bufsiz()
 
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self.__dc, GPIO.OUT)
         GPIO.output(self.__dc, GPIO.HIGH)
+        self.__dc_level = True  # last level written to the dc pin, used to skip redundant writes
         if self.__rst is not None:
             GPIO.setup(self.__rst, GPIO.OUT)
             GPIO.output(self.__rst, GPIO.HIGH)
@@ -134,16 +221,51 @@ class ILI9486:
         """Returns true if selected origin is landscape mode; false otherwise"""
         return bool(self.__origin.value & 0x20)
 
-    def send(self, data, is_data=True, chunk_size=4096):
-        """Writes a byte or an array of bytes to the display."""
-        # dc low for command, high for data
-        GPIO.output(self.__dc, is_data)
+    def supports_vertical_scroll(self) -> bool:
+        """Returns true if the hardware scrolls along the vertical axis of the image. The panel always scrolls along
+        its long side, which is the horizontal axis of the image in landscape mode."""
+        return not self.is_landscape()
+
+    @property
+    def scroll_area(self) -> tuple[int, int]:
+        """Returns the top and bottom row of the vertical scroll area, the bottom row is exclusive."""
+        return self.__scroll_area
+
+    @property
+    def scroll_offset(self) -> int:
+        """Returns the number of rows the content of the scroll area is currently scrolled up."""
+        return self.__scroll_offset
+
+    @property
+    def pixel_format(self) -> PixelFormat:
+        """Returns the pixel format used to transfer pixels"""
+        return self.__pixel_format
+
+    @property
+    def max_transfer_size(self) -> int:
+        """Returns the maximum number of bytes sent in a single SPI transfer."""
+        return self.__max_transfer_size
+
+    def send(self, data, is_data=True, chunk_size: int | None = None):
+        """Writes a byte, a list of bytes or a bytes-like object to the display. The payload is sent through the buffer
+        protocol in transfers of the given chunk size, limited by and defaulting to the maximum transfer size."""
+        # dc low for command, high for data, but only touch the pin if the level actually changes
+        is_data = bool(is_data)
+        if self.__dc_level is not is_data:
+            GPIO.output(self.__dc, is_data)
+            self.__dc_level = is_data
         if isinstance(data, int):
-            self.__spi.writebytes([data])
+            data = bytes((data,))
+        elif not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        view = memoryview(data).cast('B')
+        chunk_size = min(chunk_size or self.__max_transfer_size, self.__max_transfer_size)
+        if len(view) <= chunk_size:
+            self.__spi.writebytes2(view)
         else:
-            for start in range(0, len(data), chunk_size):
-                end = min(start + chunk_size, len(data))
-                self.__spi.writebytes(data[start: end])
+            # slicing a memoryview does not copy the underlying buffer
+            for start in range(0, len(view), chunk_size):
+                self.__spi.writebytes2(view[start: start + chunk_size])
         return self
 
     def command(self, data):
@@ -165,6 +287,8 @@ class ILI9486:
             time.sleep(.120)  # wait 120 ms for finishing blanking and resetting
             self.__inverted = False
             self.__idle = False
+            self.__scroll_area = (0, LCD_HEIGHT)
+            self.__scroll_offset = 0
         return self
 
     def _init_sequence(self):
@@ -173,8 +297,8 @@ class ILI9486:
         self.command(CMD_SLPOUT)  # turns off the sleep mode
         time.sleep(0.020)
 
-        self.command(CMD_PXLFMT).data(0x66)  # 18 bits per pixel
-        self.command(CMD_RDPXLFMT).data(0x66)  # 18 bits per pixel
+        self.command(CMD_PXLFMT).data(self.__pixel_format.value)  # 16 or 18 bits per pixel
+        self.command(CMD_RDPXLFMT).data(self.__pixel_format.value)  # 16 or 18 bits per pixel
 
         self.command(CMD_PWRCTLNOR).command(0x44)
 
@@ -204,38 +328,76 @@ class ILI9486:
             x1 = self.__width - 1
         if y1 is None:
             y1 = self.__height - 1
-        self.command(CMD_SETCA)  # column address
-        self.data(x0 >> 8)
-        self.data(x0 & 0xFF)
-        self.data(x1 >> 8)
-        self.data(x1 & 0xFF)
-        self.command(CMD_SETPA)  # page address / row address
-        self.data(y0 >> 8)
-        self.data(y0 & 0xFF)
-        self.data(y1 >> 8)
-        self.data(y1 & 0xFF)
+        # parameters are still sent one by one, but without switching the dc pin in between
+        self.command(CMD_SETCA).send([x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF], True, chunk_size=1)  # column address
+        self.command(CMD_SETPA).send([y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF], True, chunk_size=1)  # row address
+        return self
+
+    def set_scroll_area(self, top: int = 0, bottom: int = LCD_HEIGHT):
+        """Defines the rows from top to bottom (exclusive) as vertical scroll area. The rows above and below stay fixed.
+        Rows are counted along the long side of the panel, which is only the vertical axis of the image in portrait
+        mode. Resets the scroll offset."""
+        if not 0 <= top < bottom <= LCD_HEIGHT:
+            raise ValueError(f'Invalid scroll area from row {top} to {bottom}, rows must be within 0 and {LCD_HEIGHT}')
+        height, bottom_fixed = bottom - top, LCD_HEIGHT - bottom
+        self.command(CMD_VSCRDEF).send([top >> 8, top & 0xFF, height >> 8, height & 0xFF,
+                                        bottom_fixed >> 8, bottom_fixed & 0xFF], True, chunk_size=1)
+        self.__scroll_area = (top, bottom)
+        return self.scroll(0)
+
+    def scroll(self, offset: int):
+        """Scrolls the content of the scroll area up by the given number of rows, by moving the start address of the
+        scroll area in the frame memory. Nothing is sent but the start address, the rows that wrap around from the top
+        to the bottom of the scroll area have to be drawn again. Negative offsets scroll down."""
+        top, bottom = self.__scroll_area
+        self.__scroll_offset = offset % (bottom - top)
+        start = top + self.__scroll_offset
+        self.command(CMD_VSCRSADD).send([start >> 8, start & 0xFF], True, chunk_size=1)
         return self
 
+    def __memory_rows(self, y0: int, y1: int) -> list[tuple[int, int, int]]:
+        """Maps the visible rows from y0 to y1 (inclusive) to rows of the frame memory, which differ inside of the
+        scroll area if it is scrolled. Returns (first image row, first memory row, last memory row) of each range, that
+        is contiguous in the frame memory."""
+        top, bottom = self.__scroll_area
+        if not self.__scroll_offset or self.is_landscape() or y1 < top or y0 >= bottom:
+            return [(0, y0, y1)]
+        ranges = []
+        for first, last in ((y0, min(top - 1, y1)), (max(top, y0), min(bottom - 1, y1)), (max(bottom, y0), y1)):
+            if first > last:
+                continue
+            if first < top or first >= bottom:
+                ranges.append((first - y0, first, last))
+                continue
+            # rows of the scroll area are rotated by the offset and may wrap around at the bottom of the area
+            start = top + (first - top + self.__scroll_offset) % (bottom - top)
+            wrapped = min(last - first, bottom - 1 - start)
+            ranges.append((first - y0, start, start + wrapped))
+            if first + wrapped < last:
+                ranges.append((first + wrapped + 1 - y0, top, top + last - first - wrapped - 1))
+        return ranges
+
     def display(self, image=None, x0=0, y0=0):
         """Writes the display buffer or provided image to the display. If no
         image is provided the display buffer will be written to the display.
-        If an image is provided, it should be in RGB format and the same
-        dimensions as the display."""
+        If an image is provided, it should be in RGB format, or a palette or
+        grayscale image, and fit into the display."""
         if image is None:
             image = self.__buffer
         width, height = image.size
         x1 = x0 + width - 1
         y1 = y0 + height - 1
-        if image.mode != 'RGB':
-            raise ValueError('Image must be in RGB format')
+        if image.mode not in ('RGB', 'P', 'L'):
+            raise ValueError('Image must be in RGB, P or L format')
         if x1 >= self.__width or y1 >= self.__height or x0 < 0 or y0 < 0:
             raise ValueError(
                 'Image exceeds display bounds ({0}x{1})'.format(self.__width, self.__height))
-        self.set_window(x0, y0, x1, y1)
-        data = image_to_data(image)
-        self.command(CMD_WRMEM)
-        if isinstance(data, list):
-            self.data(list(data))
+        data = image_to_data(image, self.__pixel_format)
+        row_size = width * self.__pixel_format.bytes_per_pixel
+        for row, memory_y0, memory_y1 in self.__memory_rows(y0, y1):
+            self.set_window(x0, memory_y0, x1, memory_y1)
+            self.command(CMD_WRMEM)
+            self.data(data[row * row_size:(row + memory_y1 - memory_y0 + 1) * row_size])
         return self
 
     def clear(self, color=(0, 0, 0)):
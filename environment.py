@@ -1,3 +1,5 @@
+import os
+import sys
 from dataclasses import dataclass, field
 
 import yaml
@@ -42,6 +44,8 @@ class AppConfig:
     width: int = 480
     height: int = 320
     modes: list[ColorConfig] = None
+    palette_canvas: bool = False  # let apps draw on an 8-bit palette image instead of an RGB image
+    max_frame_rate: float = 30  # upper limit of rendered frames per second, requests in between are merged
     # cached properties
     __font_header: ImageFont.FreeTypeFont | None = None
     __font_standard: ImageFont.FreeTypeFont | None = None
@@ -81,6 +85,10 @@ class AppConfig:
             self.__font_standard = ImageFont.truetype(self.font_name, self.font_standard_size)
         return self.__font_standard
 
+    @property
+    def colors(self) -> ColorConfig:
+        return self.modes[self.color_mode]
+
     @property
     def background(self) -> tuple[int, int, int]:
         return self.modes[self.color_mode].background
@@ -103,6 +111,11 @@ class KeypadConfig:
     right_pin: int = 13
     a_pin: int = 16
     b_pin: int = 26
+    # Auto-repeat of held direction keys
+    repeat_delay: float = 0.4  # seconds a key is held before it repeats
+    repeat_interval: float = 0.08  # seconds between two repeats
+    accelerate_after: int = 12  # number of repeats, after which each repeat moves by a whole page
+    page_size: int = 10  # number of steps of an accelerated repeat
 
 
 @dataclass
@@ -121,6 +134,8 @@ class DisplayConfig:
     dc_pin: int = 24
     display_device: SPIConfig = field(default_factory=lambda: SPIConfig(0, 0))
     flip_display: bool = False
+    bits_per_pixel: int = 18  # 18 for RGB666 or 16 for RGB565, which transfers a third less data per frame
+    dither_map_tiles: bool = True  # ordered dithering of map tiles to hide color banding in RGB565
 
     # Touch module
     cs_pin: int = 7
@@ -128,6 +143,18 @@ class DisplayConfig:
     touch_device: SPIConfig = field(default_factory=lambda: SPIConfig(0, 1))
 
 
+@dataclass
+class ProfilingConfig:
+    enabled: bool = False  # start a profiling session on startup, it can be toggled by holding B and releasing A
+    trace_memory: bool = False  # trace memory allocations, which slows down every allocation
+    sample_interval: float = 0.005  # seconds between two samples of the thread stacks
+    line_numbers: bool = False  # tell the sampled lines of a function apart, instead of aggregating per function
+    output_directory: str = 'profiles'
+    max_reports: int = 5  # number of reports that are kept in the output directory
+    trace: bool = False  # record a timeline of all threads in the Chrome Trace Event format
+    trace_file: str = 'trace.json'
+
+
 @dataclass
 class Environment:
     dev_mode: bool = False
@@ -138,6 +165,7 @@ class Environment:
     keypad_config: KeypadConfig = field(default_factory=lambda: KeypadConfig())
     rotary_config: RotaryConfig = field(default_factory=lambda: RotaryConfig())
     display_config: DisplayConfig = field(default_factory=lambda: DisplayConfig())
+    profiling_config: ProfilingConfig = field(default_factory=lambda: ProfilingConfig())
 
     # cached property
     __is_raspberry_pi: bool | None = None
@@ -152,6 +180,11 @@ class Environment:
                 self.__is_raspberry_pi = False
         return self.__is_raspberry_pi
 
+    @property
+    def is_headless(self) -> bool:
+        """Returns true if there is no graphical session to open a window in, which is only detectable on linux."""
+        return sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
 def spi_config_constructor(loader: Loader | FullLoader | UnsafeLoader, node: Node) -> SPIConfig:
     if isinstance(node, MappingNode):
         values = loader.construct_mapping(node)
@@ -240,6 +273,17 @@ def display_config_representor(dumper: Dumper, data: DisplayConfig) -> MappingNo
     return dumper.represent_mapping('!DisplayConfig', {k: v for k,v in vars(data).items() if k[0] != '_'})
 
 
+def profiling_config_constructor(loader: Loader | FullLoader | UnsafeLoader, node: Node) -> ProfilingConfig:
+    if isinstance(node, MappingNode):
+        values = loader.construct_mapping(node)
+        return ProfilingConfig(**values)
+    raise TypeError("node is not of type MappingNode")
+
+
+def profiling_config_representor(dumper: Dumper, data: ProfilingConfig) -> MappingNode:
+    return dumper.represent_mapping('!ProfilingConfig', {k: v for k,v in vars(data).items() if k[0] != '_'})
+
+
 def environment_constructor(loader: Loader | FullLoader | UnsafeLoader, node: Node) -> Environment:
     if isinstance(node, MappingNode):
         values = loader.construct_mapping(node)
@@ -260,6 +304,7 @@ def configure():
     yaml.add_constructor('!KeypadConfig', keypad_config_constructor)
     yaml.add_constructor('!RotaryConfig', rotary_config_constructor)
     yaml.add_constructor('!DisplayConfig', display_config_constructor)
+    yaml.add_constructor('!ProfilingConfig', profiling_config_constructor)
     yaml.add_constructor('!Environment', environment_constructor)
     yaml.add_representer(SPIConfig, spi_config_representor)
     yaml.add_representer(I2CConfig, i2c_config_representor)
@@ -269,6 +314,7 @@ def configure():
     yaml.add_representer(KeypadConfig, keypad_config_representor)
     yaml.add_representer(RotaryConfig, rotary_config_representor)
     yaml.add_representer(DisplayConfig, display_config_representor)
+    yaml.add_representer(ProfilingConfig, profiling_config_representor)
     yaml.add_representer(Environment, environment_representor)
 
 
@@ -12,3 +12,19 @@ class Display(ABC):
     @abstractmethod
     def show(self, image: Image.Image, x0: int, y0: int):
         raise NotImplementedError
+
+    def palette_changed(self):
+        """Called after the colors of the palette canvas were swapped. Displays, that cache the encoding of a palette,
+        drop it here."""
+        pass
+
+    @property
+    def supports_scrolling(self) -> bool:
+        """Returns true if the display can scroll an area of rows in hardware, see scroll."""
+        return False
+
+    def scroll(self, y0: int, y1: int, offset: int):
+        """Scrolls the content of the rows from y0 to y1 (exclusive) up by the given number of rows, relative to the
+        unscrolled content. Rows that wrap around are not redrawn, only the rows that were scrolled into view have to
+        be shown afterwards. Coordinates of shown images stay the visible coordinates."""
+        raise NotImplementedError
@@ -5,7 +5,9 @@ import evdev
 import RPi.GPIO as GPIO
 
 from core.decorator import override
+from core.tracing import span, traced
 from interaction.Input import Input
+from interaction.KeyRepeater import KeyRepeater
 
 
 class GPIOInput(Input):
@@ -16,9 +18,13 @@ class GPIOInput(Input):
                  on_key_up: Callable[[], None], on_key_down: Callable[[], None],
                  on_key_a: Callable[[], None], on_key_b: Callable[[], None],
                  on_rotary_increase: Callable[[], None], on_rotary_decrease: Callable[[], None],
-                 on_rotary_switch: Callable[[], None], debounce: int = 50):
+                 on_rotary_switch: Callable[[], None], debounce: int = 50,
+                 on_profiling_toggle: Callable[[], None] | None = None, repeater: KeyRepeater | None = None):
         super().__init__(on_key_left, on_key_right, on_key_up, on_key_down, on_key_a, on_key_b, on_rotary_increase,
-                         on_rotary_decrease, on_rotary_switch)
+                         on_rotary_decrease, on_rotary_switch, repeater)
+        self.__key_b = key_b
+        self.__on_profiling_toggle = on_profiling_toggle
+        self.__skip_key_b = False
         self.__encoder = evdev.InputDevice(rotary_device)
         GPIO.setmode(GPIO.BCM)
 
@@ -33,11 +39,11 @@ class GPIOInput(Input):
         # rotary setup
         GPIO.setup(rotary_switch, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
-        # keys event callbacks
-        GPIO.add_event_detect(key_left, GPIO.RISING, callback=self.__gpio_left, bouncetime=debounce)
-        GPIO.add_event_detect(key_right, GPIO.RISING, callback=self.__gpio_right, bouncetime=debounce)
-        GPIO.add_event_detect(key_up, GPIO.RISING, callback=self.__gpio_up, bouncetime=debounce)
-        GPIO.add_event_detect(key_down, GPIO.RISING, callback=self.__gpio_down, bouncetime=debounce)
+        # keys event callbacks, direction keys track both edges to repeat while they are held
+        GPIO.add_event_detect(key_left, GPIO.BOTH, callback=self.__gpio_left, bouncetime=debounce)
+        GPIO.add_event_detect(key_right, GPIO.BOTH, callback=self.__gpio_right, bouncetime=debounce)
+        GPIO.add_event_detect(key_up, GPIO.BOTH, callback=self.__gpio_up, bouncetime=debounce)
+        GPIO.add_event_detect(key_down, GPIO.BOTH, callback=self.__gpio_down, bouncetime=debounce)
         GPIO.add_event_detect(key_a, GPIO.RISING, callback=self.__gpio_a, bouncetime=debounce)
         GPIO.add_event_detect(key_b, GPIO.RISING, callback=self.__gpio_b, bouncetime=debounce)
 
@@ -51,32 +57,57 @@ class GPIOInput(Input):
         # ref: https://github.com/raphaelyancey/pyKY040 (cannot use this lib directly, because it uses the old GPIO lib)
         for event in self.__encoder.read_loop():
             if event.type == 2:
-                if event.value == -1:
-                    self.on_rotary_increase()
-                elif event.value == 1:
-                    self.on_rotary_decrease()
+                with span('rotary', 'input'):
+                    if event.value == -1:
+                        self.on_rotary_increase()
+                    elif event.value == 1:
+                        self.on_rotary_decrease()
 
     @override
     def close(self):
+        self.release_all()
         GPIO.cleanup()
 
-    def __gpio_left(self, _):
-        self.on_key_left()
+    def __edge(self, pin: int, key: Callable[[], None]):
+        # the keys are pulled up, so a low level means, that the key is pressed. The repeater reads the level again
+        # before every repeat, because the debouncing can swallow the release edge of a short tap.
+        if GPIO.input(pin) == GPIO.LOW:
+            self.press(key, lambda: GPIO.input(pin) == GPIO.LOW)
+        else:
+            self.release(key)
 
-    def __gpio_right(self, _):
-        self.on_key_right()
+    @traced('gpio.left', 'input')
+    def __gpio_left(self, pin: int):
+        self.__edge(pin, self.on_key_left)
 
-    def __gpio_up(self, _):
-        self.on_key_up()
+    @traced('gpio.right', 'input')
+    def __gpio_right(self, pin: int):
+        self.__edge(pin, self.on_key_right)
 
-    def __gpio_down(self, _):
-        self.on_key_down()
+    @traced('gpio.up', 'input')
+    def __gpio_up(self, pin: int):
+        self.__edge(pin, self.on_key_up)
 
+    @traced('gpio.down', 'input')
+    def __gpio_down(self, pin: int):
+        self.__edge(pin, self.on_key_down)
+
+    @traced('gpio.a', 'input')
     def __gpio_a(self, _):
+        # releasing A while B is held toggles the profiler instead, the release of B is then skipped as well
+        if self.__on_profiling_toggle is not None and GPIO.input(self.__key_b) == GPIO.LOW:
+            self.__skip_key_b = True
+            self.__on_profiling_toggle()
+            return
         self.on_key_a()
 
+    @traced('gpio.b', 'input')
     def __gpio_b(self, _):
+        if self.__skip_key_b:
+            self.__skip_key_b = False
+            return
         self.on_key_b()
 
+    @traced('gpio.rotary_switch', 'input')
     def __gpio_rotary_switch(self, _):
         self.on_rotary_switch()
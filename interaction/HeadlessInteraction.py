@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from core.decorator import override
+from core.metrics import FrameMetrics
+from interaction.Display import Display
+from interaction.Input import Input
+from interaction.UnifiedInteraction import UnifiedInteraction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ShowRecord:
+    """Statistics of a single show call."""
+    x0: int
+    y0: int
+    width: int
+    height: int
+    latency: float  # seconds between submitting the patch and applying it to the framebuffer
+
+    @property
+    def area(self) -> int:
+        return self.width * self.height
+
+
+class HeadlessInteraction(UnifiedInteraction):
+    """Interaction without any window or hardware. Shown patches are applied to an in-memory NumPy framebuffer by a
+    separate thread, like a real display consumes them asynchronously, and each show call is recorded. Inputs can be
+    triggered by calling the key handlers directly. Used for benchmarks and for running the UI on machines without a
+    display. Only the most recent records are kept, so that a long running headless UI does not grow without bound."""
+
+    def __init__(self, on_key_left: Callable[[Display], None], on_key_right: Callable[[Display], None],
+                 on_key_up: Callable[[Display], None], on_key_down: Callable[[Display], None],
+                 on_key_a: Callable[[Display], None], on_key_b: Callable[[Display], None],
+                 on_rotary_increase: Callable[[Display], None], on_rotary_decrease: Callable[[Display], None],
+                 on_rotary_switch: Callable[[Display], None],
+                 resolution: tuple[int, int], background: tuple[int, int, int],
+                 metrics: FrameMetrics | None = None, max_records: int = 10000):
+        Input.__init__(self, lambda: on_key_left(self), lambda: on_key_right(self),
+                       lambda: on_key_up(self), lambda: on_key_down(self),
+                       lambda: on_key_a(self), lambda: on_key_b(self),
+                       lambda: on_rotary_increase(self), lambda: on_rotary_decrease(self),
+                       lambda: on_rotary_switch(self))
+        width, height = resolution
+        self.__framebuffer = np.empty((height, width, 3), dtype=np.uint8)
+        self.__framebuffer[...] = background
+        self.__metrics = metrics
+        self.__records: deque[ShowRecord] = deque(maxlen=max_records)
+        self.__queue: deque[tuple[Image.Image, int, int, float]] = deque()
+        self.__condition = threading.Condition()
+        self.__alive = True
+        self.__apply_thread = threading.Thread(target=self.__apply_loop, args=(), daemon=True)
+        self.__apply_thread.start()
+
+    def __apply_loop(self):
+        while True:
+            with self.__condition:
+                while self.__alive and not self.__queue:
+                    self.__condition.wait()
+                if not self.__alive:
+                    return
+                image, x0, y0, submitted = self.__queue[0]
+            record = None
+            try:
+                width, height = image.size
+                pixels = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+                self.__framebuffer[y0:y0 + height, x0:x0 + width] = pixels
+                latency = time.perf_counter() - submitted
+                if self.__metrics is not None:
+                    self.__metrics.record_latency(latency)
+                record = ShowRecord(x0, y0, width, height, latency)
+            except Exception as e:
+                # a failing patch must not stop the applying of all following patches
+                logger.exception(e)
+            finally:
+                with self.__condition:
+                    # the patch stays queued until it was applied, so that waiting for an empty queue means idle
+                    self.__queue.popleft()
+                    if record is not None:
+                        self.__records.append(record)
+                    self.__condition.notify_all()
+
+    @override
+    def close(self):
+        with self.__condition:
+            self.__alive = False
+            self.__condition.notify_all()
+        self.__apply_thread.join(timeout=1)
+
+    @override
+    def show(self, image: Image.Image, x0: int, y0: int):
+        with self.__condition:
+            self.__queue.append((image, x0, y0, time.perf_counter()))
+            self.__condition.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until all shown patches were applied. Returns false if the timeout expired before."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__queue or not self.__alive, timeout)
+
+    @property
+    def framebuffer(self) -> np.ndarray:
+        """The framebuffer as (height, width, 3) array. Patches are still applied to it, copy it to keep a state."""
+        return self.__framebuffer
+
+    def image(self) -> Image.Image:
+        """Returns a copy of the framebuffer as image."""
+        return Image.fromarray(self.__framebuffer.copy(), 'RGB')
+
+    @property
+    def records(self) -> list[ShowRecord]:
+        """Records of the most recent applied show calls since the last reset of the statistics."""
+        with self.__condition:
+            return list(self.__records)
+
+    def statistics(self) -> dict[str, float]:
+        """Summarizes the records of the most recent applied show calls since the last reset of the statistics."""
+        records = self.records
+        latencies = np.array([record.latency for record in records], dtype=np.float64)
+        return {
+            'patches': len(records),
+            'pixels': sum(record.area for record in records),
+            'mean_latency': float(latencies.mean()) if records else 0.0,
+            'max_latency': float(latencies.max()) if records else 0.0,
+        }
+
+    def reset_statistics(self):
+        with self.__condition:
+            self.__records.clear()
@@ -1,47 +1,295 @@
+import logging
 import threading
+import time
+from collections import deque
+from typing import NamedTuple
 
+import numpy as np
 import RPi.GPIO as GPIO
 from PIL import Image
 from spidev import SpiDev
 
 from core.decorator import override
-from driver.ILI9486 import ILI9486, Origin
+from core.metrics import FrameMetrics
+from core.profiling import timed
+from core.tracing import span
+from driver.ILI9486 import ILI9486, Origin, PixelFormat, palette_lut
 from interaction.Display import Display
 
+logger = logging.getLogger(__name__)
 
-class ILI9486Display(Display):
+Patch = tuple[Image.Image, int, int]
+Box = tuple[int, int, int, int]
+
+
+class Scroll(NamedTuple):
+    """Request to scroll the rows from top to bottom (exclusive) to the given offset, queued in order with patches."""
+    top: int
+    bottom: int
+    offset: int
+
+
+def _box(patch: Patch) -> Box:
+    """Returns the area covered by a patch as (left, top, right, bottom), with right and bottom being exclusive."""
+    image, x0, y0 = patch
+    width, height = image.size
+    return x0, y0, x0 + width, y0 + height
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def _merge(first: Patch, second: Patch) -> Patch | None:
+    """Merges two consecutive patches into a single window, if their union is a rectangle, so that no pixel outside
+    of both patches would be sent. The second patch is drawn over the first one. Returns None if the patches cannot be
+    merged."""
+    a, b = _box(first), _box(second)
+    stacked = a[0] == b[0] and a[2] == b[2] and a[1] <= b[3] and b[1] <= a[3]  # same columns, touching rows
+    aligned = a[1] == b[1] and a[3] == b[3] and a[0] <= b[2] and b[0] <= a[2]  # same rows, touching columns
+    if not (_contains(a, b) or stacked or aligned):
+        return None
+    left, top = min(a[0], b[0]), min(a[1], b[1])
+    size = (max(a[2], b[2]) - left, max(a[3], b[3]) - top)
+    palette = first[0].getpalette() if first[0].mode == second[0].mode == 'P' else None
+    if palette is not None and palette == second[0].getpalette():
+        # patches of the palette canvas stay palette images, so the driver encodes them through its lookup table
+        merged = Image.new('P', size)
+        merged.putpalette(palette)
+    else:
+        merged = Image.new('RGB', size)
+    merged.paste(first[0], (a[0] - left, a[1] - top))
+    merged.paste(second[0], (b[0] - left, b[1] - top))
+    return merged, left, top
 
-    __queue: list[tuple[Image.Image, int, int]] = []
-    __render_thread: threading.Thread | None = None
 
-    def __init__(self, spi_config: tuple[int, int], dc_pin: int, rst_pin: int, flip_display: bool = False):
+@timed('display.coalesce')
+def _coalesce(patches: list[Patch]) -> tuple[list[Patch], int, int]:
+    """Reduces a batch of patches to the patches that actually have to be sent. A patch that is fully covered by a
+    later patch is dropped, and consecutive patches that form a rectangle are merged into one window. Returns the
+    remaining patches in order, the number of dropped patches and the number of merged patches."""
+    boxes = [_box(patch) for patch in patches]
+    kept = [patch for index, patch in enumerate(patches)
+            if not any(_contains(later, boxes[index]) for later in boxes[index + 1:])]
+    result: list[Patch] = []
+    merged = 0
+    for patch in kept:
+        if result:
+            merged_patch = _merge(result[-1], patch)
+            if merged_patch is not None:
+                result[-1] = merged_patch
+                merged += 1
+                continue
+        result.append(patch)
+    return result, len(patches) - len(kept), merged
+
+
+def _changed_boxes(mask: np.ndarray, max_row_gap: int = 2, max_column_gap: int = 16) -> list[Box]:
+    """Returns boxes that cover all changed pixels of the given mask. Changed rows are grouped into bands, tolerating
+    small gaps of unchanged rows, and the changed columns of each band are grouped the same way. Sending a few
+    unchanged pixels is cheaper than setting up another window on the display."""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return []
+    boxes: list[Box] = []
+    for band in np.split(rows, np.flatnonzero(np.diff(rows) > max_row_gap + 1) + 1):
+        top, bottom = int(band[0]), int(band[-1]) + 1
+        columns = np.flatnonzero(mask[top:bottom].any(axis=0))
+        for run in np.split(columns, np.flatnonzero(np.diff(columns) > max_column_gap + 1) + 1):
+            boxes.append((int(run[0]), top, int(run[-1]) + 1, bottom))
+    return boxes
+
+
+class ILI9486Display(Display):
+
+    def __init__(self, spi_config: tuple[int, int], dc_pin: int, rst_pin: int, flip_display: bool = False,
+                 bits_per_pixel: int = 18, metrics: FrameMetrics | None = None):
         GPIO.setmode(GPIO.BCM)
         bus, device = spi_config
         spi = SpiDev(bus, device)
         spi.mode = 0b10  # [CPOL|CPHA] -> polarity 1, phase 0
         spi.max_speed_hz = 64000000
         origin = Origin.LOWER_RIGHT if flip_display else Origin.UPPER_LEFT
-        lcd = ILI9486(dc=dc_pin, rst=rst_pin, spi=spi, origin=origin).begin()
+        pixel_format = PixelFormat.from_bits(bits_per_pixel)
+        lcd = ILI9486(dc=dc_pin, rst=rst_pin, spi=spi, origin=origin, pixel_format=pixel_format).begin()
         self.__spi = spi
         self.__display = lcd
+        self.__display_lock = threading.Lock()  # guards the bus between the render thread and resets
+
+        # shadow copy of the pixels on the panel, pixels are unknown until they were sent once after a reset
+        width, height = lcd.dimensions()
+        self.__shadow = np.zeros((height, width, 3), dtype=np.uint8)
+        self.__known = np.zeros((height, width), dtype=bool)
+        self.__sent_pixels = 0
+        self.__skipped_pixels = 0
+
+        self.__metrics = metrics
+        self.__queue: deque[Patch | Scroll] = deque()
+        self.__submitted: deque[float] = deque()  # submit time of each queued item
+        self.__condition = threading.Condition()
+        self.__alive = True
+        self.__rendering = False
+        self.__dropped_patches = 0
+        self.__merged_patches = 0
+        self.__render_thread = threading.Thread(target=self.__render_loop, args=(), daemon=True)
+        self.__render_thread.start()
 
-    def __process_queue(self):
-        while len(self.__queue) > 0:
-            image, x0, y0 = self.__queue.pop(0)
-            self.__display.display(image, x0, y0)
+    def __take_batch(self) -> tuple[list[Patch | Scroll], list[float]] | None:
+        """Blocks until patches are queued and takes all of them together with their submit times. Returns None if the
+        display was closed."""
+        with self.__condition:
+            while self.__alive and not self.__queue:
+                self.__condition.wait()
+            if not self.__alive:
+                return None
+            batch, submitted = list(self.__queue), list(self.__submitted)
+            self.__queue.clear()
+            self.__submitted.clear()
+            self.__rendering = True
+            return batch, submitted
+
+    def __render_loop(self):
+        while (taken := self.__take_batch()) is not None:
+            batch, submitted = taken
+            try:
+                self.__render_batch(batch)
+                if self.__metrics is not None:
+                    applied = time.perf_counter()
+                    for submit_time in submitted:
+                        self.__metrics.record_latency(applied - submit_time)
+            except Exception as e:
+                # a failing transfer must not stop the rendering of all following patches
+                logger.exception(e)
+            finally:
+                with self.__condition:
+                    self.__rendering = False
+                    self.__condition.notify_all()
+
+    def __render_batch(self, batch: list[Patch | Scroll]):
+        with self.__display_lock, span('render batch', 'display'):
+            # patches are only coalesced between scroll requests, which move the content below them
+            start = 0
+            for end in [index for index, item in enumerate(batch) if isinstance(item, Scroll)] + [len(batch)]:
+                patches, dropped, merged = _coalesce(batch[start:end])
+                self.__dropped_patches += dropped
+                self.__merged_patches += merged
+                if dropped and self.__metrics is not None:
+                    self.__metrics.record_dropped(dropped)
+                for image, x0, y0 in patches:
+                    self.__send_changes(image, x0, y0)
+                if end < len(batch):
+                    self.__scroll(batch[end])
+                start = end + 1
+
+    def __scroll(self, request: Scroll):
+        """Moves the scroll pointer of the panel and rotates the shadow framebuffer the same way."""
+        if (request.top, request.bottom) != self.__display.scroll_area:
+            self.__display.set_scroll_area(request.top, request.bottom)
+            # redefining the area resets the offset and the previously scrolled content is out of place
+            self.__known[...] = False
+        rows = request.offset - self.__display.scroll_offset
+        self.__display.scroll(request.offset)
+        for buffer in (self.__shadow, self.__known):
+            buffer[request.top:request.bottom] = np.roll(buffer[request.top:request.bottom], -rows, axis=0)
+
+    @timed('display.send_changes')
+    def __send_changes(self, image: Image.Image, x0: int, y0: int):
+        """Compares the patch with the shadow framebuffer and only sends the areas that differ from the panel. Palette
+        images are only converted for the comparison, the driver encodes them directly."""
+        width, height = image.size
+        pixels = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+        shadow = self.__shadow[y0:y0 + height, x0:x0 + width]
+        known = self.__known[y0:y0 + height, x0:x0 + width]
+        mask = np.any(pixels != shadow, axis=2) | ~known
+        sent = 0
+        try:
+            for left, top, right, bottom in _changed_boxes(mask):
+                with span('spi transfer', 'display'):
+                    self.__display.display(image.crop((left, top, right, bottom)), x0 + left, y0 + top)
+                # only pixels, that reached the panel, are known, a failed transfer is sent again with the next patch
+                shadow[top:bottom, left:right] = pixels[top:bottom, left:right]
+                known[top:bottom, left:right] = True
+                sent += (right - left) * (bottom - top)
+        finally:
+            self.__sent_pixels += sent
+            self.__skipped_pixels += width * height - sent
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of patches waiting to be sent to the display."""
+        return len(self.__queue)
+
+    @property
+    def dropped_patches(self) -> int:
+        """Total number of patches that were not sent, because a later patch covered them completely."""
+        return self.__dropped_patches
+
+    @property
+    def merged_patches(self) -> int:
+        """Total number of patches that were merged into the window of their predecessor."""
+        return self.__merged_patches
+
+    @property
+    def sent_pixels(self) -> int:
+        """Total number of pixels sent to the display."""
+        return self.__sent_pixels
+
+    @property
+    def skipped_pixels(self) -> int:
+        """Total number of pixels of shown patches, that were not sent, because the display already showed them."""
+        return self.__skipped_pixels
 
     @override
     def close(self):
+        with self.__condition:
+            self.__alive = False
+            self.__condition.notify_all()
+        self.__render_thread.join(timeout=1)
         self.__display.reset()
         self.__spi.close()
         GPIO.cleanup()
 
+    @property
+    @override
+    def supports_scrolling(self) -> bool:
+        return self.__display.supports_vertical_scroll()
+
+    @override
+    def scroll(self, y0: int, y1: int, offset: int):
+        if not self.supports_scrolling:
+            raise NotImplementedError('The display only scrolls along the vertical axis of portrait mode')
+        with self.__condition:
+            self.__queue.append(Scroll(y0, y1, offset))
+            self.__submitted.append(time.perf_counter())
+            self.__condition.notify_all()
+
+    @override
+    def palette_changed(self):
+        # the lookup tables of the old palette are never used again, the shadow framebuffer holds plain RGB values and
+        # sends the pixels in their new colors with the next patches
+        palette_lut.cache_clear()
+
     @override
     def show(self, image: Image.Image, x0: int, y0: int):
-        self.__queue.append((image, x0, y0))
-        if self.__render_thread is None or not self.__render_thread.is_alive():
-            self.__render_thread = threading.Thread(target=self.__process_queue, args=(), daemon=True)
-            self.__render_thread.start()
+        with self.__condition:
+            self.__queue.append((image, x0, y0))
+            self.__submitted.append(time.perf_counter())
+            self.__condition.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until all queued patches were sent. Returns false if the timeout expired before."""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not (self.__queue or self.__rendering) or not self.__alive,
+                                             timeout)
 
     def reset(self):
-        self.__display.begin()
+        with self.__display_lock:
+            self.__display.begin()
+            # the panel content is undefined after a reset
+            self.__known[...] = False
+
+    def invalidate_shadow(self):
+        """Forgets what the panel shows, so that the following patches are sent completely instead of only the areas,
+        that differ from the shadow framebuffer."""
+        with self.__display_lock:
+            self.__known[...] = False
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Callable
 
+from interaction.KeyRepeater import KeyRepeater
+
 
 class Input(ABC):
 
     def __init__(self, on_key_left: Callable, on_key_right: Callable, on_key_up: Callable, on_key_down: Callable,
                  on_key_a: Callable, on_key_b: Callable, on_rotary_increase: Callable, on_rotary_decrease: Callable,
-                 on_rotary_switch: Callable):
+                 on_rotary_switch: Callable, repeater: KeyRepeater | None = None):
         self.__on_key_left = on_key_left
         self.__on_key_right = on_key_right
         self.__on_key_up = on_key_up
@@ -16,11 +18,29 @@ class Input(ABC):
         self.__on_rotary_increase = on_rotary_increase
         self.__on_rotary_decrease = on_rotary_decrease
         self.__on_rotary_switch = on_rotary_switch
+        self.__repeater = repeater
 
     @abstractmethod
     def close(self):
         raise NotImplementedError
 
+    def press(self, key: Callable[[], None], is_held: Callable[[], bool] | None = None):
+        """Handles the press of a key, that repeats while it is held, e.g. press(self.on_key_down). The handler is
+        called once immediately and then repeatedly by the key repeater until the key is released or is_held returns
+        false."""
+        key()
+        if self.__repeater is not None:
+            self.__repeater.press(key, is_held)
+
+    def release(self, key: Callable[[], None]):
+        if self.__repeater is not None:
+            self.__repeater.release(key)
+
+    def release_all(self):
+        """Stops the repetition of all held keys."""
+        if self.__repeater is not None:
+            self.__repeater.release_all()
+
     def on_key_left(self):
         self.__on_key_left()
 
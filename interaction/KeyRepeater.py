@@ -0,0 +1,74 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class _HeldKey:
+    fire: Callable[[], None]
+    due: float  # time.monotonic() of the next repeat
+    is_held: Callable[[], bool] | None = None
+    repeats: int = 0
+
+
+class KeyRepeater:
+    """Repeats the handlers of held keys on a single timer thread. A held key starts to repeat after the delay and then
+    repeats at the interval. After a number of repeats, each repeat fires the handler for a whole page of steps at once.
+    The handlers are expected to queue their event only, so that all steps, that arrive while a frame is drawn, are
+    handled together and result in a single redraw. If a key can report its level, it is checked before every repeat,
+    so that a missed release does not repeat the key forever."""
+
+    def __init__(self, delay: float = 0.4, interval: float = 0.08, accelerate_after: int = 12, page_size: int = 10):
+        self.__delay = delay
+        self.__interval = interval
+        self.__accelerate_after = accelerate_after
+        self.__page_size = page_size
+        self.__held: dict[Callable[[], None], _HeldKey] = {}
+        self.__condition = threading.Condition()
+        self.__thread: threading.Thread | None = None
+
+    def press(self, key: Callable[[], None], is_held: Callable[[], bool] | None = None):
+        """Starts repeating the handler of the key. The first call of the handler is up to the caller. The optional
+        is_held callback returns if the key is still held, the key is released as soon as it returns false."""
+        with self.__condition:
+            self.__held[key] = _HeldKey(key, time.monotonic() + self.__delay, is_held)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__repeat_loop, args=(), daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def release(self, key: Callable[[], None]):
+        with self.__condition:
+            self.__held.pop(key, None)
+
+    def release_all(self):
+        with self.__condition:
+            self.__held.clear()
+
+    def __take_due(self) -> list[tuple[Callable[[], None], int]]:
+        """Blocks until at least one held key is due and returns the due handlers with their number of steps."""
+        with self.__condition:
+            while True:
+                now = time.monotonic()
+                due = [key for key in self.__held.values() if key.due <= now]
+                if due:
+                    break
+                timeout = min((key.due for key in self.__held.values()), default=now + 1.0) - now
+                self.__condition.wait(timeout)
+            repeats = []
+            for key in due:
+                if key.is_held is not None and not key.is_held():
+                    # the release was not seen, e.g. because it was swallowed by the debouncing
+                    del self.__held[key.fire]
+                    continue
+                key.repeats += 1
+                key.due = now + self.__interval
+                repeats.append((key.fire, self.__page_size if key.repeats > self.__accelerate_after else 1))
+            return repeats
+
+    def __repeat_loop(self):
+        while True:
+            for fire, steps in self.__take_due():
+                for _ in range(steps):
+                    fire()
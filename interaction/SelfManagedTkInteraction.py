@@ -1,11 +1,13 @@
 import tkinter as tk
 from typing import Callable
 
-from PIL import Image, ImageTk
+from PIL import Image
 
 from core.decorator import override
 from interaction.Display import Display
 from interaction.Input import Input
+from interaction.KeyRepeater import KeyRepeater
+from interaction.TkFramebuffer import TkFramebuffer
 from interaction.UnifiedInteraction import UnifiedInteraction
 
 
@@ -19,62 +21,59 @@ class SelfManagedTkInteraction(UnifiedInteraction):
                  on_key_a: Callable[[Display], None], on_key_b: Callable[[Display], None],
                  on_rotary_increase: Callable[[Display], None], on_rotary_decrease: Callable[[Display], None],
                  on_rotary_switch: Callable[[Display], None],
-                 resolution: tuple[int, int], background: tuple[int, int, int], ui_background: tuple[int, int, int]):
-        Input.__init__(self, on_key_left, on_key_right, on_key_up, on_key_down, on_key_a, on_key_b,
-                       on_rotary_increase, on_rotary_decrease, on_rotary_switch)
-        self.__on_key_left = lambda: on_key_left(self)
-        self.__on_key_right = lambda: on_key_right(self)
-        self.__on_key_up = lambda: on_key_up(self)
-        self.__on_key_down = lambda: on_key_down(self)
-        self.__on_key_a = lambda: on_key_a(self)
-        self.__on_key_b = lambda: on_key_b(self)
-        self.__on_rotary_increase = lambda: on_rotary_increase(self)
-        self.__on_rotary_decrease = lambda: on_rotary_decrease(self)
-        self.__resolution = resolution
-        self.__background = background
-        self.__image = Image.new('RGB', resolution, background)
+                 resolution: tuple[int, int], background: tuple[int, int, int], ui_background: tuple[int, int, int],
+                 repeater: KeyRepeater | None = None):
+        Input.__init__(self, lambda: on_key_left(self), lambda: on_key_right(self),
+                       lambda: on_key_up(self), lambda: on_key_down(self),
+                       lambda: on_key_a(self), lambda: on_key_b(self),
+                       lambda: on_rotary_increase(self), lambda: on_rotary_decrease(self),
+                       lambda: on_rotary_switch(self), repeater)
+        self.__framebuffer = TkFramebuffer(resolution, background)
 
         self.__root = tk.Tk()
         self.__root.title('PiBoy - Simulator')
         self.__root.configure(bg='#%02x%02x%02x' % ui_background)
-        self.__image_tk = ImageTk.PhotoImage(self.__image)
-        self.__label = tk.Label(self.__root, image=self.__image_tk)
+        self.__label = tk.Label(self.__root, image=self.__framebuffer.attach(self.__root))
         self.__label.grid(row=0, column=0, rowspan=4)
 
-        button_left = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='left',
-                                command=self.__on_key_left)
+        button_left = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='left')
+        self.__bind_hold(button_left, self.on_key_left)
         button_left.grid(row=1, column=1)
-        button_up = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='up',
-                              command=self.__on_key_up)
+        button_up = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='up')
+        self.__bind_hold(button_up, self.on_key_up)
         button_up.grid(row=0, column=2)
-        button_right = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='right',
-                                 command=self.__on_key_right)
+        button_right = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='right')
+        self.__bind_hold(button_right, self.on_key_right)
         button_right.grid(row=1, column=3)
-        button_down = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='down',
-                                command=self.__on_key_down)
+        button_down = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='down')
+        self.__bind_hold(button_down, self.on_key_down)
         button_down.grid(row=2, column=2)
         button_a = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='button a',
-                             command=self.__on_key_a)
+                             command=self.on_key_a)
         button_a.grid(row=2, column=4)
         button_b = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='button b',
-                             command=self.__on_key_b)
+                             command=self.on_key_b)
         button_b.grid(row=2, column=5)
         button_decrease = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='-',
-                                    command=self.__on_rotary_decrease)
+                                    command=self.on_rotary_decrease)
         button_decrease.grid(row=0, column=4)
         button_increase = tk.Button(self.__root, width=self.BUTTON_W, height=self.BUTTON_H, text='+',
-                                    command=self.__on_rotary_increase)
+                                    command=self.on_rotary_increase)
         button_increase.grid(row=0, column=5)
 
     @override
     def show(self, image: Image.Image, x0: int, y0: int):
-        self.__image.paste(image, (x0, y0))
-        self.__image_tk = ImageTk.PhotoImage(self.__image)
-        self.__label.configure(image=self.__image_tk)
+        # may be called from any thread, the framebuffer schedules the repaint on the Tk thread
+        self.__framebuffer.paste(image, x0, y0)
+
+    def __bind_hold(self, button: tk.Button, key: Callable[[], None]):
+        # direction keys repeat while the mouse button is held, like the keys of the keypad
+        button.bind('<ButtonPress-1>', lambda _: self.press(key))
+        button.bind('<ButtonRelease-1>', lambda _: self.release(key))
 
     @override
     def close(self):
-        pass
+        self.release_all()
 
     def run(self):
         """blocking function to actually run the UI"""
@@ -0,0 +1,64 @@
+import threading
+from tkinter import Misc, TclError
+
+from PIL import Image, ImageTk
+
+
+def _coalesce(boxes: list[tuple[int, int, int, int]]) -> list[tuple[int, int, int, int]]:
+    """Replaces the boxes by their bounding box, if it is not larger than the boxes together."""
+    bounds = (min(box[0] for box in boxes), min(box[1] for box in boxes),
+              max(box[2] for box in boxes), max(box[3] for box in boxes))
+    area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in boxes)
+    if area >= (bounds[2] - bounds[0]) * (bounds[3] - bounds[1]):
+        return [bounds]
+    return boxes
+
+
+class TkFramebuffer:
+    """Framebuffer of the Tk simulators. Patches can be pasted from any thread, their rectangles are marked as dirty and
+    a single repaint is scheduled with after_idle for all patches, that arrive until the Tk thread gets to it. The
+    repaint copies only the dirty rectangles into one PhotoImage, which is shown for the lifetime of the window."""
+
+    def __init__(self, resolution: tuple[int, int], background: tuple[int, int, int]):
+        self.__image = Image.new('RGB', resolution, background)
+        self.__lock = threading.Lock()
+        self.__dirty: list[tuple[int, int, int, int]] = []
+        self.__scheduled = False
+        self.__root: Misc | None = None
+        self.__photo: ImageTk.PhotoImage | None = None
+
+    def attach(self, root: Misc) -> ImageTk.PhotoImage:
+        """Creates the PhotoImage, that shows the framebuffer in the given window. Must be called from the Tk thread
+        before its mainloop starts."""
+        with self.__lock:
+            self.__photo = ImageTk.PhotoImage(self.__image, master=root)
+            self.__root = root
+            self.__dirty.clear()
+            # patches, that arrive before the mainloop runs, are picked up by this repaint
+            self.__scheduled = True
+        root.after_idle(self.__repaint)
+        return self.__photo
+
+    def paste(self, image: Image.Image, x0: int, y0: int):
+        width, height = image.size
+        with self.__lock:
+            self.__image.paste(image, (x0, y0))
+            self.__dirty.append((x0, y0, x0 + width, y0 + height))
+            if self.__scheduled or self.__root is None:
+                return
+            self.__scheduled = True
+            root = self.__root
+        try:
+            root.after_idle(self.__repaint)
+        except (RuntimeError, TclError):
+            # the window has been closed
+            pass
+
+    def __repaint(self):
+        with self.__lock:
+            dirty, self.__dirty = self.__dirty, []
+            self.__scheduled = False
+            patches = [(self.__image.crop(box), box[0], box[1]) for box in _coalesce(dirty)] if dirty else []
+        for patch, x0, y0 in patches:
+            source = ImageTk.PhotoImage(patch, master=self.__root)
+            self.__root.tk.call(str(self.__photo), 'copy', str(source), '-to', x0, y0)
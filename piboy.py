@@ -1,40 +1,64 @@
+from core import boot  # isort: skip - imported first, the boot clock starts here
+
+import importlib
 import logging
+import threading
 import time
 from datetime import datetime
 from logging.config import fileConfig
 from typing import Any, Callable, Generator, Self
 
 from injector import Injector, Module, provider, singleton
-from PIL import Image, ImageDraw
+from PIL import Image
 
 import environment
 from app.App import App
-from app.ClockApp import ClockApp
-from app.DebugApp import DebugApp
-from app.EnvironmentApp import EnvironmentApp
-from app.FileManagerApp import FileManagerApp
-from app.MapApp import MapApp
-from app.RadioApp import RadioApp
-from app.UpdateApp import UpdateApp
-from core import resources
-from core.data import ConnectionStatus, DeviceStatus
+from app.LazyApp import LazyApp
+from core import profiling, tracing
+from core.color import match_canvas
+from core.compositor import Compositor
+from core.dispatcher import InputDispatcher, InputEvent
+from core.header import Header
+from core.metrics import FrameMetrics
+from core.profiling import ProfilingSession, RotatingFileSink, SnapshotSink
+from core.scheduler import FrameScheduler, Invalidation
+from core.status_bar import StatusBar
 from data.BatteryStatusProvider import BatteryStatusProvider
 from data.EnvironmentDataProvider import EnvironmentDataProvider
 from data.LocationProvider import LocationProvider
 from data.NetworkStatusProvider import NetworkStatusProvider
-from data.OSMTileProvider import OSMTileProvider
 from data.TileProvider import TileProvider
 from environment import AppConfig, Environment
 from interaction.Display import Display
 from interaction.Input import Input
+from interaction.KeyRepeater import KeyRepeater
 from interaction.UnifiedInteraction import UnifiedInteraction
 
 fileConfig(fname='config.ini')
 logger = logging.getLogger(__name__)
 
+# apps in the order of the header, their titles are shown before the apps are imported and constructed
+APPS: list[tuple[str, str]] = [
+    ('INV', 'app.FileManagerApp.FileManagerApp'),
+    ('SYS', 'app.UpdateApp.UpdateApp'),
+    ('ENV', 'app.EnvironmentApp.EnvironmentApp'),
+    ('RAD', 'app.RadioApp.RadioApp'),
+    ('DBG', 'app.DebugApp.DebugApp'),
+    ('CLK', 'app.ClockApp.ClockApp'),
+    ('MAP', 'app.MapApp.MapApp'),
+]
+
 class AppState:
 
     __bit = 0
+    __KEY_HANDLERS: dict[InputEvent, Callable[[App], None]] = {
+        InputEvent.KEY_LEFT: lambda app: app.on_key_left(),
+        InputEvent.KEY_RIGHT: lambda app: app.on_key_right(),
+        InputEvent.KEY_UP: lambda app: app.on_key_up(),
+        InputEvent.KEY_DOWN: lambda app: app.on_key_down(),
+        InputEvent.KEY_A: lambda app: app.on_key_a(),
+        InputEvent.KEY_B: lambda app: app.on_key_b(),
+    }
 
     def __init__(self, e: Environment, network_status_provider: NetworkStatusProvider,
                  location_provider: LocationProvider, battery_status_provider: BatteryStatusProvider,
@@ -44,24 +68,56 @@ class AppState:
         self.__location_provider = location_provider
         self.__battery_status_provider = battery_status_provider
         self.__environment_data_provider = environment_data_provider
-        self.__image_buffer = self.__init_buffer()
+        self.__compositor = Compositor(e.app_config)
+        self.__header = Header(e.app_config)
+        self.__status_bar = StatusBar(e.app_config, network_status_provider, location_provider,
+                                      battery_status_provider)
+        self.__metrics = FrameMetrics()
+        self.__scheduler = FrameScheduler(self.__render_frame, e.app_config.max_frame_rate)
+        self.__dispatcher = InputDispatcher(self.__handle_keys, self.__switch_app)
         self.__apps: list[App] = []
         self.__active_app = 0
 
-    def __init_buffer(self) -> Image.Image:
-        return Image.new('RGB', self.__environment.app_config.resolution, self.__environment.app_config.background)
-
     def __tick(self):
         self.__bit ^= 1
 
     def clear_buffer(self) -> Image.Image:
-        self.__image_buffer = self.__init_buffer()
-        return self.__image_buffer
+        return self.__compositor.clear()
 
     def add_app(self, app: App) -> Self:
         self.__apps.append(app)
+        self.__header.invalidate()
         return self
 
+    def register_app(self, title: str, factory: Callable[[], App],
+                     update_callback: Callable[[bool], None] | None = None) -> Self:
+        """Adds an app, that is constructed by the factory when it is entered for the first time or warmed up. The
+        update callback is called to draw the app, once it was constructed after it had been entered."""
+        return self.add_app(LazyApp(title, factory, self.__environment.app_config, update_callback))
+
+    def warm_up_apps(self, background: bool = True):
+        """Constructs all registered apps, that were not constructed yet, on a background thread or before returning.
+        The apps next to the active app are constructed first, because they are entered next."""
+        if background:
+            threading.Thread(target=self.__warm_up, args=(), daemon=True).start()
+        else:
+            self.__warm_up()
+
+    def __warm_up(self):
+        # the first frame goes out before the constructors compete with it
+        self.__scheduler.wait_idle()
+        count = len(self.__apps)
+        active = self.__active_app
+        for index in sorted(range(count), key=lambda i: min((i - active) % count, (active - i) % count)):
+            app = self.__apps[index]
+            if isinstance(app, LazyApp) and not app.is_loaded:
+                try:
+                    app.warm_up()
+                except Exception as e:
+                    # the app is constructed again when it is entered
+                    logger.exception(e)
+        logger.info(f'apps warmed up after {boot.elapsed() * 1000:.0f} ms')
+
     @property
     def tick(self) -> int:
         return self.__bit
@@ -88,7 +144,31 @@ class AppState:
 
     @property
     def image_buffer(self) -> Image.Image:
-        return self.__image_buffer
+        return self.__compositor.front
+
+    @property
+    def compositor(self) -> Compositor:
+        return self.__compositor
+
+    @property
+    def header(self) -> Header:
+        return self.__header
+
+    @property
+    def status_bar(self) -> StatusBar:
+        return self.__status_bar
+
+    @property
+    def metrics(self) -> FrameMetrics:
+        return self.__metrics
+
+    @property
+    def scheduler(self) -> FrameScheduler:
+        return self.__scheduler
+
+    @property
+    def dispatcher(self) -> InputDispatcher:
+        return self.__dispatcher
 
     @property
     def apps(self) -> list[App]:
@@ -119,63 +199,101 @@ class AppState:
             time.sleep(1.0 - now.microsecond / 1000000.0)
 
             # draw the complete footer to remove existing clock display
-            image, x0, y0 = draw_footer(self.image_buffer, self)
-            display.show(image, x0, y0)
             self.__tick()
+            self.__scheduler.request(display, Invalidation.FOOTER)
 
     def update_display(self, display: Display, partial=False):
-        """Draw call that handles the complete cycle of drawing a new image to the display."""
-        image = self.clear_buffer()
-        app_bbox = (self.__environment.app_config.app_side_offset,
-                    self.__environment.app_config.app_top_offset,
-                    self.__environment.app_config.width - self.__environment.app_config.app_side_offset,
-                    self.__environment.app_config.height - self.__environment.app_config.app_bottom_offset)
-        x_offset, y_offset = app_bbox[0:2]
-        if partial:
-            for patch, x0, y0 in self.active_app.draw(image.crop(app_bbox), partial):
-                display.show(patch, x0 + x_offset, y0 + y_offset)
-        else:
-            for patch, x0, y0 in draw_base(image, self):
+        """Requests a partial or full frame. Returns immediately, the frame is drawn by the frame scheduler together
+        with all other requests, that arrive until the next frame is due."""
+        self.__scheduler.request(display, Invalidation.PARTIAL if partial else Invalidation.FULL)
+
+    def clear_display(self, display: Display):
+        """Requests a full frame on a cleared buffer, that initializes all pixels of the display."""
+        self.__scheduler.request(display, Invalidation.CLEAR)
+
+    def __render_frame(self, display: Display, invalidation: Invalidation):
+        """Draws the invalidated parts of the frame, called by the render thread of the frame scheduler only."""
+        if invalidation & Invalidation.CLEAR:
+            self.clear_buffer()
+            display.show(self.__compositor.snapshot(), 0, 0)
+        if invalidation & Invalidation.FULL:
+            self.__draw(display, partial=False)
+            return
+        if invalidation & Invalidation.PARTIAL:
+            self.__draw(display, partial=True)
+        if invalidation & Invalidation.FOOTER:
+            # only the fields of the status bar, that changed, usually the seconds of the clock
+            for patch, x0, y0 in self.__status_bar.draw(self.image_buffer, self.tick, partial=True):
                 display.show(patch, x0, y0)
-            for patch, x0, y0 in self.active_app.draw(image.crop(app_bbox), partial):
-                image.paste(patch, (x0 + x_offset, y0 + y_offset))
-            display.show(image.crop(app_bbox), x_offset, y_offset)
 
-    def on_key_left(self, display: Display):
-        self.active_app.on_key_left()
+    def __draw(self, display: Display, partial: bool):
+        """Draw call that handles the complete cycle of drawing a new image to the display."""
+        start = time.perf_counter()
+        app = self.active_app
+        compositor = self.__compositor
+        x_offset, y_offset = compositor.app_offset
+        shown: list[Image.Image] = []
+        with profiling.timing(f'draw.{app.title}'), compositor.app_canvas() as canvas:
+            if partial:
+                for patch, x0, y0 in app.draw(canvas, partial):
+                    if patch is canvas:
+                        # never hand out the reused canvas itself
+                        patch = compositor.snapshot(canvas)
+                    compositor.compose(patch, x0, y0)
+                    display.show(patch, x0 + x_offset, y0 + y_offset)
+                    shown.append(patch)
+            else:
+                for patch, x0, y0 in draw_base(compositor.front, self):
+                    display.show(patch, x0, y0)
+                    shown.append(patch)
+                for patch, x0, y0 in app.draw(canvas, partial):
+                    if patch is not canvas:
+                        canvas.paste(match_canvas(patch, canvas), (x0, y0))
+                compositor.compose(canvas, 0, 0)
+                display.show(compositor.snapshot(canvas), x_offset, y_offset)
+                shown.append(canvas)
+        self.__metrics.record_frame(app.title, time.perf_counter() - start, len(shown),
+                                    sum(patch.width * patch.height for patch in shown))
+
+    def __handle_keys(self, display: Display, events: list[InputEvent]):
+        """Hands consecutive key events to the active app and draws the result once, called by the input dispatcher
+        only."""
+        app = self.active_app
+        for event in events:
+            self.__KEY_HANDLERS[event](app)
         self.update_display(display, partial=True)
 
+    def __switch_app(self, display: Display, steps: int):
+        """Switches the given number of apps forward or backward, called by the input dispatcher only. Only the final
+        app is entered, the apps in between are skipped."""
+        self.active_app.on_app_leave()
+        self.__active_app = (self.__active_app + steps) % len(self.__apps)
+        self.active_app.on_app_enter()
+        self.update_display(display, partial=False)
+
+    def on_key_left(self, display: Display):
+        self.__dispatcher.post(display, InputEvent.KEY_LEFT)
+
     def on_key_right(self, display: Display):
-        self.active_app.on_key_right()
-        self.update_display(display, partial=True)
+        self.__dispatcher.post(display, InputEvent.KEY_RIGHT)
 
     def on_key_up(self, display: Display):
-        self.active_app.on_key_up()
-        self.update_display(display, partial=True)
+        self.__dispatcher.post(display, InputEvent.KEY_UP)
 
     def on_key_down(self, display: Display):
-        self.active_app.on_key_down()
-        self.update_display(display, partial=True)
+        self.__dispatcher.post(display, InputEvent.KEY_DOWN)
 
     def on_key_a(self, display: Display):
-        self.active_app.on_key_a()
-        self.update_display(display, partial=True)
+        self.__dispatcher.post(display, InputEvent.KEY_A)
 
     def on_key_b(self, display: Display):
-        self.active_app.on_key_b()
-        self.update_display(display, partial=True)
+        self.__dispatcher.post(display, InputEvent.KEY_B)
 
     def on_rotary_increase(self, display: Display):
-        self.active_app.on_app_leave()
-        self.next_app()
-        self.active_app.on_app_enter()
-        self.update_display(display, partial=False)
+        self.__dispatcher.post(display, InputEvent.ROTARY_INCREASE)
 
     def on_rotary_decrease(self, display: Display):
-        self.active_app.on_app_leave()
-        self.previous_app()
-        self.active_app.on_app_enter()
-        self.update_display(display, partial=False)
+        self.__dispatcher.post(display, InputEvent.ROTARY_DECREASE)
 
 
 class AppModule(Module):
@@ -186,11 +304,25 @@ class AppModule(Module):
         self.__unified_instance = tk_instance
 
     @staticmethod
-    def __create_tk_interaction(state: AppState, app_config: AppConfig) -> UnifiedInteraction:
+    def __create_tk_interaction(state: AppState, app_config: AppConfig,
+                                repeater: KeyRepeater) -> UnifiedInteraction:
         from interaction.TkInteraction import TkInteraction
         return TkInteraction(state.on_key_left, state.on_key_right, state.on_key_up, state.on_key_down,
                              state.on_key_a, state.on_key_b, state.on_rotary_increase, state.on_rotary_decrease,
-                             lambda _: None, app_config.resolution, app_config.background, app_config.accent_dark)
+                             lambda _: None, app_config.resolution, app_config.background, app_config.accent_dark,
+                             repeater)
+
+    @staticmethod
+    def __create_headless_interaction(state: AppState, app_config: AppConfig) -> UnifiedInteraction:
+        from interaction.HeadlessInteraction import HeadlessInteraction
+        return HeadlessInteraction(state.on_key_left, state.on_key_right, state.on_key_up, state.on_key_down,
+                                   state.on_key_a, state.on_key_b, state.on_rotary_increase, state.on_rotary_decrease,
+                                   lambda _: None, app_config.resolution, app_config.background, state.metrics)
+
+    def __create_interaction(self, e: Environment, state: AppState, repeater: KeyRepeater) -> UnifiedInteraction:
+        if e.is_headless:
+            return self.__create_headless_interaction(state, e.app_config)
+        return self.__create_tk_interaction(state, e.app_config, repeater)
 
     @singleton
     @provider
@@ -240,7 +372,9 @@ class AppModule(Module):
     @singleton
     @provider
     def provide_tile_service(self, e: Environment) -> TileProvider:
-        return OSMTileProvider(e.app_config.background, e.app_config.accent, e.app_config.font_standard)
+        from data.OSMTileProvider import OSMTileProvider
+        dither = e.is_raspberry_pi and e.display_config.bits_per_pixel == 16 and e.display_config.dither_map_tiles
+        return OSMTileProvider(e.app_config.background, e.app_config.accent, e.app_config.font_standard, dither)
 
     @singleton
     @provider
@@ -262,6 +396,29 @@ class AppModule(Module):
             from data.FakeBatteryStatusProvider import FakeBatteryStatusProvider
             return FakeBatteryStatusProvider()
 
+    @singleton
+    @provider
+    def provide_snapshot_sink(self) -> SnapshotSink:
+        return SnapshotSink()
+
+    @singleton
+    @provider
+    def provide_profiling_session(self, e: Environment, snapshot_sink: SnapshotSink) -> ProfilingSession:
+        config = e.profiling_config
+        return ProfilingSession([RotatingFileSink(config.output_directory, config.max_reports), snapshot_sink],
+                                config.sample_interval, config.trace_memory, line_numbers=config.line_numbers)
+
+    @singleton
+    @provider
+    def provide_frame_metrics(self, state: AppState) -> FrameMetrics:
+        return state.metrics
+
+    @singleton
+    @provider
+    def provide_key_repeater(self, e: Environment) -> KeyRepeater:
+        config = e.keypad_config
+        return KeyRepeater(config.repeat_delay, config.repeat_interval, config.accelerate_after, config.page_size)
+
     @singleton
     @provider
     def provide_draw_callback(self, state: AppState, display: Display) -> Callable[[bool], None]:
@@ -269,21 +426,23 @@ class AppModule(Module):
 
     @singleton
     @provider
-    def provide_display(self, e: Environment, state: AppState) -> Display:
+    def provide_display(self, e: Environment, state: AppState, repeater: KeyRepeater) -> Display:
         if e.is_raspberry_pi:
             from interaction.ILI9486Display import ILI9486Display
 
             spi_device_config = e.display_config.display_device
             return ILI9486Display((spi_device_config.bus, spi_device_config.device),
-                                  e.display_config.dc_pin, e.display_config.rst_pin, e.display_config.flip_display)
+                                  e.display_config.dc_pin, e.display_config.rst_pin, e.display_config.flip_display,
+                                  e.display_config.bits_per_pixel, state.metrics)
         else:
             if self.__unified_instance is None:
-                self.__unified_instance = self.__create_tk_interaction(state, e.app_config)
+                self.__unified_instance = self.__create_interaction(e, state, repeater)
             return self.__unified_instance
 
     @singleton
     @provider
-    def provide_input(self, e: Environment, state: AppState, display: Display) -> Input:
+    def provide_input(self, e: Environment, state: AppState, display: Display, session: ProfilingSession,
+                      repeater: KeyRepeater) -> Input:
         if e.is_raspberry_pi:
             from interaction.GPIOInput import GPIOInput
             from interaction.ILI9486Display import ILI9486Display
@@ -292,7 +451,7 @@ class AppModule(Module):
                 # make sure that display is ILI9486Interface to call the reset function, should be always true
                 if isinstance(display, ILI9486Display):
                     display.reset()
-                display.show(state.clear_buffer(), 0, 0)
+                state.clear_display(display)
 
             return GPIOInput(e.keypad_config.left_pin, e.keypad_config.right_pin,
                              e.keypad_config.up_pin, e.keypad_config.down_pin,
@@ -302,137 +461,51 @@ class AppModule(Module):
                              lambda: state.on_key_up(display), lambda: state.on_key_down(display),
                              lambda: state.on_key_a(display), lambda: state.on_key_b(display),
                              lambda: state.on_rotary_increase(display), lambda: state.on_rotary_decrease(display),
-                             reset_and_init)
+                             reset_and_init, on_profiling_toggle=session.toggle, repeater=repeater)
         else:
             if self.__unified_instance is None:
-                self.__unified_instance = self.__create_tk_interaction(state, e.app_config)
+                self.__unified_instance = self.__create_interaction(e, state, repeater)
             return self.__unified_instance
 
 
-def draw_footer(image: Image.Image, state: AppState) -> tuple[Image.Image, int, int]:
-    width, height = state.environment.app_config.resolution
-    footer_height = 20  # height of the footer
-    footer_bottom_offset = 3  # spacing to the bottom
-    icon_padding = 3 # padding between status icons
-    footer_side_offset = state.environment.app_config.app_side_offset  # spacing to the sides
-    font = state.environment.app_config.font_header
-    draw = ImageDraw.Draw(image)
-
-    start = (footer_side_offset, height - footer_height - footer_bottom_offset)
-    end = (width - footer_side_offset - 1, height - footer_bottom_offset - 1)
-    cursor_x, cursor_y = start
-    connection_status_color = {
-        ConnectionStatus.CONNECTED: state.environment.app_config.accent,
-        ConnectionStatus.DISCONNECTED: state.environment.app_config.accent if state.tick else state.environment.app_config.background
-    }
-    device_status_color = {
-        DeviceStatus.OPERATIONAL: state.environment.app_config.accent,
-        DeviceStatus.NO_DATA: state.environment.app_config.accent if state.tick else state.environment.app_config.background,
-        DeviceStatus.UNAVAILABLE: state.environment.app_config.background
-    }
+def register_apps(state: AppState, injector: Injector):
+    """Registers all apps of APPS to be imported and constructed by the injector on demand, so that their modules and
+    dependencies, like pyaudio or requests, are not loaded before the first frame."""
+    update_callback = injector.get(Callable[[bool], None])
+    for title, path in APPS:
+        state.register_app(title, lambda path=path: injector.get(load_app_class(path)), update_callback)
+
 
-    # reset area
-    draw.rectangle(start + end, fill=state.environment.app_config.accent_dark)
-
-    # draw network status
-    nw_status_padding = (footer_height - resources.network_icon.height) // 2
-    nw_status_color = connection_status_color[state.network_status_provider.get_connection_status()]
-    draw.bitmap((cursor_x + icon_padding, cursor_y + nw_status_padding), resources.network_icon, fill=nw_status_color)
-    cursor_x += resources.network_icon.width + icon_padding
-
-    # draw gps status
-    gps_status_padding = (footer_height - resources.gps_icon.height) // 2
-    gps_status_color = device_status_color[state.location_provider.get_device_status()]
-    draw.bitmap((cursor_x + icon_padding, cursor_y + gps_status_padding), resources.gps_icon, fill=gps_status_color)
-    cursor_x += resources.gps_icon.width + icon_padding
-
-    # draw battery status
-    state_of_charge_str = f'{state.battery_status_provider.get_state_of_charge():.0%}'
-    _, _, text_width, text_height = font.getbbox(state_of_charge_str)
-    text_padding = (footer_height - text_height) // 2
-    draw.text((cursor_x + icon_padding, cursor_y + text_padding), state_of_charge_str,
-              state.environment.app_config.accent, font=font)
-    cursor_x += text_width
-
-    # draw time
-    date_str = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
-    _, _, text_width, text_height = font.getbbox(date_str)
-    text_padding = (footer_height - text_height) // 2
-    draw.text((width - footer_side_offset - text_padding - text_width, cursor_y + text_padding), date_str,
-              state.environment.app_config.accent, font=font)
-
-    x0, y0 = start
-    end = end[0] + 1, end[1] + 1
-    return image.crop(start + end), x0, y0
+def load_app_class(path: str) -> type[App]:
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 def draw_header(image: Image.Image, state: AppState) -> tuple[Image.Image, int, int]:
-    width, height = state.environment.app_config.resolution
-    vertical_line = 5  # vertical limiter line
-    header_top_offset = state.environment.app_config.app_top_offset - vertical_line  # base for header
-    header_side_offset = state.environment.app_config.app_side_offset  # spacing to the sides
-    app_spacing = 20  # space between app headers
-    app_padding = 5  # space around app header
-    draw = ImageDraw.Draw(image)
-    color_background = state.environment.app_config.background
-    color_accent = state.environment.app_config.accent
-
-    # draw base header lines
-    start = (header_side_offset, header_top_offset + vertical_line)
-    end = (header_side_offset, header_top_offset)
-    draw.line(start + end, fill=color_accent)
-    start = end
-    end = (width - header_side_offset - 1, header_top_offset)
-    draw.line(start + end, fill=color_accent)
-    start = end
-    end = (width - header_side_offset - 1, header_top_offset + vertical_line)
-    draw.line(start + end, fill=color_accent)
-
-    # draw app short name header
-    font = state.environment.app_config.font_header
-    max_text_width = width - (2 * header_side_offset)
-    app_text_width = sum(int(font.getbbox(app.title)[2]) for app in state.apps) + (len(state.apps) - 1) * app_spacing
-    cursor = header_side_offset + (max_text_width - app_text_width) // 2
-    for app in state.apps:
-        _, _, text_width, text_height = map(int, font.getbbox(app.title))
-        draw.text((cursor, header_top_offset - text_height - app_padding), app.title, color_accent, font=font)
-        if app is state.active_app:
-            start = (cursor - app_padding, header_top_offset - vertical_line)
-            end = (cursor - app_padding, header_top_offset)
-            draw.line(start + end, fill=color_accent)
-            start = end
-            end = (cursor + text_width + app_padding, header_top_offset)
-            draw.line(start + end, fill=color_background)
-            start = end
-            end = (cursor + text_width + app_padding, header_top_offset - vertical_line)
-            draw.line(start + end, fill=color_accent)
-        cursor = cursor + text_width + app_spacing
-
-    partial_start = (header_side_offset, 0)
-    partial_end = (width - header_side_offset, header_top_offset + vertical_line)
-    x0, y0 = partial_start
-    return image.crop(partial_start + partial_end), x0, y0
+    return state.header.draw(image, [app.title for app in state.apps], state.active_app_index)
 
 
 def draw_base(image: Image.Image, state: AppState) -> Generator[tuple[Image.Image, int, int], Any, None]:
     yield draw_header(image, state)
-    yield draw_footer(image, state)
+    yield from state.status_bar.draw(image, state.tick)
 
 
 if __name__ == '__main__':
+    boot.mark('imports')
     injector = Injector([AppModule()])
     app_state = injector.get(AppState)
+    boot.mark('state')
 
     DISPLAY = injector.get(Display)
     INPUT = injector.get(Input)
+    boot.mark('interaction')
+    PROFILING_SESSION = injector.get(ProfilingSession)
+    if injector.get(Environment).profiling_config.enabled:
+        PROFILING_SESSION.start()
+    if injector.get(Environment).profiling_config.trace:
+        tracing.start(injector.get(Environment).profiling_config.trace_file)
 
-    app_state.add_app(injector.get(FileManagerApp)) \
-        .add_app(injector.get(UpdateApp)) \
-        .add_app(injector.get(EnvironmentApp)) \
-        .add_app(injector.get(RadioApp)) \
-        .add_app(injector.get(DebugApp)) \
-        .add_app(injector.get(ClockApp)) \
-        .add_app(injector.get(MapApp))
+    register_apps(app_state, injector)
 
     # start the auto mount service on raspberry
     if injector.get(Environment).is_raspberry_pi:
@@ -440,11 +513,14 @@ if __name__ == '__main__':
         udev_service = UDevService()
         udev_service.start()
 
-    # initially draw the empty buffer to initialize all pixels on the hardware module
-    DISPLAY.show(app_state.image_buffer, 0, 0)
-    # then continue with the initial draw call
-    app_state.update_display(DISPLAY)
+    # initially draw the empty buffer to initialize all pixels on the hardware module, followed by the first frame
+    app_state.clear_display(DISPLAY)
     app_state.active_app.on_app_enter()
+    app_state.scheduler.wait_idle()
+    boot.mark('first frame')
+    logger.info(boot.report())
+    # the other apps are imported and constructed in the background after the first frame
+    app_state.warm_up_apps()
 
     try:
         # blocking function that updates the clock
@@ -452,5 +528,9 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         pass
     finally:
+        PROFILING_SESSION.stop()
+        tracing.stop()
+        app_state.dispatcher.stop()
+        app_state.scheduler.stop()
         DISPLAY.close()
         INPUT.close()
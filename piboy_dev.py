@@ -2,16 +2,10 @@ import threading
 
 from injector import Injector
 
-from app.ClockApp import ClockApp
-from app.DebugApp import DebugApp
-from app.EnvironmentApp import EnvironmentApp
-from app.FileManagerApp import FileManagerApp
-from app.MapApp import MapApp
-from app.RadioApp import RadioApp
-from app.UpdateApp import UpdateApp
 from environment import Environment
+from interaction.KeyRepeater import KeyRepeater
 from interaction.SelfManagedTkInteraction import SelfManagedTkInteraction
-from piboy import AppModule, AppState
+from piboy import AppModule, AppState, register_apps
 
 """
 This pi-boy script uses the SelfManagedTkInteraction, which follows the usual mainloop approach. This makes it
@@ -29,20 +23,16 @@ if __name__ == '__main__':
                                     app_state.on_key_up, app_state.on_key_down,
                                     app_state.on_key_a, app_state.on_key_b,
                                     app_state.on_rotary_increase, app_state.on_rotary_decrease, lambda _: None,
-                                    env.app_config.resolution, env.app_config.background, env.app_config.accent_dark)
+                                    env.app_config.resolution, env.app_config.background, env.app_config.accent_dark,
+                                    injector.get(KeyRepeater))
 
     module.register_external_tk_interaction(__tk)
-    app_state.add_app(injector.get(FileManagerApp)) \
-        .add_app(injector.get(UpdateApp)) \
-        .add_app(injector.get(EnvironmentApp)) \
-        .add_app(injector.get(RadioApp)) \
-        .add_app(injector.get(DebugApp)) \
-        .add_app(injector.get(ClockApp)) \
-        .add_app(injector.get(MapApp))
+    register_apps(app_state, injector)
 
     # initial draw
     app_state.update_display(__tk)
     app_state.active_app.on_app_enter()
+    app_state.warm_up_apps()
 
     # watch function has to run in the background, because Tkinter mainloop must be in the main thread
     threading.Thread(target=app_state.watch_function, args=(__tk, ), daemon=True).start()
@@ -53,4 +43,6 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         pass
     finally:
+        app_state.dispatcher.stop()
+        app_state.scheduler.stop()
         __tk.close()
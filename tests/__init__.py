@@ -0,0 +1 @@
+import benchmark  # noqa: F401 - puts the stand-ins for the hardware modules on the path, if the real ones are missing
@@ -0,0 +1,77 @@
+import unittest
+
+import spidev
+from PIL import Image
+from RPi import GPIO
+
+from driver.ILI9486 import CMD_SETPA, CMD_VSCRDEF, CMD_VSCRSADD, CMD_WRMEM, ILI9486, Origin
+
+DC_PIN = 24
+
+
+class ScrollCommandTest(unittest.TestCase):
+    """Checks the command stream of the vertical scrolling against the recording SPI stand-in."""
+
+    def setUp(self):
+        spidev.RECORD_DATA = True
+        self.spi = spidev.SpiDev(0, 0)
+        self.lcd = ILI9486(self.spi, dc=DC_PIN, origin=Origin.LOWER_LEFT_MIRRORED)
+        self.spi.reset_statistics()
+
+    def tearDown(self):
+        spidev.RECORD_DATA = False
+
+    def commands(self) -> list[tuple[int, list[int]]]:
+        """Splits the recorded transfers into commands with their parameters by the level of the DC pin, which is low
+        for commands and high for data."""
+        commands: list[tuple[int, list[int]]] = []
+        for transfer, levels in zip(self.spi.data, self.spi.pin_levels):
+            if levels[DC_PIN] == GPIO.LOW:
+                commands.extend((command, []) for command in transfer)
+            else:
+                commands[-1][1].extend(transfer)
+        return commands
+
+    def test_set_scroll_area(self):
+        self.lcd.set_scroll_area(40, 440)
+        # top fixed area, scroll area and bottom fixed area, followed by the reset of the start address
+        self.assertEqual([(CMD_VSCRDEF, [0, 40, 1, 144, 0, 40]), (CMD_VSCRSADD, [0, 40])], self.commands())
+        self.assertEqual((40, 440), self.lcd.scroll_area)
+        self.assertEqual(0, self.lcd.scroll_offset)
+
+    def test_scroll(self):
+        self.lcd.set_scroll_area(40, 440)
+        self.spi.reset_statistics()
+        self.lcd.scroll(10)
+        self.lcd.scroll(-10)
+        # the start address is the first row of the area plus the offset, wrapped around within the area
+        self.assertEqual([(CMD_VSCRSADD, [0, 50]), (CMD_VSCRSADD, [1, 174])], self.commands())
+        self.assertEqual(390, self.lcd.scroll_offset)
+
+    def test_invalid_scroll_area(self):
+        with self.assertRaises(ValueError):
+            self.lcd.set_scroll_area(100, 100)
+        with self.assertRaises(ValueError):
+            self.lcd.set_scroll_area(0, 481)
+        self.assertEqual([], self.spi.data)
+
+    def test_display_in_scrolled_area(self):
+        self.lcd.set_scroll_area(0, 480)
+        self.lcd.scroll(470)
+        self.spi.reset_statistics()
+        self.lcd.display(Image.new('RGB', (1, 20)), 0, 0)
+        # the visible rows 0 to 19 are the memory rows 470 to 479 and 0 to 9
+        commands = self.commands()
+        windows = [parameters for command, parameters in commands if command == CMD_SETPA]
+        self.assertEqual([[1, 214, 1, 223], [0, 0, 0, 9]], windows)
+        # each window is followed by the pixels of its rows, 3 bytes per pixel in RGB666
+        self.assertEqual([30, 30], [len(parameters) for command, parameters in commands if command == CMD_WRMEM])
+
+    def test_no_vertical_scroll_in_landscape(self):
+        lcd = ILI9486(self.spi, dc=DC_PIN, origin=Origin.UPPER_LEFT)
+        self.assertFalse(lcd.supports_vertical_scroll())
+        self.assertTrue(self.lcd.supports_vertical_scroll())
+
+
+if __name__ == '__main__':
+    unittest.main()